@@ -1,22 +1,39 @@
 #!/usr/bin/env python
 """
-Helper script to rebuild virtualenv.py from virtualenv_support
+Helper script to rebuild virtualenv.py and ve/_autogen.py from
+virtualenv_embedded
 """
 
+import base64
 import re
 import os
 import sys
+import zlib
 
 here = os.path.dirname(__file__)
-script = os.path.join(here, '..', 'virtualenv.py')
+scripts = [os.path.join(here, '..', 'virtualenv.py'),
+           os.path.join(here, '..', 've', '_autogen.py')]
 
+# virtualenv.py decodes its embedded files at import time
+# (``NAME = convert("""...""")``) while ve/_autogen.py only registers them
+# (``embedded("NAME", """...""")``) and decodes them on first use.
 file_regex = re.compile(
-    r'##file (.*?)\n([a-zA-Z][a-zA-Z0-9_]+)\s*=\s*convert\("""(.*?)"""\)',
+    r'##file (.*?)\n(?:([a-zA-Z][a-zA-Z0-9_]+)\s*=\s*convert\('
+    r'|embedded\("([a-zA-Z][a-zA-Z0-9_]+)",\s*)"""(.*?)"""\)',
     re.S)
-file_template = '##file %(filename)s\n%(varname)s = convert("""\n%(data)s""")'
+file_templates = {
+    'convert': '##file %(filename)s\n%(varname)s = convert("""\n%(data)s""")',
+    'embedded': '##file %(filename)s\nembedded("%(varname)s", """\n%(data)s""")',
+}
 
-def rebuild():
-    f = open(script, 'rb')
+def encode(content):
+    if hasattr(base64, 'encodebytes'):
+        return base64.encodebytes(zlib.compress(content)).decode('ascii')
+    return base64.encodestring(zlib.compress(content))
+
+def rebuild(script):
+    print('Rebuilding %s' % script)
+    f = open(script)
     content = f.read()
     f.close()
     parts = []
@@ -26,21 +43,24 @@ def rebuild():
         parts.append(content[last_pos:match.start()])
         last_pos = match.end()
         filename = match.group(1)
-        varname = match.group(2)
-        data = match.group(3)
+        if match.group(2):
+            varname, style = match.group(2), 'convert'
+        else:
+            varname, style = match.group(3), 'embedded'
+        data = match.group(4)
         print('Found reference to file %s' % filename)
         pathname = os.path.join(here, '..', 'virtualenv_embedded', filename)
         f = open(pathname, 'rb')
         c = f.read()
         f.close()
-        new_data = c.encode('zlib').encode('base64')
-        if new_data == data:
+        new_data = encode(c)
+        if '\n' + new_data == data:
             print('  Reference up to date (%s bytes)' % len(c))
             parts.append(match.group(0))
             continue
         print('  Content changed (%s bytes -> %s bytes)' % (
             zipped_len(data), len(c)))
-        new_match = file_template % dict(
+        new_match = file_templates[style] % dict(
             filename=filename,
             varname=varname,
             data=new_data)
@@ -49,7 +69,7 @@ def rebuild():
     new_content = ''.join(parts)
     if new_content != content:
         sys.stdout.write('Content updated; overwriting... ')
-        f = open(script, 'wb')
+        f = open(script, 'w')
         f.write(new_content)
         f.close()
         print('done.')
@@ -62,10 +82,11 @@ def zipped_len(data):
     if not data:
         return 'no data'
     try:
-        return len(data.decode('base64').decode('zlib'))
+        return len(zlib.decompress(base64.b64decode(data.encode('ascii'))))
     except:
         return 'unknown'
 
 if __name__ == '__main__':
-    rebuild()
+    for script in scripts:
+        rebuild(script)
     
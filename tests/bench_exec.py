@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Benchmark of the ways to run one command in a virtualenv environment:
+sourcing bin/activate in a shell, the bin/virtualenv-exec launcher and
+``virtualenv exec``, against running the command directly.  Each is
+timed from process start to exit.
+
+Usage: python tests/bench_exec.py [-n RUNS] [-p PYTHON] ENV_DIR [-- COMMAND...]
+
+PYTHON runs virtualenv_class.py (default: this interpreter); COMMAND
+defaults to ``true``.
+"""
+
+import optparse
+import os
+import subprocess
+import sys
+import time
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+
+
+def shell_quote(arg):
+    return "'%s'" % arg.replace("'", "'\\''")
+
+
+def times(argv, runs):
+    """Returns the sorted wall-clock times of ``runs`` runs of ``argv``"""
+    result = []
+    devnull = open(os.devnull, 'w')
+    try:
+        for i in range(runs):
+            start = time.time()
+            subprocess.call(argv, stdout=devnull)
+            result.append(time.time() - start)
+    finally:
+        devnull.close()
+    result.sort()
+    return result
+
+
+def main():
+    parser = optparse.OptionParser(
+        usage='%prog [-n RUNS] [-p PYTHON] ENV_DIR [-- COMMAND...]')
+    parser.add_option('-n', dest='runs', type='int', default=30,
+                      help='Runs of each way (default %default)')
+    parser.add_option('-p', dest='python', default=sys.executable,
+                      help='Interpreter running virtualenv_class.py '
+                      '(default %default)')
+    options, args = parser.parse_args()
+    if not args:
+        parser.error('expected ENV_DIR')
+    env_dir = os.path.abspath(args[0])
+    command = args[1:] or ['true']
+    shell = os.path.exists('/bin/bash') and '/bin/bash' or '/bin/sh'
+    ways = [
+        ('direct', command),
+        ('source bin/activate', [shell, '-c', '. %s && %s' % (
+            shell_quote(os.path.join(env_dir, 'bin', 'activate')),
+            ' '.join([shell_quote(arg) for arg in command]))]),
+        ('bin/virtualenv-exec', [os.path.join(env_dir, 'bin', 'virtualenv-exec')]
+         + command),
+        ('virtualenv exec', [options.python, os.path.join(root, 'virtualenv_class.py'),
+                             'exec', env_dir, '--'] + command),
+    ]
+    print('%s in %s, %s runs' % (' '.join(command), env_dir, options.runs))
+    for label, argv in ways:
+        result = times(argv, options.runs)
+        print('  %-22s best %7.2fms  median %7.2fms' % (
+            label, result[0] * 1000, result[len(result) // 2] * 1000))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Import-time benchmark for the ve package and the virtualenv_class CLI.
+
+Each target is imported in a fresh interpreter with ``__import__``
+wrapped, which records the cumulative time (including the modules it
+imports in turn) of the first import of every module.  The slowest
+modules are listed with the total; run it before and after touching the
+imports of ve.  It works on every Python virtualenv supports, unlike
+``python -X importtime``.
+
+Usage: python tests/bench_import.py [-n RUNS] [-t TOP] [MODULE...]
+"""
+
+import optparse
+import os
+import subprocess
+import sys
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+
+DEFAULT_TARGETS = ['ve', 'virtualenv_class']
+
+CASE = '''
+import sys, time
+try:
+    import __builtin__ as builtins
+except ImportError:
+    import builtins
+sys.path.insert(0, %(root)r)
+
+cumulative = {}
+original_import = builtins.__import__
+
+def timed_import(name, *args, **kw):
+    if name in sys.modules:
+        return original_import(name, *args, **kw)
+    start = time.time()
+    try:
+        return original_import(name, *args, **kw)
+    finally:
+        if name not in cumulative:
+            cumulative[name] = time.time() - start
+
+builtins.__import__ = timed_import
+start = time.time()
+__import__(%(target)r)
+total = time.time() - start
+builtins.__import__ = original_import
+sys.stdout.write('%%f total\\n' %% total)
+for name, seconds in cumulative.items():
+    sys.stdout.write('%%f %%s\\n' %% (seconds, name))
+'''
+
+
+def measure(target):
+    output = subprocess.Popen(
+        [sys.executable, '-c', CASE % {'root': root, 'target': target}],
+        stdout=subprocess.PIPE, cwd=root).communicate()[0]
+    result = {}
+    for line in output.decode('ascii').splitlines():
+        seconds, name = line.split(' ', 1)
+        result[name] = float(seconds)
+    return result
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [-n RUNS] [-t TOP] [MODULE...]')
+    parser.add_option('-n', dest='runs', type='int', default=10,
+                      help='Runs per target; the best time of each module '
+                      'is shown (default %default)')
+    parser.add_option('-t', dest='top', type='int', default=15,
+                      help='Number of modules listed (default %default)')
+    options, targets = parser.parse_args()
+    print('Python %s, best of %s runs' % (sys.version.split()[0], options.runs))
+    for target in targets or DEFAULT_TARGETS:
+        best = {}
+        for i in range(options.runs):
+            for name, seconds in measure(target).items():
+                if name not in best or seconds < best[name]:
+                    best[name] = seconds
+        total = best.pop('total')
+        print('')
+        print('import %s: %.2fms, %s modules' % (target, total * 1000, len(best)))
+        ranked = sorted(best.items(), key=lambda item: -item[1])
+        for name, seconds in ranked[:options.top]:
+            print('  %8.2fms  %s' % (seconds * 1000, name))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+"""
+Benchmark of the lazy embedded resources of ve/_autogen.py.  In a fresh
+interpreter it imports ve (which decodes nothing any more), then decodes
+every embedded file as the import used to do, and reports the time and
+the growth of the peak resident memory of each step: the second line is
+what the lazy import saves.
+
+Usage: python tests/bench_resources.py [RUNS]
+"""
+
+import os
+import subprocess
+import sys
+
+here = os.path.dirname(os.path.abspath(__file__))
+# the checkout this file is in, whose ve package is measured
+root = os.path.dirname(here)
+
+CASE = '''
+import sys, time, resource
+sys.path.insert(0, %(root)r)
+
+def maxrss():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+rss = maxrss()
+start = time.time()
+import ve
+import_time = time.time() - start
+import_rss = maxrss() - rss
+
+rss = maxrss()
+start = time.time()
+for name in ve.RESOURCE_NAMES:
+    ve.get_resource(name)
+decode_time = time.time() - start
+decode_rss = maxrss() - rss
+sys.stdout.write('%%f %%d %%f %%d %%d\\n' %% (
+    import_time, import_rss, decode_time, decode_rss, len(ve.RESOURCE_NAMES)))
+'''
+
+
+def main():
+    runs = 10
+    if len(sys.argv) > 1:
+        runs = int(sys.argv[1])
+    results = []
+    for i in range(runs):
+        output = subprocess.Popen(
+            [sys.executable, '-c', CASE % {'root': root}],
+            stdout=subprocess.PIPE).communicate()[0]
+        results.append([float(value) for value in output.decode('ascii').split()])
+    import_time, import_rss, decode_time, decode_rss, count = [
+        min(values) for values in zip(*results)]
+    print('Python %s, best of %s runs' % (sys.version.split()[0], runs))
+    print('%-34s %8.2fms %+8dkB max RSS' % ('import ve (lazy resources)',
+                                            import_time * 1000, import_rss))
+    print('%-34s %8.2fms %+8dkB max RSS' % (
+        'decoding all %d resources (saved)' % count,
+        decode_time * 1000, decode_rss))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+"""
+Startup benchmark of a virtualenv environment.  Times ``python -c pass``
+with the environment's interpreter and with the base interpreter it was
+created from, then runs the environment's interpreter with
+VIRTUALENV_SITE_PROFILE set and lists the time and the os.stat() and
+os.listdir() calls of each step of its site.py, best of all runs.
+
+Usage: python tests/bench_startup.py [-n RUNS] [-p BASE_PYTHON] ENV_DIR
+"""
+
+import optparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BASE_EXECUTABLE = '''
+import os, sys
+if sys.platform == 'win32':
+    path = os.path.join(sys.real_prefix, 'python.exe')
+else:
+    path = os.path.join(sys.real_prefix, 'bin', 'python%d.%d' % sys.version_info[:2])
+sys.stdout.write(path)
+'''
+
+
+def env_executable(env_dir):
+    if sys.platform == 'win32':
+        return os.path.join(env_dir, 'Scripts', 'python.exe')
+    return os.path.join(env_dir, 'bin', 'python')
+
+
+def base_executable(executable):
+    output = subprocess.Popen([executable, '-c', BASE_EXECUTABLE],
+                              stdout=subprocess.PIPE).communicate()[0]
+    return output.decode(sys.getfilesystemencoding() or 'ascii')
+
+
+def start_times(executable, runs, env=None):
+    """Returns the sorted wall-clock times of ``runs`` interpreter starts"""
+    times = []
+    for i in range(runs):
+        start = time.time()
+        subprocess.call([executable, '-c', 'pass'], env=env)
+        times.append(time.time() - start)
+    times.sort()
+    return times
+
+
+def read_profiles(filename):
+    """Returns the best ``[ms, stat, listdir]`` of each step in the
+    reports appended to ``filename``, and the steps in order"""
+    best = {}
+    order = []
+    f = open(filename)
+    try:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if line.startswith('#') or parts[0] == 'step' or len(parts) != 4:
+                continue
+            name = parts[0]
+            values = [float(parts[1]), int(parts[2]), int(parts[3])]
+            if name not in best:
+                order.append(name)
+                best[name] = values
+            elif values[0] < best[name][0]:
+                best[name] = values
+    finally:
+        f.close()
+    return best, order
+
+
+def main():
+    parser = optparse.OptionParser(
+        usage='%prog [-n RUNS] [-p BASE_PYTHON] ENV_DIR')
+    parser.add_option('-n', dest='runs', type='int', default=30,
+                      help='Interpreter starts per measurement (default '
+                      '%default)')
+    parser.add_option('-p', dest='base_python', metavar='BASE_PYTHON',
+                      help='Base interpreter to compare with (default: the '
+                      'one the environment was created from)')
+    options, args = parser.parse_args()
+    if len(args) != 1:
+        parser.error('expected one ENV_DIR')
+    executable = env_executable(args[0])
+    base = options.base_python or base_executable(executable)
+
+    if os.environ.get('PYTHONDONTWRITEBYTECODE'):
+        print('PYTHONDONTWRITEBYTECODE is set: without site.pyc every start '
+              'compiles site.py, which the profile does not show')
+    print('Interpreter start (python -c pass), %s runs' % options.runs)
+    for label, path in (('base', base), ('environment', executable)):
+        times = start_times(path, options.runs)
+        print('  %-12s best %7.2fms  median %7.2fms  %s' % (
+            label, times[0] * 1000, times[len(times) // 2] * 1000, path))
+
+    fd, filename = tempfile.mkstemp(suffix='.txt')
+    os.close(fd)
+    try:
+        env = os.environ.copy()
+        env['VIRTUALENV_SITE_PROFILE'] = filename
+        start_times(executable, options.runs, env)
+        best, order = read_profiles(filename)
+    finally:
+        os.remove(filename)
+    if not best:
+        print('The site.py of %s wrote no profile' % args[0])
+        return
+    print('')
+    print('site.py steps, best of %s runs' % options.runs)
+    print('  %-32s %9s %6s %8s' % ('step', 'ms', 'stat', 'listdir'))
+    for name in order:
+        ms, stats, listdirs = best[name]
+        print('  %-32s %9.3f %6d %8d' % (name, ms, stats, listdirs))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+import os
+import shutil
+import sys
+import tempfile
+
+from ve.activation import Activation, env_dirs, resolve
+
+
+def make_env():
+    """An environment with a module in site-packages and one in a .pth dir"""
+    home_dir = tempfile.mkdtemp()
+    bin_dir, site_packages = env_dirs(home_dir)
+    os.makedirs(site_packages)
+    os.makedirs(os.path.join(home_dir, 'src'))
+    f = open(os.path.join(site_packages, 'activated_module.py'), 'w')
+    f.write('VALUE = 1\n')
+    f.close()
+    f = open(os.path.join(home_dir, 'src', 'developed_module.py'), 'w')
+    f.write('VALUE = 2\n')
+    f.close()
+    f = open(os.path.join(site_packages, 'develop.pth'), 'w')
+    f.write(os.path.join(home_dir, 'src') + '\n')
+    f.close()
+    return home_dir, bin_dir, site_packages
+
+
+def test_activation_restores_state():
+    """Should put the environment first and undo everything on exit"""
+    home_dir, bin_dir, site_packages = make_env()
+    path, prefix = list(sys.path), sys.prefix
+    real_prefix = getattr(sys, 'real_prefix', None)
+    os_path = os.environ.get('PATH')
+    try:
+        activation = Activation(home_dir).activate()
+        try:
+            assert sys.path[:2] == [site_packages, os.path.join(home_dir, 'src')]
+            assert sys.prefix == os.path.abspath(home_dir)
+            assert sys.real_prefix == prefix
+            assert os.environ['PATH'].split(os.pathsep)[0] == bin_dir
+            import activated_module
+            import developed_module
+            assert activated_module.VALUE + developed_module.VALUE == 3
+        finally:
+            activation.deactivate()
+        assert sys.path == path
+        assert sys.prefix == prefix
+        assert getattr(sys, 'real_prefix', None) == real_prefix
+        assert os.environ.get('PATH') == os_path
+        assert 'activated_module' not in sys.modules
+        assert 'developed_module' not in sys.modules
+        assert resolve(home_dir)[1] == [site_packages, os.path.join(home_dir, 'src')]
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def test_activation_runs_pth_imports():
+    """Should run the import lines of .pth files on every activation"""
+    home_dir, bin_dir, site_packages = make_env()
+    f = open(os.path.join(site_packages, 'hook.pth'), 'w')
+    f.write('import sys; sys.activation_hook_runs = '
+            'getattr(sys, "activation_hook_runs", 0) + 1\n')
+    f.close()
+    try:
+        for runs in (1, 2):
+            activation = Activation(home_dir).activate()
+            try:
+                assert sys.activation_hook_runs == runs
+            finally:
+                activation.deactivate()
+        assert resolve(home_dir)[1] == [site_packages, os.path.join(home_dir, 'src')]
+    finally:
+        if hasattr(sys, 'activation_hook_runs'):
+            del sys.activation_hook_runs
+        shutil.rmtree(home_dir)
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+
+from ve.archives import ArchiveIndex, archive_hash, best_archive, \
+     parse_archive_name, version_key
+
+
+def _touch(filename, content='x'):
+    f = open(filename, 'w')
+    f.write(content)
+    f.close()
+
+
+def test_version_key_orders_numerically():
+    """Should order versions by number, with releases after pre-releases"""
+    versions = ['1.10', '1.9', '1.1b1', '1.1', '1.1.1', '0.6c11']
+    versions.sort(key=version_key)
+    assert versions == ['0.6c11', '1.1b1', '1.1', '1.1.1', '1.9', '1.10']
+    versions = ['1.1', '1.0-r1', '1.0.post2', '1.0', '1.0.post1', '1.0rc1']
+    versions.sort(key=version_key)
+    assert versions == ['1.0rc1', '1.0', '1.0-r1', '1.0.post1', '1.0.post2', '1.1']
+    assert parse_archive_name('setuptools-0.6c11-py2.7.egg') == (
+        'setuptools', '0.6c11', '2.7')
+
+
+def test_best_archive_picks_newest_and_sees_new_files():
+    """Should pick pip-1.10 over pip-1.9 and notice archives added later"""
+    dir = tempfile.mkdtemp()
+    try:
+        _touch(os.path.join(dir, 'pip-1.9.tar.gz'))
+        _touch(os.path.join(dir, 'pip-1.10.tar.gz'))
+        _touch(os.path.join(dir, 'README'))
+        assert best_archive('pip', [dir]) == os.path.join(dir, 'pip-1.10.tar.gz')
+        assert len(archive_hash(os.path.join(dir, 'pip-1.9.tar.gz'))) == 40
+
+        # make sure the directory mtime changes
+        os.utime(dir, (0, 0))
+        _touch(os.path.join(dir, 'pip-1.11.zip'))
+        assert best_archive('pip', [dir]) == os.path.join(dir, 'pip-1.11.zip')
+    finally:
+        shutil.rmtree(dir)
+
+
+def test_archive_index_saved_privately():
+    """Should keep the index in the cache, not in the search dir"""
+    dir = tempfile.mkdtemp()
+    storage_dir = tempfile.mkdtemp()
+    try:
+        _touch(os.path.join(dir, 'pip-1.1.tar.gz'))
+        index = ArchiveIndex(dir, storage_dir)
+        assert index.update()
+        index.save()
+        assert os.listdir(dir) == ['pip-1.1.tar.gz']
+        assert os.path.exists(index.filename())
+
+        index = ArchiveIndex(dir, storage_dir)
+        assert index.load()
+        assert not index.update()
+        assert list(index.entries) == ['pip-1.1.tar.gz']
+    finally:
+        shutil.rmtree(dir)
+        shutil.rmtree(storage_dir)
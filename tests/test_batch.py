@@ -0,0 +1,92 @@
+import optparse
+import os
+import shutil
+import sys
+import tempfile
+
+from ve.batch import BatchResult, create_environment, create_environments
+from ve.log import logger
+from ve.timing import timings
+
+
+class FakeDistribution(object):
+    """
+    Creates an environment by writing a marker file; a directory named
+    ``fail`` raises and one named ``exit`` exits, like a failed install
+    """
+
+    def __init__(self, fs, home_dir, options):
+        self.home_dir = home_dir
+
+    def path_locations(self):
+        pass
+
+    def warm_up(self):
+        pass
+
+    def create(self):
+        name = os.path.basename(self.home_dir)
+        logger.warn('creating %s', name)
+        if name == 'fail':
+            raise ValueError('broken %s' % name)
+        if name == 'exit':
+            sys.exit(3)
+        os.mkdir(self.home_dir)
+        timings.timed('marker', self.write_marker)
+
+    def write_marker(self):
+        f = open(os.path.join(self.home_dir, 'created-by'), 'w')
+        f.write(str(os.getpid()))
+        f.close()
+
+
+def make_options():
+    return optparse.Values({'copy_strategy': 'auto'})
+
+
+def test_batch_result():
+    """Should default to no messages and timings"""
+    result = BatchResult('/envs/env', True, 1.5)
+    assert (result.messages, result.timings, result.error) == ([], {}, None)
+    assert repr(result) == '<BatchResult /envs/env ok in 1.50s>'
+    assert 'failed' in repr(BatchResult('/envs/env', False, 0, error='boom'))
+
+
+def test_create_environment_keeps_errors():
+    """Should return a failed result instead of raising"""
+    tmp_dir = tempfile.mkdtemp()
+    consumers = logger.consumers
+    try:
+        home_dir = os.path.join(tmp_dir, 'fail')
+        result = create_environment((FakeDistribution, home_dir, make_options()))
+        assert not result.success
+        assert result.error == 'ValueError: broken fail'
+        assert result.messages == ['creating fail']
+    finally:
+        logger.init(consumers)
+        shutil.rmtree(tmp_dir)
+
+
+def test_create_environments():
+    """Should create each environment in a worker process and pass on the
+    outcome, errors included, in order"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        home_dirs = [os.path.join(tmp_dir, name)
+                     for name in ('one', 'fail', 'two', 'exit')]
+        results = create_environments(home_dirs, make_options(), processes=2,
+                                      env_klass=FakeDistribution)
+        assert [result.home_dir for result in results] == home_dirs
+        assert [result.success for result in results] == [True, False, True, False]
+        assert results[1].error == 'ValueError: broken fail'
+        assert results[3].error == 'SystemExit: 3'
+        for home_dir, result in zip(home_dirs, results):
+            assert result.messages == ['creating %s' % os.path.basename(home_dir)]
+        for result in results[0], results[2]:
+            f = open(os.path.join(result.home_dir, 'created-by'))
+            pid = int(f.read())
+            f.close()
+            assert pid != os.getpid()
+            assert [phase['phase'] for phase in result.timings['phases']] == ['marker']
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,149 @@
+import os
+import shutil
+import sys
+import tempfile
+
+from ve.bootstrap import STEP_MARKER, PackagingCache, StepFilter, \
+     install_requirements, merge_pth_lines, path_to_url
+from ve.fs import FileSystemService
+from ve.log import Logger
+
+
+def test_step_filter_follows_runner_steps():
+    """Should filter each step's output with that step's rules"""
+    step_filter = StepFilter()
+    assert step_filter(STEP_MARKER + 'distribute') == Logger.DEBUG
+    assert step_filter('Some distribute chatter') == Logger.DEBUG
+    assert step_filter(STEP_MARKER + 'pip') == Logger.DEBUG
+    assert step_filter('Installed pip') == Logger.DEBUG
+    assert step_filter('Something unexpected') == Logger.INFO
+
+
+def _write(filename, content):
+    if not os.path.isdir(os.path.dirname(filename)):
+        os.makedirs(os.path.dirname(filename))
+    f = open(filename, 'w')
+    f.write(content)
+    f.close()
+
+
+def _read(filename):
+    f = open(filename)
+    try:
+        return f.read()
+    finally:
+        f.close()
+
+
+def test_packaging_cache_relocates_scripts():
+    """Should restore the installed files with the new prefix in scripts"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cache = PackagingCache(FileSystemService(), tmp_dir)
+        old, new = os.path.join(tmp_dir, 'old'), os.path.join(tmp_dir, 'new')
+        for home in old, new:
+            os.makedirs(os.path.join(home, 'site'))
+            os.makedirs(os.path.join(home, 'bin'))
+        before = cache.listing(os.path.join(old, 'site'), os.path.join(old, 'bin'))
+        _write(os.path.join(old, 'site', 'pip.egg', 'pip.py'), 'pip')
+        _write(os.path.join(old, 'site', 'pip.egg', 'pip.pyc'), 'bytecode')
+        _write(os.path.join(old, 'bin', 'pip'), '#!%s/bin/python\n' % old)
+        cache.save('k', old, os.path.join(old, 'site'), os.path.join(old, 'bin'),
+                   before)
+        assert cache.has('k')
+
+        cache.restore('k', new, os.path.join(new, 'site'), os.path.join(new, 'bin'))
+        assert _read(os.path.join(new, 'site', 'pip.egg', 'pip.py')) == 'pip'
+        assert not os.path.exists(os.path.join(new, 'site', 'pip.egg', 'pip.pyc'))
+        assert _read(os.path.join(new, 'bin', 'pip')) == '#!%s/bin/python\n' % new
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_packaging_cache_restores_copies():
+    """Should never hard link the cached files into an environment"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cache = PackagingCache(FileSystemService('hardlink'), tmp_dir)
+        old, new = os.path.join(tmp_dir, 'old'), os.path.join(tmp_dir, 'new')
+        for home in old, new:
+            os.makedirs(os.path.join(home, 'site'))
+            os.makedirs(os.path.join(home, 'bin'))
+        before = cache.listing(os.path.join(old, 'site'), os.path.join(old, 'bin'))
+        _write(os.path.join(old, 'site', 'pip.egg', 'pip.py'), 'pip')
+        cache.save('k', old, os.path.join(old, 'site'), os.path.join(old, 'bin'),
+                   before)
+        cache.restore('k', new, os.path.join(new, 'site'), os.path.join(new, 'bin'))
+
+        restored = os.path.join(new, 'site', 'pip.egg', 'pip.py')
+        cached = os.path.join(cache.path('k'), 'site-packages', 'pip.egg', 'pip.py')
+        assert os.stat(restored).st_ino != os.stat(cached).st_ino
+        _write(restored, 'upgraded')
+        assert _read(cached) == 'pip'
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+HEADER = 'import sys; sys.__plen = len(sys.path)'
+FOOTER = 'import sys; new=sys.path[sys.__plen:]; del sys.path[sys.__plen:]'
+
+
+def test_merge_pth_lines():
+    """Should add the missing entries before the closing import lines"""
+    assert merge_pth_lines([], ['./pip.egg']) == ['./pip.egg']
+    assert merge_pth_lines([HEADER, './foo.egg', FOOTER],
+                           [HEADER, './setuptools.egg', './foo.egg', FOOTER]) == [
+        HEADER, './foo.egg', './setuptools.egg', FOOTER]
+    assert merge_pth_lines(['/src/foo'], ['/src/foo', '']) == ['/src/foo']
+
+
+def test_packaging_cache_keeps_installed_eggs():
+    """Should keep the entries of an existing easy-install.pth on restore"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        cache = PackagingCache(FileSystemService(), tmp_dir)
+        old, new = os.path.join(tmp_dir, 'old'), os.path.join(tmp_dir, 'new')
+        for home in old, new:
+            os.makedirs(os.path.join(home, 'site'))
+            os.makedirs(os.path.join(home, 'bin'))
+        before = cache.listing(os.path.join(old, 'site'), os.path.join(old, 'bin'))
+        _write(os.path.join(old, 'site', 'easy-install.pth'),
+               '%s\n./pip.egg\n%s/src\n%s\n' % (HEADER, old, FOOTER))
+        cache.save('k', old, os.path.join(old, 'site'), os.path.join(old, 'bin'),
+                   before)
+
+        _write(os.path.join(new, 'site', 'easy-install.pth'),
+               '%s\n./pip.egg\n./foo.egg\n%s\n' % (HEADER, FOOTER))
+        cache.restore('k', new, os.path.join(new, 'site'), os.path.join(new, 'bin'))
+        assert _read(os.path.join(new, 'site', 'easy-install.pth')) == (
+            '%s\n./pip.egg\n./foo.egg\n%s/src\n%s\n' % (HEADER, new, FOOTER))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_install_requirements_single_pip_run():
+    """Should install every requirements file with one pip command line"""
+    if sys.platform == 'win32':
+        return
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        argv_file = os.path.join(tmp_dir, 'argv.txt')
+        python = os.path.join(tmp_dir, 'python')
+        _write(python, '#!/bin/sh\nprintf "%%s\\n" "$@" >> %s\n' % argv_file)
+        os.chmod(python, 0x1ed)  # 0o755
+        requirements = [os.path.join(tmp_dir, 'one.txt'),
+                        os.path.join(tmp_dir, 'two.txt')]
+        search_dirs = [tmp_dir, os.path.join(tmp_dir, 'missing')]
+        runner = ['-c', 'import sys, pip; sys.exit(pip.main(sys.argv[1:]))',
+                  'install', '-r', requirements[0], '-r', requirements[1]]
+
+        install_requirements(python, requirements, search_dirs=search_dirs)
+        assert _read(argv_file).splitlines() == runner
+        os.remove(argv_file)
+
+        install_requirements(python, requirements, search_dirs=search_dirs,
+                             never_download=True)
+        assert _read(argv_file).splitlines() == runner + [
+            '--no-index', '--find-links', path_to_url(tmp_dir)]
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,25 @@
+import os
+import shutil
+import tempfile
+
+from ve.bytecompile import compile_files, compile_targets
+
+
+def test_compile_targets_and_failures():
+    """Should compile stale sources only and report the broken ones"""
+    home_dir = tempfile.mkdtemp()
+    try:
+        good = os.path.join(home_dir, 'good.py')
+        bad = os.path.join(home_dir, 'bad.py')
+        open(good, 'w').write('x = 1\n')
+        open(bad, 'w').write('def (\n')
+        if hasattr(os, 'symlink'):
+            os.symlink(good, os.path.join(home_dir, 'linked.py'))
+        assert compile_targets(home_dir) == [bad, good]
+
+        results = dict(compile_files([bad, good], processes=2))
+        assert results[good] is None
+        assert results[bad]
+        assert compile_targets(home_dir) == [bad]
+    finally:
+        shutil.rmtree(home_dir)
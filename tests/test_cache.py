@@ -0,0 +1,22 @@
+import os
+import shutil
+import tempfile
+
+from ve.cache import InterpreterCache
+
+
+def test_interpreter_cache_persists():
+    """Should read back entries saved by an earlier InterpreterCache"""
+    storage_dir = tempfile.mkdtemp()
+    try:
+        cache = InterpreterCache(storage_dir)
+        assert cache.get('modules') is None
+        cache.set('modules', {'names': ['os'], 'files': ['/x/os.py']})
+        assert os.path.exists(cache.filename())
+
+        cache = InterpreterCache(storage_dir)
+        assert cache.get('modules') == {'names': ['os'], 'files': ['/x/os.py']}
+        cache.discard('modules')
+        assert InterpreterCache(storage_dir).get('modules') is None
+    finally:
+        shutil.rmtree(storage_dir)
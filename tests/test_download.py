@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import threading
+try:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+except ImportError:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from ve.download import DownloadCache
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+f = open(os.path.join(here, '..', 'virtualenv_support', 'pip-1.1.tar.gz'), 'rb')
+ARCHIVE = f.read()
+f.close()
+ETAG = '"v1"'
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    requests = []
+    # path -> (body, Content-Type, Content-Length)
+    files = {'/source/p/pip/pip-1.1.tar.gz':
+             (ARCHIVE, 'application/x-gzip', len(ARCHIVE)),
+             '/tampered/pip-1.1.tar.gz':
+             (b'not really a tarball', 'application/x-gzip', 20),
+             '/error/other-1.0.tar.gz':
+             (b'<html>Not here</html>', 'text/html', 21),
+             '/short/other-1.0.tar.gz':
+             (b'half', 'application/x-gzip', 8)}
+
+    def do_GET(self):
+        self.requests.append((self.path, self.headers.get('If-None-Match')))
+        if self.path not in self.files:
+            self.send_error(404)
+        elif self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+        else:
+            body, content_type, length = self.files[self.path]
+            self.send_response(200)
+            self.send_header('ETag', ETAG)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(length))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server():
+    server = HTTPServer(('127.0.0.1', 0), ArchiveHandler)
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    return server, 'http://127.0.0.1:%s/' % server.server_address[1]
+
+
+def test_download_cache_conditional_requests():
+    """Should download once, then revalidate with the ETag it was served"""
+    storage_dir = tempfile.mkdtemp()
+    server, base_url = start_server()
+    try:
+        cache = DownloadCache(storage_dir)
+        downloads = [('pip-1.1.tar.gz', 'source/p/pip/pip-1.1.tar.gz'),
+                     ('missing-1.0.tar.gz', 'source/m/missing-1.0.tar.gz')]
+        paths = cache.fetch_all(downloads, base_url)
+        assert paths == [cache.path('pip-1.1.tar.gz'), None]
+        assert open(paths[0], 'rb').read() == ARCHIVE
+
+        # cached archives don't go to the network unless refreshed
+        del ArchiveHandler.requests[:]
+        assert cache.fetch_all(downloads[:1], base_url) == paths[:1]
+        assert ArchiveHandler.requests == []
+        assert cache.fetch_all(downloads[:1], base_url, refresh=True) == paths[:1]
+        assert ArchiveHandler.requests == [('/source/p/pip/pip-1.1.tar.gz', ETAG)]
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(storage_dir)
+
+
+def test_download_cache_rejects_bad_downloads():
+    """Should not cache a download that fails its digest, an error page or a
+    truncated one"""
+    storage_dir = tempfile.mkdtemp()
+    server, base_url = start_server()
+    try:
+        cache = DownloadCache(storage_dir)
+        downloads = [('pip-1.1.tar.gz', 'tampered/pip-1.1.tar.gz'),
+                     ('other-1.0.tar.gz', 'error/other-1.0.tar.gz'),
+                     ('other-1.0.tar.gz', 'short/other-1.0.tar.gz')]
+        for download in downloads:
+            assert cache.fetch_all([download], base_url) == [None]
+            assert not os.path.exists(cache.path(download[0]))
+    finally:
+        server.shutdown()
+        server.server_close()
+        shutil.rmtree(storage_dir)
@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+
+from ve.eggs import flatten_eggs
+from ve.fs import FileSystemService
+
+
+def make_egg(site_dir, name, files, namespace=False):
+    egg_dir = os.path.join(site_dir, '%s-1.0-py2.7.egg' % name)
+    os.makedirs(os.path.join(egg_dir, 'EGG-INFO'))
+    f = open(os.path.join(egg_dir, 'EGG-INFO', 'PKG-INFO'), 'w')
+    f.write('Metadata-Version: 1.0\nName: %s\nVersion: 1.0\n' % name)
+    f.close()
+    if namespace:
+        open(os.path.join(egg_dir, 'EGG-INFO', 'namespace_packages.txt'), 'w').close()
+    for filename in files:
+        path = os.path.join(egg_dir, filename)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        open(path, 'w').close()
+    return './' + os.path.basename(egg_dir)
+
+
+def test_flatten_eggs():
+    """Should merge the eggs that clash with nothing and keep the rest"""
+    site_dir = tempfile.mkdtemp()
+    try:
+        open(os.path.join(site_dir, 'local.py'), 'w').close()
+        lines = ['import sys; sys.__plen = len(sys.path)',
+                 make_egg(site_dir, 'one', ['one/__init__.py', 'one/__init__.pyc']),
+                 make_egg(site_dir, 'two', ['two.py', 'local.py']),
+                 make_egg(site_dir, 'three', ['three/__init__.py', 'shared.py']),
+                 make_egg(site_dir, 'four', ['shared/__init__.py']),
+                 make_egg(site_dir, 'ns', ['ns/__init__.py'], namespace=True),
+                 'import sys; new=sys.path[sys.__plen:]']
+        pth = os.path.join(site_dir, 'easy-install.pth')
+        f = open(pth, 'w')
+        f.write('\n'.join(lines) + '\n')
+        f.close()
+
+        flattened = flatten_eggs(FileSystemService(), site_dir)
+        assert [os.path.basename(path) for path in flattened] == ['one-1.0-py2.7.egg']
+        assert os.path.exists(os.path.join(site_dir, 'one', '__init__.py'))
+        assert not os.path.exists(os.path.join(site_dir, 'one', '__init__.pyc'))
+        assert not os.path.exists(os.path.join(site_dir, 'one-1.0-py2.7.egg'))
+        egg_info = os.path.join(site_dir, 'one-1.0-py2.7.egg-info')
+        assert os.path.exists(os.path.join(egg_info, 'PKG-INFO'))
+        installed = open(os.path.join(egg_info, 'installed-files.txt')).read().split()
+        assert os.path.join('..', 'one', '__init__.py') in installed
+        assert open(pth).read().split('\n')[:-1] == lines[:1] + lines[2:]
+    finally:
+        shutil.rmtree(site_dir)
@@ -0,0 +1,154 @@
+import errno
+import os
+import shutil
+import stat
+import tempfile
+
+from ve.fs import COPY_STRATEGIES, FileSystemService
+
+
+def failing(error_number, calls):
+    """A copy strategy that fails like an unsupported filesystem would"""
+    def strategy(src, dest, same_device):
+        calls.append(dest)
+        # a half-made destination must not stop the next strategy
+        open(dest, 'w').close()
+        raise OSError(error_number, os.strerror(error_number))
+    return strategy
+
+
+def make_source(tmp_dir):
+    src = os.path.join(tmp_dir, 'python')
+    f = open(src, 'wb')
+    f.write('\0binary content'.encode('ascii'))
+    f.close()
+    os.chmod(src, 0x1ed)  # 0o755
+    return src
+
+
+def assert_copied(src, dest):
+    f = open(dest, 'rb')
+    try:
+        assert f.read() == '\0binary content'.encode('ascii')
+    finally:
+        f.close()
+    assert stat.S_IMODE(os.stat(dest).st_mode) == stat.S_IMODE(os.stat(src).st_mode)
+    assert os.stat(dest).st_ino != os.stat(src).st_ino
+
+
+def test_copy_strategy_chain():
+    """Should try the chosen strategy, then the ones after it"""
+    assert FileSystemService()._strategies == COPY_STRATEGIES
+    assert FileSystemService('hardlink')._strategies == [
+        'hardlink', 'copy_file_range', 'copy']
+    assert FileSystemService('copy')._strategies == ['copy']
+
+
+def test_materialize_falls_back_to_copy():
+    """Should fall back to a plain copy when every other strategy fails"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        src = make_source(tmp_dir)
+        fs = FileSystemService()
+        calls = {}
+        for strategy, error_number in (('reflink', errno.EOPNOTSUPP),
+                                       ('hardlink', errno.EXDEV),
+                                       ('copy_file_range', errno.EXDEV)):
+            calls[strategy] = []
+            setattr(fs, '_' + strategy, failing(error_number, calls[strategy]))
+
+        dest = os.path.join(tmp_dir, 'first')
+        assert fs.materialize(src, dest) == 'copy'
+        assert_copied(src, dest)
+        for strategy in calls:
+            assert calls[strategy] == [dest]
+
+        # the failures are remembered for these devices
+        dev = os.stat(tmp_dir).st_dev
+        assert fs._unsupported == set([(strategy, dev, dev) for strategy in calls])
+        dest = os.path.join(tmp_dir, 'second')
+        assert fs.materialize(src, dest) == 'copy'
+        assert_copied(src, dest)
+        for strategy in calls:
+            assert len(calls[strategy]) == 1
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_materialize_each_strategy_fails_alone():
+    """Should use the next strategy when only one of them fails"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        src = make_source(tmp_dir)
+        for i, strategy in enumerate(COPY_STRATEGIES[:-1]):
+            fs = FileSystemService(strategy)
+            # the ones after it are forced to work, but only by copying
+            for later in COPY_STRATEGIES[i + 1:]:
+                setattr(fs, '_' + later, fs._copy)
+            setattr(fs, '_' + strategy, failing(errno.EXDEV, []))
+            dest = os.path.join(tmp_dir, strategy)
+            assert fs.materialize(src, dest) == COPY_STRATEGIES[i + 1]
+            assert_copied(src, dest)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_materialize_all_strategies_fail():
+    """Should raise OSError when no strategy works"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        src = make_source(tmp_dir)
+        fs = FileSystemService('copy')
+        fs._copy = failing(errno.ENOSPC, [])
+        dest = os.path.join(tmp_dir, 'dest')
+        try:
+            fs.materialize(src, dest)
+        except OSError:
+            pass
+        else:
+            assert False, 'materialize() should fail'
+        assert not os.path.lexists(dest)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_materialize_resolves_symlinks():
+    """Should hard link the file a symlink points at, not the symlink"""
+    if not hasattr(os, 'symlink') or not hasattr(os, 'link'):
+        return
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        src = make_source(tmp_dir)
+        link = os.path.join(tmp_dir, 'python2')
+        os.symlink('python', link)
+        fs = FileSystemService('hardlink')
+        dest = os.path.join(tmp_dir, 'dest')
+        assert fs.materialize(link, dest) == 'hardlink'
+        assert not os.path.islink(dest)
+        assert os.stat(dest).st_ino == os.stat(src).st_ino
+
+        # executables are never hard linked, as they are changed in place
+        dest = os.path.join(tmp_dir, 'exe')
+        fs.copyfile(link, dest, symlink=False, hardlink=False)
+        assert not os.path.islink(dest)
+        assert_copied(src, dest)
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_copy_file_range_short_copy():
+    """Should fall back to a plain copy when copy_file_range copies less
+    than the whole file"""
+    if not hasattr(os, 'copy_file_range'):
+        return
+    tmp_dir = tempfile.mkdtemp()
+    copy_file_range = os.copy_file_range
+    os.copy_file_range = lambda src, dst, count: 0
+    try:
+        src = make_source(tmp_dir)
+        dest = os.path.join(tmp_dir, 'dest')
+        assert FileSystemService('copy_file_range').materialize(src, dest) == 'copy'
+        assert_copied(src, dest)
+    finally:
+        os.copy_file_range = copy_file_range
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,29 @@
+import os
+import shutil
+import tempfile
+
+from ve.fs import FileSystemService
+from ve.layers import LayerStore
+
+
+def test_layer_register_resolve():
+    """Should resolve registered layers in the order they were asked for"""
+    storage_dir = tempfile.mkdtemp()
+    try:
+        base = os.path.join(storage_dir, 'base')
+        os.mkdir(base)
+        store = LayerStore(FileSystemService(), storage_dir)
+        assert store.names() == []
+        store.register('base', base)
+        store.register('other', base)
+        assert store.names() == ['base', 'other']
+        assert store.resolve(['other', 'base']) == [store.path('other'),
+                                                    store.path('base')]
+        try:
+            store.resolve(['missing'])
+        except SystemExit:
+            pass
+        else:
+            assert False, 'resolving an unknown layer should exit'
+    finally:
+        shutil.rmtree(storage_dir)
@@ -0,0 +1,70 @@
+import os
+import shutil
+import tempfile
+
+from ve.manifest import Manifest
+from ve.plan import Plan
+
+
+def test_manifest_skips_unchanged_writes():
+    """Should drop planned writes whose file is unchanged since recorded"""
+    home_dir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(home_dir, 'a.txt')
+        f = open(filename, 'w')
+        f.write('same')
+        f.close()
+        manifest = Manifest(home_dir)
+        manifest.record(filename, 'activate', content='same')
+        manifest.save()
+
+        manifest = Manifest.load(home_dir)
+        plan = Plan(None)
+        plan.writefile(filename, 'same')
+        plan.writefile(os.path.join(home_dir, 'b.txt'), 'new')
+        manifest.filter(plan)
+        assert [op.dest for op in plan.operations] == [
+            os.path.join(home_dir, 'b.txt')]
+
+        plan = Plan(None)
+        plan.writefile(filename, 'different')
+        manifest.filter(plan)
+        assert len(plan.operations) == 1
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def test_manifest_refresh_after_clone():
+    """Should vouch for the relocated files of a cloned environment once
+    refreshed"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        template = os.path.join(tmp_dir, 'template')
+        os.mkdir(template)
+        filename = os.path.join(template, 'activate')
+        f = open(filename, 'w')
+        f.write('VIRTUAL_ENV=%s\n' % template)
+        f.close()
+        manifest = Manifest(template)
+        manifest.record(filename, 'activate')
+        manifest.save()
+
+        clone = os.path.join(tmp_dir, 'clone')
+        shutil.copytree(template, clone)
+        filename = os.path.join(clone, 'activate')
+        f = open(filename, 'w')
+        f.write('VIRTUAL_ENV=%s\n' % clone)
+        f.close()
+        manifest = Manifest.load(clone)
+        plan = Plan(None)
+        plan.writefile(filename, 'VIRTUAL_ENV=%s\n' % clone)
+        manifest.filter(plan)
+        assert len(plan.operations) == 1
+
+        manifest.refresh()
+        manifest.save()
+        manifest = Manifest.load(clone)
+        manifest.filter(plan)
+        assert plan.operations == []
+    finally:
+        shutil.rmtree(tmp_dir)
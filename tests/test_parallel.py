@@ -0,0 +1,37 @@
+import sys
+
+from ve.log import Logger, logger
+from ve.utils import run_parallel
+
+
+def test_run_parallel_keeps_item_order():
+    """Should return results and replay log messages in item order"""
+    messages = []
+    logger.init([(Logger.DEBUG, messages.append)])
+
+    def work(i):
+        logger.info('item %s', i)
+        return i * 2
+
+    try:
+        results = run_parallel(work, range(20), workers=4)
+    finally:
+        logger.init([(Logger.LEVELS[-1], messages.append)])
+
+    assert results == [i * 2 for i in range(20)]
+    assert messages == ['item %s' % i for i in range(20)]
+
+
+def test_run_parallel_reraises_first_error():
+    """Should raise the exception of the first failing item"""
+    def work(i):
+        if i in (3, 7):
+            raise ValueError(i)
+        return i
+
+    try:
+        run_parallel(work, range(10), workers=3)
+        assert False, "Should raise exception"
+    except ValueError:
+        e = sys.exc_info()[1]
+        assert e.args == (3,)
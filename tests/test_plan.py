@@ -0,0 +1,39 @@
+from ve.plan import Plan
+
+
+def test_plan_orders_dependent_operations():
+    """Should put operations inside a created directory in a later step"""
+    plan = Plan(None)
+    plan.phase('python')
+    plan.mkdir('/env/lib')
+    plan.copyfile('/usr/lib/os.py', '/env/lib/os.py')
+    plan.copyfile('/usr/lib/re.py', '/env/lib/re.py')
+    plan.writefile('/env/bin/activate', 'x')
+
+    [(phase, groups)] = plan.schedule()
+    assert phase == 'python'
+    assert [[op.dest for op in group] for group in groups] == [
+        ['/env/lib', '/env/bin/activate'],
+        ['/env/lib/os.py', '/env/lib/re.py']]
+
+
+def test_plan_drops_duplicates():
+    """Should drop an operation that repeats the latest change to its path"""
+    plan = Plan(None)
+    plan.writefile('/env/a', 'x')
+    plan.writefile('/env/a', 'x')
+    assert len(plan.operations) == 1
+    assert plan.duplicates == 1
+
+    plan.remove('/env/a')
+    plan.writefile('/env/a', 'x')
+    assert len(plan.operations) == 3
+
+
+def test_plan_cost_counts_written_bytes():
+    """Should count the bytes of written content"""
+    plan = Plan(None)
+    plan.writefile('/env/a', 'abc')
+    plan.writefile('/env/b', 'de')
+    calls, size = plan.cost()
+    assert size == 5
@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+
+import ve.probe
+from ve.probe import PROBE_SCRIPT, parse_probe_output, probe_executable, \
+     run_probe
+
+
+def test_probe_executable_matches_in_process_probe():
+    """Should report the same facts from a subprocess as in-process"""
+    facts = run_probe()
+    assert facts['prefix'] == os.path.abspath(sys.prefix)
+    assert facts['version'] == list(sys.version_info[:3])
+    assert probe_executable(sys.executable) == facts
+
+
+def test_probe_without_json():
+    """Should read the facts of an interpreter without json"""
+    facts = run_probe()
+    code = 'import sys\nsys.modules["json"] = None\n' + PROBE_SCRIPT
+    output = subprocess.Popen([sys.executable, '-c', code],
+                              stdout=subprocess.PIPE).communicate()[0]
+    output = output.decode('ascii')
+    assert not output.startswith('{"')
+    assert parse_probe_output(output) == facts
+
+    saved = ve.probe.json
+    ve.probe.json = None
+    try:
+        assert parse_probe_output(output) == facts
+        assert probe_executable(sys.executable) == facts
+    finally:
+        ve.probe.json = saved
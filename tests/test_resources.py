@@ -0,0 +1,18 @@
+import os
+
+from ve._autogen import RESOURCE_NAMES, _decoded, get_resource
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+
+def test_get_resource_decodes_once():
+    """Should decode an embedded file on first use only, and match its source"""
+    assert 'SITE_PY' in RESOURCE_NAMES
+    _decoded.pop('SITE_PY', None)
+    site_py = get_resource('SITE_PY')
+    assert get_resource('SITE_PY') is site_py
+    f = open(os.path.join(here, '..', 'virtualenv_embedded', 'site.py'))
+    try:
+        assert site_py == f.read()
+    finally:
+        f.close()
@@ -0,0 +1,36 @@
+import os
+import subprocess
+import sys
+
+from ve.runner import activation_environ
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+
+
+def test_activation_environ():
+    """Should set what the activate scripts set, on a copy"""
+    environ = {'PATH': os.pathsep.join(['/usr/bin', '/bin']),
+               'PYTHONHOME': '/elsewhere', 'HOME': '/home/user'}
+    result = activation_environ('/envs/env', 'bin', environ)
+    assert result['VIRTUAL_ENV'] == '/envs/env'
+    assert result['PATH'].split(os.pathsep) == [os.path.join('/envs/env', 'bin'),
+                                                '/usr/bin', '/bin']
+    assert 'PYTHONHOME' not in result
+    assert result['HOME'] == '/home/user'
+    assert environ['PYTHONHOME'] == '/elsewhere'
+
+
+def test_exec_command():
+    """Should replace the process with the command, in the environment"""
+    if sys.platform == 'win32':
+        return
+    code = ('import sys; sys.path.insert(0, %r); '
+            'from ve.runner import exec_command; '
+            'exec_command("/envs/env", "bin", ["sh", "-c", '
+            '"echo $VIRTUAL_ENV; exit 3"])' % root)
+    popen = subprocess.Popen([sys.executable, '-c', code],
+                             stdout=subprocess.PIPE)
+    output = popen.communicate()[0]
+    assert output.decode('ascii').strip() == '/envs/env'
+    assert popen.returncode == 3
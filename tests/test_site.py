@@ -0,0 +1,337 @@
+import ast
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+here = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(here)
+
+# Loads the site.py of an environment by hand, since the running
+# interpreter's own site module (frozen in recent Pythons) would shadow it
+LOAD_SITE = '''
+import sys, types
+sys.prefix = sys.exec_prefix = %(home_dir)r
+site = types.ModuleType('site')
+site.__file__ = %(site_py)r
+sys.modules['site'] = site
+f = open(site.__file__)
+source = f.read()
+f.close()
+exec(compile(source, site.__file__, 'exec'), site.__dict__)
+'''
+
+
+def make_env():
+    """
+    A skeleton environment: its lib dir holds the embedded site.py and
+    site-packages, without the global site-packages
+    """
+    home_dir = tempfile.mkdtemp()
+    lib_dir = os.path.join(home_dir, 'lib', 'python%s' % sys.version[:3])
+    site_packages = os.path.join(lib_dir, 'site-packages')
+    os.makedirs(site_packages)
+    shutil.copy(os.path.join(root, 'virtualenv_embedded', 'site.py'), lib_dir)
+    prefix = getattr(sys, 'real_prefix', getattr(sys, 'base_prefix', sys.prefix))
+    write(os.path.join(lib_dir, 'orig-prefix.txt'), prefix)
+    write(os.path.join(lib_dir, 'no-global-site-packages.txt'), '')
+    return home_dir, lib_dir, site_packages
+
+
+def write(filename, content):
+    f = open(filename, 'w')
+    try:
+        f.write(content)
+    finally:
+        f.close()
+
+
+def run_site(home_dir, code, **environ):
+    """
+    Runs ``code`` after the site.py of the environment in ``home_dir``,
+    in a fresh interpreter with ``environ`` added to its environment;
+    returns the value of the last line of output, and stderr
+    """
+    site_py = os.path.join(home_dir, 'lib', 'python%s' % sys.version[:3],
+                           'site.py')
+    env = dict(os.environ)
+    for name in ('VIRTUALENV_WRITE_PATH_CACHE', 'VIRTUALENV_WRITE_MODULE_INDEX',
+                 'VIRTUALENV_SITE_PROFILE', 'PYTHONPATH'):
+        env.pop(name, None)
+    env.update(environ)
+    popen = subprocess.Popen(
+        [sys.executable, '-S', '-c',
+         LOAD_SITE % {'home_dir': home_dir, 'site_py': site_py} + code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
+    stdout, stderr = popen.communicate()
+    stderr = stderr.decode('utf-8')
+    assert popen.returncode == 0, stderr
+    lines = stdout.decode('utf-8').splitlines()
+    return lines and ast.literal_eval(lines[-1]), stderr
+
+
+SHOW_CACHE = '''
+print(repr((site.load_path_cache() is not None,
+            [entry for entry in sys.path if entry.startswith(%r)])))
+'''
+
+
+def test_path_cache():
+    """Should only cache the probing if virtualenv asked for it, and use the
+    cache until a probed directory changes"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        cache = os.path.join(lib_dir, 'path-cache.txt')
+        code = SHOW_CACHE % home_dir
+        assert run_site(home_dir, code)[0] == (False, [site_packages])
+        assert not os.path.exists(cache)
+
+        result = run_site(home_dir, code, VIRTUALENV_WRITE_PATH_CACHE='1')[0]
+        assert result == (True, [site_packages])
+        f = open(cache)
+        lines = f.read().splitlines()
+        f.close()
+        assert lines[0].startswith('# virtualenv path cache ')
+        assert [line for line in lines if line.startswith('mtime\t')]
+        assert run_site(home_dir, code)[0] == (True, [site_packages])
+
+        # a directory site.py probes for appears: the cache is stale, and
+        # probing finds it
+        site_python = os.path.join(home_dir, 'lib', 'site-python')
+        os.mkdir(site_python)
+        assert run_site(home_dir, code)[0] == (False, [site_packages, site_python])
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def test_path_cache_of_other_python():
+    """Should ignore a path cache written for another Python"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        code = SHOW_CACHE % home_dir
+        run_site(home_dir, code, VIRTUALENV_WRITE_PATH_CACHE='1')
+        cache = os.path.join(lib_dir, 'path-cache.txt')
+        f = open(cache)
+        lines = f.read().splitlines()
+        f.close()
+        lines[0] = '# virtualenv path cache 1 0.0.0 other'
+        write(cache, '\n'.join(lines) + '\n')
+        assert run_site(home_dir, code)[0] == (False, [site_packages])
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def test_update_module_index():
+    """Should index the directories of the path, and only list changed ones"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        first = os.path.join(home_dir, 'first')
+        second = os.path.join(home_dir, 'second')
+        missing = os.path.join(home_dir, 'missing')
+        os.makedirs(os.path.join(first, 'package'))
+        os.mkdir(second)
+        write(os.path.join(first, 'shadow.py'), '')
+        write(os.path.join(second, 'shadow.py'), '')
+        write(os.path.join(second, 'other.py'), '')
+        code = '''
+path = (%r, %r, %r, 'relative')
+index, changed = site.update_module_index({}, path)
+again, changed_again = site.update_module_index(index, path)
+open(%r, 'w').close()
+updated, changed_updated = site.update_module_index(index, path)
+print(repr((sorted(index['dirs']), index['locations'], changed, changed_again,
+            changed_updated, updated['locations'].get('new'))))
+''' % (first, second, missing, os.path.join(second, 'new.py'))
+        result, stderr = run_site(home_dir, code)
+        dirs, locations, changed, changed_again, changed_updated, new = result
+        assert dirs == sorted([first, second, missing])
+        assert locations == {'shadow': 0, 'package': 0, 'other': 1}
+        assert (changed, changed_again, changed_updated) == (True, False, True)
+        assert new == 1
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def test_module_index_finder():
+    """Should search the indexed directory, and entries added since, until
+    sys.path is reordered; sys.path is only compared again once changed"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        first = os.path.join(home_dir, 'first')
+        second = os.path.join(home_dir, 'second')
+        os.mkdir(first)
+        os.mkdir(second)
+        write(os.path.join(first, 'shadow.py'), 'WHERE = "first"\n')
+        write(os.path.join(second, 'shadow.py'), 'WHERE = "second"\n')
+        code = '''
+sys.path[:0] = [%r, %r]
+index, changed = site.update_module_index({}, tuple(sys.path))
+finder = site.ModuleIndexFinder(index)
+sys.meta_path.insert(0, finder)
+searched = finder._search_path('shadow', None)
+import shadow
+found = [shadow.WHERE]
+del sys.modules['shadow']
+sys.path[:2] = sys.path[1::-1]
+reordered = finder._search_path('shadow', None)
+import shadow
+found.append(shadow.WHERE)
+del sys.modules['shadow']
+sys.path[:2] = sys.path[1::-1]
+sys.path.insert(0, %r)
+added = finder._search_path('shadow', None)
+cached = finder._search_path('shadow', None) is added
+print(repr((searched, found, reordered, added, cached)))
+''' % (first, second, home_dir)
+        result, stderr = run_site(home_dir, code)
+        searched, found, reordered, added, cached = result
+        assert searched == [first]
+        assert found == ['first', 'second']
+        assert reordered is None
+        assert added == [home_dir, first]
+        assert cached
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def test_install_module_index():
+    """Should only use module-index.dat if virtualenv wrote it"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        code = '''
+print(repr([type(finder).__name__ for finder in sys.meta_path]))
+'''
+        result, stderr = run_site(home_dir, code)
+        assert 'ModuleIndexFinder' not in result
+        assert not os.path.exists(os.path.join(lib_dir, 'module-index.dat'))
+        result, stderr = run_site(home_dir, code,
+                                  VIRTUALENV_WRITE_MODULE_INDEX='1')
+        assert 'ModuleIndexFinder' in result
+        assert os.path.exists(os.path.join(lib_dir, 'module-index.dat'))
+        result, stderr = run_site(home_dir, code)
+        assert 'ModuleIndexFinder' in result
+    finally:
+        shutil.rmtree(home_dir)
+
+
+MTIME = 1000000000
+
+PTH_IMPORT = 'import sys; sys.pth_runs = getattr(sys, "pth_runs", 0) + 1\n'
+
+SHOW_PTH = '''
+print(repr(([entry for entry in sys.path if entry.startswith(%r)],
+            getattr(sys, 'pth_runs', 0))))
+'''
+
+
+def test_pth_index_replay():
+    """Should only index .pth files if virtualenv asked for it, then replay
+    them from the index while they are unchanged"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        index = os.path.join(lib_dir, 'pth-index.dat')
+        for name in ('first', 'second'):
+            os.mkdir(os.path.join(home_dir, name))
+        pth = os.path.join(site_packages, 'develop.pth')
+        write(pth, '../../../first\n' + PTH_IMPORT)
+        code = SHOW_PTH % home_dir
+        expected = [site_packages, os.path.join(home_dir, 'first')]
+        assert run_site(home_dir, code)[0] == (expected, 1)
+        assert not os.path.exists(index)
+
+        # whole seconds, which os.utime() restores exactly
+        os.utime(pth, (MTIME, MTIME))
+        os.utime(site_packages, (MTIME, MTIME))
+        assert run_site(home_dir, code,
+                        VIRTUALENV_WRITE_PTH_INDEX='1')[0] == (expected, 1)
+        assert os.path.exists(index)
+
+        # new content with the old mtimes: the index is replayed
+        write(pth, '../../../second\n')
+        os.utime(pth, (MTIME, MTIME))
+        os.utime(site_packages, (MTIME, MTIME))
+        assert run_site(home_dir, code)[0] == (expected, 1)
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def test_pth_index_invalidation():
+    """Should read the .pth files of a site dir again once one changed, and
+    update the index; directories that are gone are never added"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        index = os.path.join(lib_dir, 'pth-index.dat')
+        for name in ('first', 'second'):
+            os.mkdir(os.path.join(home_dir, name))
+        pth = os.path.join(site_packages, 'develop.pth')
+        write(pth, '../../../first\n')
+        code = SHOW_PTH % home_dir
+        run_site(home_dir, code, VIRTUALENV_WRITE_PTH_INDEX='1')
+        assert os.path.exists(index)
+
+        write(pth, '../../../second\n' + PTH_IMPORT)
+        os.utime(pth, (MTIME, MTIME))
+        expected = [site_packages, os.path.join(home_dir, 'second')]
+        assert run_site(home_dir, code)[0] == (expected, 1)
+
+        # the updated index replays the new content, import line included
+        write(pth, '../../../first\n')
+        os.utime(pth, (MTIME, MTIME))
+        assert run_site(home_dir, code)[0] == (expected, 1)
+
+        # a new .pth file changes the site dir, so all of them are read
+        write(pth, '../../../second\n' + PTH_IMPORT)
+        write(os.path.join(site_packages, 'other.pth'), '../../../first\n')
+        expected.append(os.path.join(home_dir, 'first'))
+        assert run_site(home_dir, code)[0] == (expected, 1)
+
+        # a directory deleted since is left out, as addpackage() does
+        os.rmdir(os.path.join(home_dir, 'first'))
+        assert run_site(home_dir, code)[0] == (expected[:2], 1)
+        os.mkdir(os.path.join(home_dir, 'first'))
+        assert run_site(home_dir, code)[0] == (expected, 1)
+    finally:
+        shutil.rmtree(home_dir)
+
+
+def read_profile(text):
+    """The rows of a site.py profile report, as {step: (ms, stat, listdir)}"""
+    lines = text.splitlines()
+    assert lines[0].startswith('# site.py profile of ')
+    assert lines[1] == 'step\tms\tstat\tlistdir'
+    rows = {}
+    for line in lines[2:]:
+        name, ms, stats, listdirs = line.split('\t')
+        rows[name] = (float(ms), int(stats), int(listdirs))
+    return rows
+
+
+def test_site_profile():
+    """Should only report the steps of main() with VIRTUALENV_SITE_PROFILE,
+    to stderr or appended to a file"""
+    home_dir, lib_dir, site_packages = make_env()
+    try:
+        code = 'print(repr(None))\n'
+        assert run_site(home_dir, code)[1] == ''
+
+        rows = read_profile(run_site(home_dir, code,
+                                     VIRTUALENV_SITE_PROFILE='1')[1])
+        for step in ('load_caches', 'addsitepackages', 'save_caches', 'total'):
+            assert step in rows
+        assert rows['addsitepackages'][2] >= 1
+        assert rows['total'][0] >= rows['addsitepackages'][0]
+        assert rows['total'][1] >= rows['addsitepackages'][1]
+
+        report = os.path.join(home_dir, 'profile.txt')
+        for i in range(2):
+            assert run_site(home_dir, code, VIRTUALENV_SITE_PROFILE=report)[1] == ''
+        f = open(report)
+        text = f.read()
+        f.close()
+        reports = text.split('# site.py profile of ')[1:]
+        assert len(reports) == 2
+        for report in reports:
+            assert 'total' in read_profile('# site.py profile of ' + report)
+    finally:
+        shutil.rmtree(home_dir)
@@ -0,0 +1,131 @@
+import optparse
+import os
+import shutil
+import tempfile
+
+from ve.fs import FileSystemService
+from ve.template import TemplateStore, replace_prefix_in_file
+
+
+def make_options(**kw):
+    defaults = {'system_site_packages': False, 'use_distribute': False,
+                'unzip_setuptools': False, 'prompt': None, 'search_dirs': [],
+                'layers': [], 'compile': False, 'requirements': []}
+    defaults.update(kw)
+    return optparse.Values(defaults)
+
+
+def write(filename, content):
+    f = open(filename, 'w')
+    try:
+        f.write(content)
+    finally:
+        f.close()
+
+
+def read(filename):
+    f = open(filename)
+    try:
+        return f.read()
+    finally:
+        f.close()
+
+
+def test_template_key():
+    """Should give the same key for the same options and requirements only"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        store = TemplateStore(FileSystemService(), tmp_dir)
+        key = store.key(make_options())
+        assert key == store.key(make_options())
+        assert key != store.key(make_options(compile=True))
+        assert key != store.key(make_options(prompt='(env)'))
+        requirements = os.path.join(tmp_dir, 'requirements.txt')
+        write(requirements, 'one\n')
+        with_requirements = store.key(make_options(requirements=[requirements]))
+        assert with_requirements != key
+        write(requirements, 'two\n')
+        assert store.key(make_options(requirements=[requirements])) != with_requirements
+        archive = os.path.join(tmp_dir, 'pip-1.1.tar.gz')
+        write(archive, 'one')
+        with_archive = store.key(make_options(), [archive])
+        assert with_archive != key
+        write(archive, 'two')
+        assert store.key(make_options(), [archive]) != with_archive
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_replace_prefix_in_file():
+    """Should only rewrite the prefix where a whole path starts with it"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tmp_dir, 'activate')
+        write(filename, 'VIRTUAL_ENV="/envs/env"\n'
+              'PATH=/envs/env/bin:/envs/env2/bin:/envs/env-old\n'
+              '/envs/env\n')
+        assert replace_prefix_in_file(filename, '/envs/env', '/other/place')
+        assert read(filename) == ('VIRTUAL_ENV="/other/place"\n'
+                                  'PATH=/other/place/bin:/envs/env2/bin:/envs/env-old\n'
+                                  '/other/place\n')
+        assert not replace_prefix_in_file(filename, '/envs/env', '/other/place')
+
+        binary = os.path.join(tmp_dir, 'python')
+        f = open(binary, 'wb')
+        f.write('\0/envs/env/lib'.encode('ascii'))
+        f.close()
+        assert not replace_prefix_in_file(binary, '/envs/env', '/other/place')
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+def test_template_save_clone():
+    """Should clone a saved environment with its references relocated"""
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        home_dir = os.path.join(tmp_dir, 'env')
+        bin_dir = os.path.join(home_dir, 'bin')
+        site_packages = os.path.join(home_dir, 'lib', 'site-packages')
+        os.makedirs(bin_dir)
+        os.makedirs(site_packages)
+        os.mkdir(os.path.join(home_dir, 'src'))
+        write(os.path.join(bin_dir, 'script'),
+              '#!%s/bin/python\n# not %s2/bin/python\n' % (home_dir, home_dir))
+        write(os.path.join(site_packages, 'develop.pth'),
+              os.path.join(home_dir, 'src') + '\n')
+        write(os.path.join(site_packages, 'module.py'), 'PATH = %r\n' % home_dir)
+        write(os.path.join(site_packages, 'path-cache.txt'), home_dir + '\n')
+        if hasattr(os, 'symlink'):
+            os.symlink(os.path.join(home_dir, 'src'),
+                       os.path.join(home_dir, 'lib', 'src'))
+            os.symlink('/usr/lib', os.path.join(home_dir, 'lib', 'system'))
+
+        store = TemplateStore(FileSystemService(), os.path.join(tmp_dir, 'store'))
+        key = store.key(make_options())
+        assert not store.has(key)
+        store.save(key, home_dir)
+        assert store.has(key)
+        # saving again keeps the first copy
+        store.save(key, home_dir)
+
+        clone_dir = os.path.join(tmp_dir, 'clone')
+        store.clone(key, clone_dir)
+        assert read(os.path.join(clone_dir, 'bin', 'script')) == (
+            '#!%s/bin/python\n# not %s2/bin/python\n' % (clone_dir, home_dir))
+        assert read(os.path.join(clone_dir, 'lib', 'site-packages', 'develop.pth')) == (
+            os.path.join(clone_dir, 'src') + '\n')
+        # only scripts and path files are relocated
+        assert read(os.path.join(clone_dir, 'lib', 'site-packages', 'module.py')) == (
+            'PATH = %r\n' % home_dir)
+        # the caches of site.py are written again by the new environment
+        assert not os.path.exists(
+            os.path.join(clone_dir, 'lib', 'site-packages', 'path-cache.txt'))
+        if hasattr(os, 'symlink'):
+            assert os.readlink(os.path.join(clone_dir, 'lib', 'src')) == (
+                os.path.join(clone_dir, 'src'))
+            assert os.readlink(os.path.join(clone_dir, 'lib', 'system')) == '/usr/lib'
+        # the environment the template was saved from is untouched
+        assert read(os.path.join(home_dir, 'bin', 'script')).startswith(
+            '#!%s/bin/python\n' % home_dir)
+    finally:
+        shutil.rmtree(tmp_dir)
@@ -0,0 +1,17 @@
+from ve.timing import Timings
+
+
+def test_timings_attribute_counts_to_phases():
+    """Should report each phase with the operations counted during it"""
+    timings = Timings()
+    timings.start('copy')
+    timings.count('copyfile')
+    timings.count('copyfile')
+    timings.stop()
+    timings.timed('check', timings.count, 'subprocess')
+    report = timings.report()
+    assert [p['phase'] for p in report['phases']] == ['copy', 'check']
+    assert report['phases'][0]['fs_ops'] == {'copyfile': 2}
+    assert report['phases'][1]['subprocesses'] == 1
+    assert report['total']['fs_op_count'] == 2
+    assert report['total']['subprocesses'] == 1
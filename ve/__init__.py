@@ -1,26 +1,10 @@
-import base64
 import sys
 import os
-import optparse
-import re
-import shutil
-import logging
-import tempfile
-import zlib
-import errno
 
-from distutils.util import strtobool
+# Only what every code path needs is imported here; the modules that
+# create environments import the rest themselves, so that commands like
+# --version or --relocatable start quickly.
 
-try:
-    import subprocess
-except ImportError:
-    if sys.version_info <= (2, 3):
-        print('ERROR: %s' % sys.exc_info()[1])
-        print('ERROR: this script requires Python 2.4 or greater; or at least the subprocess module.')
-        print('If you copy subprocess.py from a newer version of Python this script will probably work')
-        sys.exit(101)
-    else:
-        raise
 try:
     set
 except NameError:
@@ -30,16 +14,12 @@ try:
 except NameError:
     basestring = str
 
-try:
-    import ConfigParser
-except ImportError:
-    import configparser as ConfigParser
-
-import distutils.sysconfig
-import distutils
-
 from ._autogen import *
 
+# If you change the version here, change it in setup.py
+# and docs/conf.py as well.
+virtualenv_version = "1.7.1.2.post1"
+
 py_version = 'python%s.%s' % (sys.version_info[0], sys.version_info[1])
 
 is_jython = sys.platform.startswith('java')
@@ -64,184 +44,234 @@ else:
     expected_exe = 'python'
 
 
-REQUIRED_MODULES = ['os', 'posix', 'posixpath', 'nt', 'ntpath', 'genericpath',
-                    'fnmatch', 'locale', 'encodings', 'codecs',
-                    'stat', 'UserDict', 'readline', 'copy_reg', 'types',
-                    're', 'sre', 'sre_parse', 'sre_constants', 'sre_compile',
-                    'zlib']
-
 REQUIRED_FILES = ['lib-dynload', 'config']
 
 majver, minver = sys.version_info[:2]
-if majver == 2:
-    if minver >= 6:
-        REQUIRED_MODULES.extend(['warnings', 'linecache', '_abcoll', 'abc'])
-    if minver >= 7:
-        REQUIRED_MODULES.extend(['_weakrefset'])
-    if minver <= 3:
-        REQUIRED_MODULES.extend(['sets', '__future__'])
-elif majver == 3:
-    # Some extra modules are needed for Python 3, but different ones
-    # for different versions.
-    REQUIRED_MODULES.extend(['_abcoll', 'warnings', 'linecache', 'abc', 'io',
-                             '_weakrefset', 'copyreg', 'tempfile', 'random',
-                             '__future__', 'collections', 'keyword', 'tarfile',
-                             'shutil', 'struct', 'copy'])
-    if minver >= 2:
-        REQUIRED_FILES[-1] = 'config-%s' % majver
-    if minver == 3:
-        # The whole list of 3.3 modules is reproduced below - the current
-        # uncommented ones are required for 3.3 as of now, but more may be
-        # added as 3.3 development continues.
-        REQUIRED_MODULES.extend([
-            #"aifc",
-            #"antigravity",
-            #"argparse",
-            #"ast",
-            #"asynchat",
-            #"asyncore",
-            "base64",
-            #"bdb",
-            #"binhex",
-            "bisect",
-            #"calendar",
-            #"cgi",
-            #"cgitb",
-            #"chunk",
-            #"cmd",
-            #"codeop",
-            #"code",
-            #"colorsys",
-            #"_compat_pickle",
-            #"compileall",
-            #"concurrent",
-            #"configparser",
-            #"contextlib",
-            #"cProfile",
-            #"crypt",
-            #"csv",
-            #"ctypes",
-            #"curses",
-            #"datetime",
-            #"dbm",
-            #"decimal",
-            #"difflib",
-            #"dis",
-            #"doctest",
-            #"dummy_threading",
-            "_dummy_thread",
-            #"email",
-            #"filecmp",
-            #"fileinput",
-            #"formatter",
-            #"fractions",
-            #"ftplib",
-            #"functools",
-            #"getopt",
-            #"getpass",
-            #"gettext",
-            #"glob",
-            #"gzip",
-            "hashlib",
-            "heapq",
-            "hmac",
-            #"html",
-            #"http",
-            #"idlelib",
-            #"imaplib",
-            #"imghdr",
-            #"importlib",
-            #"inspect",
-            #"json",
-            #"lib2to3",
-            #"logging",
-            #"macpath",
-            #"macurl2path",
-            #"mailbox",
-            #"mailcap",
-            #"_markupbase",
-            #"mimetypes",
-            #"modulefinder",
-            #"multiprocessing",
-            #"netrc",
-            #"nntplib",
-            #"nturl2path",
-            #"numbers",
-            #"opcode",
-            #"optparse",
-            #"os2emxpath",
-            #"pdb",
-            #"pickle",
-            #"pickletools",
-            #"pipes",
-            #"pkgutil",
-            #"platform",
-            #"plat-linux2",
-            #"plistlib",
-            #"poplib",
-            #"pprint",
-            #"profile",
-            #"pstats",
-            #"pty",
-            #"pyclbr",
-            #"py_compile",
-            #"pydoc_data",
-            #"pydoc",
-            #"_pyio",
-            #"queue",
-            #"quopri",
-            "reprlib",
-            "rlcompleter",
-            #"runpy",
-            #"sched",
-            #"shelve",
-            #"shlex",
-            #"smtpd",
-            #"smtplib",
-            #"sndhdr",
-            #"socket",
-            #"socketserver",
-            #"sqlite3",
-            #"ssl",
-            #"stringprep",
-            #"string",
-            #"_strptime",
-            #"subprocess",
-            #"sunau",
-            #"symbol",
-            #"symtable",
-            #"sysconfig",
-            #"tabnanny",
-            #"telnetlib",
-            #"test",
-            #"textwrap",
-            #"this",
-            #"_threading_local",
-            #"threading",
-            #"timeit",
-            #"tkinter",
-            #"tokenize",
-            #"token",
-            #"traceback",
-            #"trace",
-            #"tty",
-            #"turtledemo",
-            #"turtle",
-            #"unittest",
-            #"urllib",
-            #"uuid",
-            #"uu",
-            #"wave",
-            "weakref",
-            #"webbrowser",
-            #"wsgiref",
-            #"xdrlib",
-            #"xml",
-            #"xmlrpc",
-            #"zipfile",
-        ])
+if majver == 3 and minver >= 2:
+    REQUIRED_FILES[-1] = 'config-%s' % majver
 
-if is_pypy:
-    # these are needed to correctly display the exceptions that may happen
-    # during the bootstrap
-    REQUIRED_MODULES.extend(['traceback', 'linecache'])
+def _filling(name):
+    method = getattr(list, name)
+    def filled(self, *args):
+        self._fill()
+        return method(self, *args)
+    filled.__name__ = name
+    return filled
+
+
+class _LazyList(list):
+    """A list that calls ``load()`` for its items the first time it is used"""
+
+    def __init__(self, load):
+        list.__init__(self)
+        self._load = load
+        self._loaded = False
+
+    def _fill(self):
+        if not self._loaded:
+            self._loaded = True
+            list.extend(self, self._load())
+
+for _name in ['__add__', '__contains__', '__delitem__', '__delslice__',
+              '__eq__', '__ge__', '__getitem__', '__getslice__', '__gt__',
+              '__iadd__', '__imul__', '__iter__', '__le__', '__len__',
+              '__lt__', '__mul__', '__ne__', '__repr__', '__reversed__',
+              '__rmul__', '__setitem__', '__setslice__', 'append', 'clear',
+              'copy', 'count', 'extend', 'index', 'insert', 'pop', 'remove',
+              'reverse', 'sort']:
+    if hasattr(list, _name):
+        setattr(_LazyList, _name, _filling(_name))
+del _name
+
+
+def required_modules():
+    """
+    Returns the names of the modules an environment needs before its
+    site.py runs, for the running interpreter.  The list is built the
+    first time it is asked for; it is the ``REQUIRED_MODULES`` list.
+    """
+    REQUIRED_MODULES._fill()
+    return REQUIRED_MODULES
+
+
+def _list_required_modules():
+    modules = ['os', 'posix', 'posixpath', 'nt', 'ntpath', 'genericpath',
+               'fnmatch', 'locale', 'encodings', 'codecs',
+               'stat', 'UserDict', 'readline', 'copy_reg', 'types',
+               're', 'sre', 'sre_parse', 'sre_constants', 'sre_compile',
+               'zlib']
+    if majver == 2:
+        if minver >= 6:
+            modules.extend(['warnings', 'linecache', '_abcoll', 'abc'])
+        if minver >= 7:
+            modules.extend(['_weakrefset'])
+        if minver <= 3:
+            modules.extend(['sets', '__future__'])
+    elif majver == 3:
+        # Some extra modules are needed for Python 3, but different ones
+        # for different versions.
+        modules.extend(['_abcoll', 'warnings', 'linecache', 'abc', 'io',
+                        '_weakrefset', 'copyreg', 'tempfile', 'random',
+                        '__future__', 'collections', 'keyword', 'tarfile',
+                        'shutil', 'struct', 'copy'])
+        if minver == 3:
+            # The whole list of 3.3 modules is reproduced below - the current
+            # uncommented ones are required for 3.3 as of now, but more may be
+            # added as 3.3 development continues.
+            modules.extend([
+                #"aifc",
+                #"antigravity",
+                #"argparse",
+                #"ast",
+                #"asynchat",
+                #"asyncore",
+                "base64",
+                #"bdb",
+                #"binhex",
+                "bisect",
+                #"calendar",
+                #"cgi",
+                #"cgitb",
+                #"chunk",
+                #"cmd",
+                #"codeop",
+                #"code",
+                #"colorsys",
+                #"_compat_pickle",
+                #"compileall",
+                #"concurrent",
+                #"configparser",
+                #"contextlib",
+                #"cProfile",
+                #"crypt",
+                #"csv",
+                #"ctypes",
+                #"curses",
+                #"datetime",
+                #"dbm",
+                #"decimal",
+                #"difflib",
+                #"dis",
+                #"doctest",
+                #"dummy_threading",
+                "_dummy_thread",
+                #"email",
+                #"filecmp",
+                #"fileinput",
+                #"formatter",
+                #"fractions",
+                #"ftplib",
+                #"functools",
+                #"getopt",
+                #"getpass",
+                #"gettext",
+                #"glob",
+                #"gzip",
+                "hashlib",
+                "heapq",
+                "hmac",
+                #"html",
+                #"http",
+                #"idlelib",
+                #"imaplib",
+                #"imghdr",
+                #"importlib",
+                #"inspect",
+                #"json",
+                #"lib2to3",
+                #"logging",
+                #"macpath",
+                #"macurl2path",
+                #"mailbox",
+                #"mailcap",
+                #"_markupbase",
+                #"mimetypes",
+                #"modulefinder",
+                #"multiprocessing",
+                #"netrc",
+                #"nntplib",
+                #"nturl2path",
+                #"numbers",
+                #"opcode",
+                #"optparse",
+                #"os2emxpath",
+                #"pdb",
+                #"pickle",
+                #"pickletools",
+                #"pipes",
+                #"pkgutil",
+                #"platform",
+                #"plat-linux2",
+                #"plistlib",
+                #"poplib",
+                #"pprint",
+                #"profile",
+                #"pstats",
+                #"pty",
+                #"pyclbr",
+                #"py_compile",
+                #"pydoc_data",
+                #"pydoc",
+                #"_pyio",
+                #"queue",
+                #"quopri",
+                "reprlib",
+                "rlcompleter",
+                #"runpy",
+                #"sched",
+                #"shelve",
+                #"shlex",
+                #"smtpd",
+                #"smtplib",
+                #"sndhdr",
+                #"socket",
+                #"socketserver",
+                #"sqlite3",
+                #"ssl",
+                #"stringprep",
+                #"string",
+                #"_strptime",
+                #"subprocess",
+                #"sunau",
+                #"symbol",
+                #"symtable",
+                #"sysconfig",
+                #"tabnanny",
+                #"telnetlib",
+                #"test",
+                #"textwrap",
+                #"this",
+                #"_threading_local",
+                #"threading",
+                #"timeit",
+                #"tkinter",
+                #"tokenize",
+                #"token",
+                #"traceback",
+                #"trace",
+                #"tty",
+                #"turtledemo",
+                #"turtle",
+                #"unittest",
+                #"urllib",
+                #"uuid",
+                #"uu",
+                #"wave",
+                "weakref",
+                #"webbrowser",
+                #"wsgiref",
+                #"xdrlib",
+                #"xml",
+                #"xmlrpc",
+                #"zipfile",
+            ])
+
+    if is_pypy:
+        # these are needed to correctly display the exceptions that may happen
+        # during the bootstrap
+        modules.extend(['traceback', 'linecache'])
+    return modules
+
+# Kept for the code that used it before required_modules(); its items
+# are only worked out when it is first used.
+REQUIRED_MODULES = _LazyList(_list_required_modules)
@@ -0,0 +1,200 @@
+import os
+import sys
+
+
+join = os.path.join
+
+# site-packages dir -> (signature, bin dir, entries, imports) of resolve()
+_resolved = {}
+
+# Attributes the .pth files of setuptools set on sys
+_SYS_ATTRIBUTES = ['__plen', '__egginsert']
+
+
+def env_dirs(home_dir):
+    """
+    Returns the bin and site-packages directories of the environment in
+    ``home_dir``, as ``activate_this.py`` finds them.
+    """
+    home_dir = os.path.abspath(home_dir)
+    if sys.platform == 'win32':
+        return (join(home_dir, 'Scripts'),
+                join(home_dir, 'Lib', 'site-packages'))
+    return (join(home_dir, 'bin'),
+            join(home_dir, 'lib', 'python%s' % sys.version[:3], 'site-packages'))
+
+
+def _signature(site_packages):
+    """The mtimes of ``site_packages`` and of its .pth files"""
+    try:
+        names = os.listdir(site_packages)
+        signature = [os.stat(site_packages).st_mtime]
+        for name in sorted(names):
+            if name.endswith('.pth'):
+                signature.append((name, os.stat(join(site_packages, name)).st_mtime))
+    except OSError:
+        return None
+    return tuple(signature)
+
+
+def _read_pth_files(site_packages):
+    """
+    Returns the directories the .pth files in ``site_packages`` add and
+    their import lines, compiled, in the order ``site.addsitedir()``
+    handles them.
+    """
+    entries = [site_packages]
+    imports = []
+    seen = set([os.path.normcase(site_packages)])
+    try:
+        names = os.listdir(site_packages)
+    except OSError:
+        return entries, imports
+    for name in sorted(names):
+        if not name.endswith('.pth'):
+            continue
+        filename = join(site_packages, name)
+        try:
+            f = open(filename)
+            try:
+                lines = f.readlines()
+            finally:
+                f.close()
+        except IOError:
+            continue
+        for line in lines:
+            if line.startswith('#'):
+                continue
+            if line.startswith('import ') or line.startswith('import\t'):
+                imports.append(compile(line, filename, 'exec'))
+                continue
+            line = line.rstrip()
+            if not line:
+                continue
+            entry = os.path.abspath(join(site_packages, line))
+            if os.path.normcase(entry) not in seen and os.path.exists(entry):
+                seen.add(os.path.normcase(entry))
+                entries.append(entry)
+    return entries, imports
+
+
+def resolve(home_dir):
+    """
+    Returns the bin directory of the environment in ``home_dir``, the
+    ``sys.path`` entries activating it adds, in order (its site-packages
+    and the directories its .pth files list), and the .pth files' import
+    lines, compiled.  Nothing is imported or executed here; the result
+    is reused while site-packages and its .pth files are unchanged.
+    """
+    bin_dir, site_packages = env_dirs(home_dir)
+    signature = _signature(site_packages)
+    cached = _resolved.get(site_packages)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return cached[1:]
+    entries, imports = _read_pth_files(site_packages)
+    if signature is not None:
+        _resolved[site_packages] = (signature, bin_dir, entries, imports)
+    return bin_dir, entries, imports
+
+
+def _restore_attributes(saved):
+    for name, value in saved:
+        if value is None:
+            if hasattr(sys, name):
+                delattr(sys, name)
+        else:
+            setattr(sys, name, value)
+
+
+class Activation(object):
+    """
+    Activates the environment in ``home_dir`` in this process like
+    ``activate_this.py`` does: its ``sys.path`` entries go first, its bin
+    directory first on ``PATH``, ``sys.prefix`` becomes the environment
+    and ``sys.real_prefix`` the previous prefix.
+
+    Unlike ``activate_this.py`` it can be undone: deactivate() (or
+    leaving the ``with`` block) restores ``sys.path``, the prefixes and
+    ``PATH`` exactly, and with ``unload`` also drops the modules imported
+    from the environment meanwhile, so the next activation of another
+    environment imports its own.  Activations nest but must be undone in
+    reverse order.  Both directions take time linear in the length of
+    ``sys.path``; the environment's entries are cached by resolve(), and
+    the import lines of its .pth files run on every activation, after
+    its entries are in place.
+    """
+
+    def __init__(self, home_dir, unload=True):
+        self.home_dir = os.path.abspath(home_dir)
+        self.unload = unload
+        self.active = False
+        self._saved = None
+
+    def activate(self):
+        if self.active:
+            raise RuntimeError('%s is already active' % self.home_dir)
+        modules = None
+        if self.unload:
+            modules = set(sys.modules)
+        bin_dir, entries, imports = resolve(self.home_dir)
+        attributes = [(name, getattr(sys, name, None))
+                      for name in _SYS_ATTRIBUTES]
+        self._saved = (list(sys.path), sys.prefix,
+                       getattr(sys, 'real_prefix', None),
+                       os.environ.get('PATH'), modules, entries, attributes)
+        added = set(entries)
+        sys.path[:] = entries + [entry for entry in sys.path
+                                 if entry not in added]
+        os.environ['PATH'] = bin_dir + os.pathsep + os.environ.get('PATH', '')
+        sys.real_prefix = sys.prefix
+        sys.prefix = self.home_dir
+        self.active = True
+        for code in imports:
+            exec(code, {})
+        return self
+
+    def deactivate(self):
+        if not self.active:
+            raise RuntimeError('%s is not active' % self.home_dir)
+        path, prefix, real_prefix, os_path, modules, entries, attributes = self._saved
+        if sys.prefix != self.home_dir:
+            raise RuntimeError('%s must be deactivated before %s'
+                               % (sys.prefix, self.home_dir))
+        sys.path[:] = path
+        _restore_attributes(attributes)
+        sys.prefix = prefix
+        if real_prefix is None:
+            del sys.real_prefix
+        else:
+            sys.real_prefix = real_prefix
+        if os_path is None:
+            del os.environ['PATH']
+        else:
+            os.environ['PATH'] = os_path
+        if modules is not None:
+            self._unload(modules, entries)
+        self._saved = None
+        self.active = False
+
+    def _unload(self, previous, entries):
+        """
+        Drops the modules imported since activate() whose file or package
+        directory is in the environment
+        """
+        roots = tuple([self.home_dir + os.sep] +
+                      [entry.rstrip(os.sep) + os.sep for entry in entries])
+        for name in list(sys.modules):
+            if name in previous:
+                continue
+            module = sys.modules[name]
+            location = getattr(module, '__file__', None)
+            if location is None:
+                location = (list(getattr(module, '__path__', None) or []) or [None])[0]
+            if location is not None and os.path.abspath(location).startswith(roots):
+                del sys.modules[name]
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, *exc_info):
+        self.deactivate()
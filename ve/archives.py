@@ -0,0 +1,228 @@
+import os
+import re
+import sys
+try:
+    import json
+except ImportError:
+    json = None
+
+try:
+    from hashlib import sha1
+except ImportError:
+    from sha import new as sha1
+
+from ve import *
+from ve.log import logger
+from ve.manifest import file_hash
+
+
+join = os.path.join
+
+_archive_re = re.compile(
+    r'^(?P<project>.+?)-(?P<version>\d[^-]*?)(-py(?P<pyversion>\d+\.\d+))?'
+    r'(?P<ext>\.tar\.gz|\.tgz|\.tar\.bz2|\.tbz|\.zip|\.egg)$', re.I)
+
+
+def parse_archive_name(filename):
+    """
+    Returns ``(project, version, pyversion)`` for an archive name like
+    ``pip-1.1.tar.gz`` or ``setuptools-0.6c11-py2.7.egg``, or None if
+    the name does not look like an archive.  The project is lowercased.
+    """
+    match = _archive_re.match(filename)
+    if match is None:
+        return None
+    return (match.group('project').lower(), match.group('version'),
+            match.group('pyversion'))
+
+
+# Tags of post-releases, which are newer than the release they follow
+POST_RELEASE_TAGS = ('post', 'rev', 'r')
+
+
+def version_key(version):
+    """
+    Returns a sort key for ``version``: numeric parts compare as numbers
+    (so 1.10 is newer than 1.9), a release is newer than its alpha, beta
+    and rc pre-releases and older than its post-releases (``1.0.post1``,
+    ``1.0-r1``).
+    """
+    key = []
+    for part in re.findall(r'\d+|[a-z]+', version.lower()):
+        if part.isdigit():
+            key.append([2, int(part)])
+        elif part in POST_RELEASE_TAGS:
+            key.append([1, 'post'])
+        else:
+            key.append([0, part])
+    key.append([1, ''])
+    return key
+
+
+class ArchiveIndex(object):
+    """
+    The support archives of one search dir: name, project, version, size,
+    mtime and (once asked for) sha1 of each.
+
+    The index is saved under ``default_storage_dir/cache``, keyed on the
+    directory's path, so nothing is written into the search dirs (which
+    include the current directory and the installed package).  It is
+    rebuilt when the directory's mtime changes, reusing the entries (and
+    hashes) of the archives that kept their size and mtime.
+    """
+
+    def __init__(self, dir, storage_dir=None):
+        self.dir = os.path.abspath(dir)
+        self._storage_dir = join(storage_dir or default_storage_dir, 'cache')
+        self.dir_mtime = None
+        self.entries = {}
+
+    def filename(self):
+        key = sha1(self.dir.encode('utf-8')).hexdigest()
+        return join(self._storage_dir, 'archive-index-%s.json' % key)
+
+    def load(self):
+        """Reads the saved index; returns False if there is none"""
+        if json is None:
+            return False
+        filename = self.filename()
+        try:
+            f = open(filename)
+        except IOError:
+            return False
+        try:
+            try:
+                data = json.load(f)
+            except ValueError:
+                logger.debug('Ignoring unreadable archive index %s', filename)
+                return False
+        finally:
+            f.close()
+        self.dir_mtime = data['dir_mtime']
+        self.entries = data['entries']
+        for entry in self.entries.values():
+            # saved by a virtualenv that may have ordered versions differently
+            entry['version_key'] = version_key(entry['version'])
+        return True
+
+    def update(self):
+        """
+        Brings the index up to date with the directory; returns True if
+        it changed.
+        """
+        try:
+            dir_mtime = os.stat(self.dir).st_mtime
+        except OSError:
+            self.dir_mtime = None
+            self.entries = {}
+            return False
+        if dir_mtime == self.dir_mtime:
+            return False
+        logger.debug('Indexing support archives in %s', self.dir)
+        old_entries = self.entries
+        self.entries = {}
+        for name in os.listdir(self.dir):
+            parsed = parse_archive_name(name)
+            if parsed is None:
+                continue
+            path = join(self.dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            old = old_entries.get(name)
+            if old and old['size'] == st.st_size and old['mtime'] == st.st_mtime:
+                self.entries[name] = old
+                continue
+            project, version, pyversion = parsed
+            self.entries[name] = {
+                'project': project, 'version': version,
+                'version_key': version_key(version), 'pyversion': pyversion,
+                'size': st.st_size, 'mtime': st.st_mtime, 'sha1': None}
+        self.dir_mtime = dir_mtime
+        return True
+
+    def save(self):
+        """Writes the index into the user's cache"""
+        if json is None:
+            return
+        filename = self.filename()
+        try:
+            if not os.path.isdir(self._storage_dir):
+                os.makedirs(self._storage_dir)
+            f = open(filename, 'w')
+            try:
+                json.dump({'dir_mtime': self.dir_mtime, 'entries': self.entries},
+                          f, indent=1, sort_keys=True)
+            finally:
+                f.close()
+        except (IOError, OSError):
+            logger.info('Cannot write archive index %s: %s', filename,
+                        sys.exc_info()[1])
+
+    def path(self, name):
+        return join(self.dir, name)
+
+
+_indexes = {}
+
+
+def archive_index(dir):
+    """Returns the up to date ArchiveIndex of ``dir``"""
+    dir = os.path.abspath(dir)
+    index = _indexes.get(dir)
+    if index is None:
+        index = _indexes[dir] = ArchiveIndex(dir)
+        index.load()
+    if index.update():
+        index.save()
+    return index
+
+
+def find_archive(filename, search_dirs):
+    """
+    Returns the path of the archive named ``filename`` in the last of
+    ``search_dirs`` that has it, or None.
+    """
+    for dir in reversed(search_dirs):
+        if filename in archive_index(dir).entries:
+            return join(os.path.abspath(dir), filename)
+    return None
+
+
+def best_archive(project, search_dirs, pyversion=None):
+    """
+    Returns the path of the newest archive of ``project`` in
+    ``search_dirs``, or None.  Eggs for another Python version are
+    skipped; on equal versions the later search dir wins.
+    """
+    project = project.lower()
+    best = best_key = None
+    for i, dir in enumerate(search_dirs):
+        index = archive_index(dir)
+        for name, entry in index.entries.items():
+            if entry['project'] != project:
+                continue
+            if entry['pyversion'] and pyversion and entry['pyversion'] != pyversion:
+                continue
+            key = (entry['version_key'], i, name)
+            if best_key is None or key > best_key:
+                best, best_key = index.path(name), key
+    return best
+
+
+def archive_hash(path):
+    """
+    Returns the sha1 of an archive; it is computed once and kept in the
+    index while the archive keeps its size and mtime.
+    """
+    index = archive_index(os.path.dirname(path))
+    entry = index.entries.get(os.path.basename(path))
+    if entry is None:
+        return file_hash(path)
+    st = os.stat(path)
+    if (entry['sha1'] is None or entry['size'] != st.st_size
+        or entry['mtime'] != st.st_mtime):
+        entry.update(size=st.st_size, mtime=st.st_mtime, sha1=file_hash(path))
+        index.save()
+    return entry['sha1']
@@ -0,0 +1,114 @@
+import os
+import sys
+import time
+
+from ve import *
+from ve.log import Logger, logger
+from ve.timing import timings
+
+
+def distribution_class():
+    """Returns the BasePythonDistribution subclass for this platform"""
+    if sys.platform == 'win32':
+        from ve.win32 import Win32Distribution
+        return Win32Distribution
+    elif is_pypy:
+        from ve.pypy import PyPyDistribution
+        return PyPyDistribution
+    elif is_jython:
+        from ve.jython import JythonDistribution
+        return JythonDistribution
+    elif sys.platform == 'darwin':
+        from ve.macos import DarwinDistribution
+        return DarwinDistribution
+    from ve.unix import UnixDistribution
+    return UnixDistribution
+
+
+class BatchResult(object):
+    """The outcome of creating one environment of a batch"""
+
+    def __init__(self, home_dir, success, seconds, error=None, messages=None,
+                 timings=None):
+        self.home_dir = home_dir
+        self.success = success
+        self.seconds = seconds
+        self.error = error
+        self.messages = messages or []
+        # The Timings report of the creation
+        self.timings = timings or {}
+
+    def __repr__(self):
+        return '<BatchResult %s %s in %.2fs>' % (
+            self.home_dir, self.success and 'ok' or 'failed', self.seconds)
+
+
+def create_environment(args):
+    """
+    Creates a single environment of a batch; runs in a worker process.
+    Only warnings and errors are kept, and returned with the result
+    instead of being printed.
+    """
+    env_klass, home_dir, options = args
+    from ve import fs
+    messages = []
+    logger.init([(Logger.WARN, messages.append)])
+    timings.reset()
+    start = time.time()
+    try:
+        env = env_klass(fs.FileSystemService(options.copy_strategy),
+                        home_dir, options)
+        env.create()
+    except (Exception, SystemExit):
+        e = sys.exc_info()[1]
+        return BatchResult(home_dir, False, time.time() - start,
+                           error='%s: %s' % (e.__class__.__name__, e),
+                           messages=messages, timings=timings.report())
+    return BatchResult(home_dir, True, time.time() - start,
+                       messages=messages, timings=timings.report())
+
+
+def create_environments(home_dirs, options, processes=None, env_klass=None):
+    """
+    Creates an environment in each of ``home_dirs`` with the same
+    ``options``, using a pool of ``processes`` worker processes (one per
+    CPU by default).  ``env_klass`` is the distribution class to create
+    them with, distribution_class() by default.
+
+    The facts about the interpreter that don't depend on the destination
+    (bootstrap module locations, stdlib listing, build config) are
+    computed once before the pool is started, so forked workers inherit
+    them.  Returns a BatchResult for every directory, in order.
+    """
+    import multiprocessing
+    from ve import fs
+    if env_klass is None:
+        env_klass = distribution_class()
+    if home_dirs:
+        env = env_klass(fs.FileSystemService(), home_dirs[0], options)
+        env.path_locations()
+        env.warm_up()
+    jobs = [(env_klass, home_dir, options) for home_dir in home_dirs]
+    context = multiprocessing
+    if hasattr(multiprocessing, 'get_all_start_methods'):
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+    logger.notify('Creating %s environments with %s processes', len(jobs),
+                  processes or multiprocessing.cpu_count())
+    pool = context.Pool(processes)
+    try:
+        results = pool.map(create_environment, jobs, 1)
+    finally:
+        pool.close()
+        pool.join()
+    for result in results:
+        if result.success:
+            logger.notify('%s: created in %.2fs', result.home_dir, result.seconds)
+        else:
+            logger.error('%s: failed after %.2fs: %s', result.home_dir,
+                         result.seconds, result.error)
+        logger.indent += 2
+        for message in result.messages:
+            logger.info(message)
+        logger.indent -= 2
+    return results
@@ -0,0 +1,457 @@
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+try:
+    from hashlib import sha1
+except ImportError:
+    from sha import new as sha1
+
+from ve import *
+from ve.log import logger, Logger
+from ve.archives import archive_hash, best_archive
+from ve.manifest import file_hash
+from ve.probe import interpreter_probe
+from ve.template import replace_prefix_in_file
+from ve.utils import call_subprocess, file_search_dirs, join, _find_file
+
+
+# Printed by the runner before each of its steps, so the output filter
+# knows which installer the lines that follow come from.
+STEP_MARKER = '--- virtualenv bootstrap step: '
+
+# The runner installs the packaging toolchain in a single interpreter
+# process: the setuptools/distribute bootstrap script runs as __main__,
+# and pip is then installed by calling easy_install in the same process,
+# reusing the setuptools modules already imported.  ``STEPS`` is filled
+# in by install_packaging().
+RUNNER_SCRIPT = '''
+import os, sys
+
+STEPS = %(steps)r
+MARKER = %(marker)r
+
+
+def run_script(filename, argv):
+    sys.argv = [filename] + argv
+    f = open(filename)
+    try:
+        source = f.read()
+    finally:
+        f.close()
+    namespace = {'__name__': '__main__', '__file__': filename}
+    exec(compile(source, filename, 'exec'), namespace)
+
+
+def run_easy_install(argv, site_dir):
+    import site
+    # Pick up the .pth files written by the earlier steps
+    site.addsitedir(site_dir)
+    from setuptools.command.easy_install import main
+    sys.argv = ['easy_install']
+    main(argv)
+
+
+for step in STEPS:
+    sys.stdout.write(MARKER + step['name'] + '\\n')
+    sys.stdout.flush()
+    try:
+        if step['kind'] == 'script':
+            run_script(step['script'], step['argv'])
+        else:
+            run_easy_install(step['argv'], step['site_dir'])
+    except SystemExit:
+        code = sys.exc_info()[1].code
+        if code:
+            raise
+    sys.stdout.flush()
+'''
+
+
+def filter_ez_setup(line, project_name='setuptools'):
+    if not line.strip():
+        return Logger.DEBUG
+    if project_name == 'distribute':
+        for prefix in ('Extracting', 'Now working', 'Installing', 'Before',
+                       'Scanning', 'Setuptools', 'Egg', 'Already',
+                       'running', 'writing', 'reading', 'installing',
+                       'creating', 'copying', 'byte-compiling', 'removing',
+                       'Processing'):
+            if line.startswith(prefix):
+                return Logger.DEBUG
+        return Logger.DEBUG
+    for prefix in ['Reading ', 'Best match', 'Processing setuptools',
+                   'Copying setuptools', 'Adding setuptools',
+                   'Installing ', 'Installed ']:
+        if line.startswith(prefix):
+            return Logger.DEBUG
+    return Logger.INFO
+
+
+class StepFilter(object):
+    """
+    Output filter for the runner: switches to the filter of each step
+    when the runner announces it.
+    """
+
+    def __init__(self):
+        self.project_name = None
+
+    def __call__(self, line):
+        if line.startswith(STEP_MARKER):
+            self.project_name = line[len(STEP_MARKER):].strip()
+            return Logger.DEBUG
+        return filter_ez_setup(line, self.project_name or 'setuptools')
+
+
+def find_pip(search_dirs):
+    """Returns the newest pip distribution in ``search_dirs``, or None"""
+    return best_archive('pip', search_dirs, sys.version[:3])
+
+
+def packaging_archives(distribute=False, search_dirs=None):
+    """
+    Returns the local archives install_packaging() installs from, or
+    None if one of them would have to be downloaded.
+    """
+    if search_dirs is None:
+        search_dirs = file_search_dirs()
+    if distribute:
+        setup = _find_file('distribute-0.6.24.tar.gz', search_dirs)
+    else:
+        setup = _find_file('setuptools-0.6c11-py%s.egg' % sys.version[:3],
+                           search_dirs)
+    pip = find_pip(search_dirs)
+    if not os.path.exists(setup) or pip is None:
+        return None
+    return [setup, pip]
+
+
+class PackagingCache(object):
+    """
+    Keeps the files installed by install_packaging() under
+    ``default_storage_dir/packaging``, keyed on the interpreter ABI and
+    the content of the archives they were installed from.  Later
+    environments get a copy of those files instead of running the
+    bootstrap installers again; only the absolute prefix in the console
+    scripts (and any ``.pth`` file) is rewritten.
+
+    Byte-code is not kept, since it records the path of the environment
+    it was compiled in.
+    """
+
+    def __init__(self, fs, storage_dir=None):
+        self._fs = fs
+        self._dir = join(storage_dir or default_storage_dir, 'packaging')
+
+    def key(self, archives, unzip=False):
+        facts = interpreter_probe()
+        parts = ['%s.%s.%s' % tuple(facts['version']), facts['abiflags'],
+                 facts['platform'], str(struct.calcsize('P')),
+                 'unzip=%r' % bool(unzip)]
+        for archive in archives:
+            parts.append('%s %s' % (os.path.basename(archive),
+                                    archive_hash(archive)))
+        return sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return join(self._dir, key)
+
+    def has(self, key):
+        return os.path.exists(join(self.path(key), 'prefix.txt'))
+
+    def listing(self, site_dir, bin_dir):
+        """Returns the entries of ``site_dir`` and ``bin_dir`` with their mtimes"""
+        result = {}
+        for kind, dir in (('site-packages', site_dir), ('bin', bin_dir)):
+            if not os.path.isdir(dir):
+                continue
+            for name in os.listdir(dir):
+                result[(kind, name)] = os.lstat(join(dir, name)).st_mtime
+        return result
+
+    def save(self, key, home_dir, site_dir, bin_dir, before):
+        """
+        Stores the entries of ``site_dir`` and ``bin_dir`` that are new or
+        changed since the ``before`` listing.
+        """
+        if self.has(key):
+            return
+        home_dir = os.path.abspath(home_dir)
+        dirs = {'site-packages': site_dir, 'bin': bin_dir}
+        tmp_dir = '%s.tmp-%s' % (self.path(key), os.getpid())
+        logger.info('Saving installed packaging tools as %s', key)
+        self._fs.rmtree(tmp_dir)
+        for (kind, name), mtime in self.listing(site_dir, bin_dir).items():
+            if before.get((kind, name)) == mtime or name.endswith('.pyc'):
+                continue
+            self.copy(join(dirs[kind], name), join(tmp_dir, kind, name),
+                      clone=False)
+        self._fs.writefile(join(tmp_dir, 'prefix.txt'), home_dir)
+        try:
+            os.rename(tmp_dir, self.path(key))
+        except OSError:
+            # Another process stored the same tools first
+            self._fs.rmtree(tmp_dir)
+
+    def restore(self, key, home_dir, site_dir, bin_dir):
+        f = open(join(self.path(key), 'prefix.txt'))
+        try:
+            old_prefix = f.read().strip()
+        finally:
+            f.close()
+        new_prefix = os.path.abspath(home_dir)
+        logger.notify('Installing cached packaging tools %s', key)
+        for kind, dir in (('site-packages', site_dir), ('bin', bin_dir)):
+            src_dir = join(self.path(key), kind)
+            if not os.path.isdir(src_dir):
+                continue
+            for name in os.listdir(src_dir):
+                dest = join(dir, name)
+                existing = None
+                if name.endswith('.pth') and os.path.isfile(dest):
+                    # an existing environment may list eggs installed
+                    # since it was created; they must stay
+                    existing = _read_lines(dest)
+                if os.path.isdir(dest) and not os.path.islink(dest):
+                    self._fs.rmtree(dest)
+                elif os.path.lexists(dest):
+                    self._fs.remove(dest)
+                self.copy(join(src_dir, name), dest)
+                if kind == 'bin' or name.endswith('.pth'):
+                    replace_prefix_in_file(dest, old_prefix, new_prefix)
+                if existing:
+                    lines = merge_pth_lines(existing, _read_lines(dest))
+                    f = open(dest, 'w')
+                    try:
+                        f.write(''.join([line + '\n' for line in lines]))
+                    finally:
+                        f.close()
+
+    def copy(self, src, dest, clone=True):
+        """
+        Copies a file or tree without its byte-code.  With ``clone`` the
+        files may be reflinked, except the ones that are rewritten in
+        place later (scripts, ``.pth``).  They are never hard linked: pip
+        upgrades and uninstalls in the environment write to and delete
+        these files, which must not change the cached ones.
+        """
+        if os.path.isdir(src) and not os.path.islink(src):
+            self._fs.mkdir(dest)
+            for name in os.listdir(src):
+                if not (name.endswith('.pyc') or name.endswith('.pyo')
+                        or name == '__pycache__'):
+                    self.copy(join(src, name), join(dest, name), clone)
+        elif os.path.islink(src):
+            os.symlink(os.readlink(src), dest)
+        else:
+            parent = os.path.dirname(dest)
+            if not os.path.isdir(parent):
+                os.makedirs(parent)
+            if (not clone or os.path.basename(parent) == 'bin'
+                or dest.endswith('.pth')):
+                shutil.copy2(src, dest)
+            else:
+                self._fs.materialize(src, dest, hardlink=False)
+
+
+def _read_lines(filename):
+    f = open(filename)
+    try:
+        return f.read().splitlines()
+    finally:
+        f.close()
+
+
+def merge_pth_lines(lines, new_lines):
+    """
+    Returns the lines of a ``.pth`` file with the entries of
+    ``new_lines`` it lacks added.  The entries go before the ``import``
+    lines that end a setuptools ``easy-install.pth``, which move them to
+    the front of ``sys.path``.
+    """
+    result = list(lines)
+    end = len(result)
+    while end > 0 and result[end - 1].startswith('import'):
+        end -= 1
+    if end == 0:
+        # only import lines: there is no block of entries to extend
+        end = len(result)
+    for line in new_lines:
+        if line.strip() and line not in result:
+            if line.startswith('import'):
+                result.append(line)
+            else:
+                result.insert(end, line)
+                end += 1
+    return result
+
+
+def _never_download(project_name, wanted, search_dirs):
+    logger.fatal("Can't find any local distributions of %s to install "
+                 "and --never-download is set.  Either re-run virtualenv "
+                 "without the --never-download option, or place a %s "
+                 "distribution (%s) in one of these "
+                 "locations: %r" % (project_name, project_name,
+                                    wanted, search_dirs))
+    sys.exit(1)
+
+
+def install_packaging(py_executable, site_dir, distribute=False, unzip=False,
+                      search_dirs=None, never_download=False):
+    """
+    Installs setuptools (or distribute) and then pip with
+    ``py_executable``, in one run of the bootstrap runner.  ``site_dir``
+    is the environment's site-packages.
+    """
+    if search_dirs is None:
+        search_dirs = file_search_dirs()
+
+    env = {}
+    remove_from_env = []
+    cwd = None
+    argv = []
+    if unzip:
+        argv.append('--always-unzip')
+    if logger.stdout_level_matches(logger.DEBUG):
+        argv.append('-v')
+
+    if not distribute:
+        project_name = 'setuptools'
+        bootstrap_script = get_resource('EZ_SETUP_PY')
+        setup_fn = _find_file('setuptools-0.6c11-py%s.egg' % sys.version[:3],
+                              search_dirs)
+        if os.path.exists(setup_fn):
+            logger.info('Using existing %s egg: %s' % (project_name, setup_fn))
+            argv.append(setup_fn)
+            if os.environ.get('PYTHONPATH'):
+                env['PYTHONPATH'] = setup_fn + os.path.pathsep + os.environ['PYTHONPATH']
+            else:
+                env['PYTHONPATH'] = setup_fn
+        else:
+            if never_download:
+                _never_download(project_name, setup_fn, search_dirs)
+            logger.info('No %s egg found; downloading' % project_name)
+            argv.extend(['--always-copy', '-U', project_name])
+    else:
+        project_name = 'distribute'
+        bootstrap_script = get_resource('DISTRIBUTE_SETUP_PY')
+        source = _find_file('distribute-0.6.24.tar.gz', search_dirs)
+        env['DONT_PATCH_SETUPTOOLS'] = 'true'
+        if os.path.exists(source):
+            logger.info('Using existing %s egg: %s' % (project_name, source))
+            cwd = os.path.dirname(source)
+            # in this case, we want to be sure that PYTHONPATH is unset (not
+            # just empty, really unset), else CPython tries to import the
+            # site.py that it's in virtualenv_support
+            remove_from_env.append('PYTHONPATH')
+        else:
+            if never_download:
+                _never_download(project_name, source, search_dirs)
+            logger.info('No %s egg found; downloading' % project_name)
+            argv.extend(['--always-copy', '-U', project_name])
+
+    pip = find_pip(search_dirs)
+    if pip is None:
+        if never_download:
+            logger.fatal("Can't find any local distributions of pip to install "
+                         "and --never-download is set.  Either re-run virtualenv "
+                         "without the --never-download option, or place a pip "
+                         "source distribution (zip/tar.gz/tar.bz2) in one of these "
+                         "locations: %r" % search_dirs)
+            sys.exit(1)
+        logger.info('Installing pip from network...')
+        pip = 'pip'
+    else:
+        logger.info('Installing existing %s distribution: %s' % (
+                os.path.basename(pip), pip))
+
+    tmp_dir = tempfile.mkdtemp()
+    if not os.access(cwd or os.getcwd(), os.W_OK):
+        # the current working dir is hostile, let's work in the temp dir
+        # (with a copy of the tarball)
+        if cwd is not None:
+            shutil.copy(source, join(tmp_dir, os.path.basename(source)))
+        cwd = tmp_dir
+    script = join(tmp_dir, '%s_setup.py' % project_name)
+    runner = join(tmp_dir, 'bootstrap.py')
+    steps = [{'name': project_name, 'kind': 'script',
+              'script': script, 'argv': argv},
+             {'name': 'pip', 'kind': 'easy_install',
+              'argv': [pip], 'site_dir': os.path.abspath(site_dir)}]
+    f = open(script, 'w')
+    try:
+        f.write(bootstrap_script)
+    finally:
+        f.close()
+    f = open(runner, 'w')
+    try:
+        f.write(RUNNER_SCRIPT % {'steps': steps, 'marker': STEP_MARKER})
+    finally:
+        f.close()
+
+    logger.start_progress('Installing %s and pip...' % project_name)
+    logger.indent += 2
+    try:
+        call_subprocess([py_executable, runner], show_stdout=False,
+                        filter_stdout=StepFilter(),
+                        extra_env=env,
+                        remove_from_env=remove_from_env,
+                        cwd=cwd)
+    finally:
+        logger.indent -= 2
+        logger.end_progress()
+        shutil.rmtree(tmp_dir)
+
+
+def filter_pip(line):
+    if not line.strip():
+        return Logger.DEBUG
+    if line.startswith('Successfully installed'):
+        return Logger.NOTIFY
+    for prefix in ['Downloading/unpacking', 'Unpacking', 'Running setup.py',
+                   'Installing collected packages', 'Installing ',
+                   'Cleaning up', 'Requirement already satisfied',
+                   'Ignoring indexes', '  ']:
+        if line.startswith(prefix):
+            return Logger.DEBUG
+    return Logger.INFO
+
+
+def path_to_url(path):
+    """Returns the file: URL of a local path, as pip expects for --find-links"""
+    try:
+        from urllib import pathname2url
+    except ImportError:
+        from urllib.request import pathname2url
+    return 'file:' + pathname2url(os.path.abspath(path))
+
+
+def install_requirements(py_executable, requirements, search_dirs=None,
+                         never_download=False):
+    """
+    Installs the requirement files ``requirements`` with the pip of
+    ``py_executable``, in a single pip run.  With ``never_download`` the
+    search dirs are the only place pip looks for distributions.
+    """
+    if search_dirs is None:
+        search_dirs = file_search_dirs()
+    cmd = [py_executable, '-c',
+           'import sys, pip; sys.exit(pip.main(sys.argv[1:]))', 'install']
+    for filename in requirements:
+        cmd.extend(['-r', os.path.abspath(filename)])
+    if never_download:
+        cmd.append('--no-index')
+        for dir in search_dirs:
+            if os.path.isdir(dir):
+                cmd.extend(['--find-links', path_to_url(dir)])
+    logger.start_progress('Installing requirements from %s...'
+                          % ', '.join(requirements))
+    logger.indent += 2
+    try:
+        call_subprocess(cmd, show_stdout=False, filter_stdout=filter_pip)
+    finally:
+        logger.indent -= 2
+        logger.end_progress()
@@ -0,0 +1,121 @@
+import os
+import sys
+import py_compile
+
+from ve.log import logger
+
+try:
+    from importlib.util import cache_from_source
+except ImportError:
+    try:
+        from imp import cache_from_source
+    except ImportError:
+        def cache_from_source(path):
+            return path + (__debug__ and 'c' or 'o')
+
+
+join = os.path.join
+
+
+def compile_targets(home_dir):
+    """
+    Returns the ``.py`` files of the environment in ``home_dir`` whose
+    byte-code is missing or older than the source.  Symlinks (and the
+    directories behind them) belong to the base Python and are left
+    alone.
+    """
+    targets = []
+    for dirpath, dirnames, filenames in os.walk(home_dir):
+        # os.walk doesn't descend into symlinked directories
+        if '__pycache__' in dirnames:
+            dirnames.remove('__pycache__')
+        for name in filenames:
+            if not name.endswith('.py'):
+                continue
+            path = join(dirpath, name)
+            if os.path.islink(path):
+                continue
+            try:
+                source_mtime = os.stat(path).st_mtime
+                if os.stat(cache_from_source(path)).st_mtime >= source_mtime:
+                    continue
+            except OSError:
+                pass
+            targets.append(path)
+    targets.sort()
+    return targets
+
+
+def compile_file(path):
+    """
+    Byte-compiles ``path``; returns ``(path, None)``, or ``(path, error)``
+    if it could not be compiled.
+    """
+    try:
+        py_compile.compile(path, doraise=True)
+    except (py_compile.PyCompileError, IOError, OSError):
+        return path, str(sys.exc_info()[1]).strip()
+    return path, None
+
+
+def _pool_context():
+    """
+    Returns the multiprocessing module (or its fork context), or None when
+    no process pool can be used here.
+    """
+    try:
+        import multiprocessing
+    except ImportError:
+        return None
+    if multiprocessing.current_process().daemon:
+        # workers of a batch creation can't start processes of their own
+        return None
+    if hasattr(multiprocessing, 'get_all_start_methods'):
+        if 'fork' in multiprocessing.get_all_start_methods():
+            return multiprocessing.get_context('fork')
+    return multiprocessing
+
+
+def compile_files(files, processes=None):
+    """
+    Byte-compiles ``files`` with a pool of ``processes`` worker processes
+    (one per CPU by default), or in this process when there is no pool.
+    Returns the ``(path, error)`` results of compile_file(), in order.
+    """
+    files = list(files)
+    context = None
+    if len(files) > 1 and processes != 1:
+        context = _pool_context()
+    if context is None:
+        return [compile_file(path) for path in files]
+    processes = min(processes or context.cpu_count(), len(files))
+    logger.info('Byte-compiling %s files with %s processes', len(files),
+                processes)
+    pool = context.Pool(processes)
+    try:
+        return pool.map(compile_file, files, 16)
+    finally:
+        pool.close()
+        pool.join()
+
+
+def byte_compile(home_dir, processes=None):
+    """
+    Byte-compiles the environment's own Python files and logs the
+    outcome; returns the number of files that failed.
+    """
+    files = compile_targets(home_dir)
+    if not files:
+        logger.info('Byte-code of %s is up to date', home_dir)
+        return 0
+    failed = [(path, error) for path, error in compile_files(files, processes)
+              if error is not None]
+    logger.notify('Byte-compiled %s files in %s (%s failed)',
+                  len(files) - len(failed), home_dir, len(failed))
+    logger.indent += 2
+    try:
+        for path, error in failed:
+            logger.warn('Cannot compile %s: %s', path, error)
+    finally:
+        logger.indent -= 2
+    return len(failed)
@@ -0,0 +1,110 @@
+import os
+import sys
+try:
+    import json
+except ImportError:
+    json = None
+
+try:
+    from hashlib import sha1
+except ImportError:
+    from sha import new as sha1
+
+from ve import *
+from ve.log import logger
+
+
+join = os.path.join
+
+
+class InterpreterCache(object):
+    """
+    Facts about an interpreter that outlive a single run, kept in a JSON
+    file under ``default_storage_dir/cache``.  The file is named after
+    the interpreter's real path, its mtime and ``sys.prefix``, so
+    upgrading or replacing the interpreter starts a fresh cache.
+
+    Entries are only trusted as far as the caller checks them; ``get()``
+    returns what was stored and leaves the validation to the caller.
+    """
+
+    def __init__(self, storage_dir=None):
+        self._dir = join(storage_dir or default_storage_dir, 'cache')
+        self._data = None
+
+    def key(self):
+        executable = os.path.realpath(sys.executable)
+        parts = [executable, repr(os.stat(executable).st_mtime), sys.prefix]
+        return sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def filename(self):
+        return join(self._dir, 'interpreter-%s.json' % self.key())
+
+    def load(self):
+        if self._data is not None:
+            return self._data
+        self._data = {}
+        if json is None:
+            return self._data
+        filename = self.filename()
+        try:
+            f = open(filename)
+        except IOError:
+            return self._data
+        try:
+            try:
+                self._data = json.load(f)
+            except ValueError:
+                logger.info('Ignoring unreadable cache %s', filename)
+        finally:
+            f.close()
+        return self._data
+
+    def get(self, name, default=None):
+        return self.load().get(name, default)
+
+    def set(self, name, value):
+        self.load()[name] = value
+        self.save()
+
+    def discard(self, name):
+        if self.load().pop(name, None) is not None:
+            self.save()
+
+    def save(self):
+        """
+        Writes the cache next to its final name and renames it into
+        place.  A storage dir that can't be written to only costs the
+        speed-up, so errors are logged and otherwise ignored.
+        """
+        if json is None:
+            return
+        filename = self.filename()
+        tmp_filename = '%s.tmp-%s' % (filename, os.getpid())
+        try:
+            if not os.path.isdir(self._dir):
+                os.makedirs(self._dir)
+            f = open(tmp_filename, 'w')
+            try:
+                json.dump(self._data, f, indent=1, sort_keys=True)
+            finally:
+                f.close()
+            if is_win and os.path.exists(filename):
+                os.remove(filename)
+            os.rename(tmp_filename, filename)
+        except (IOError, OSError):
+            logger.info('Could not write cache %s: %s', filename,
+                        sys.exc_info()[1])
+            return
+        logger.debug('Wrote cache %s', filename)
+
+
+_interpreter_cache = None
+
+
+def interpreter_cache():
+    """Returns the InterpreterCache of the running interpreter"""
+    global _interpreter_cache
+    if _interpreter_cache is None:
+        _interpreter_cache = InterpreterCache()
+    return _interpreter_cache
@@ -1,9 +1,26 @@
 import os
+import sys
 import optparse
-import ConfigParser
+try:
+    import ConfigParser
+except ImportError:
+    import configparser as ConfigParser
 import ve
 
 
+def strtobool(val):
+    """
+    Converts a true/false string of a config file or environment variable
+    to 1 or 0, like distutils.util.strtobool (which is slow to import).
+    """
+    val = val.lower()
+    if val in ('y', 'yes', 't', 'true', 'on', '1'):
+        return 1
+    elif val in ('n', 'no', 'f', 'false', 'off', '0'):
+        return 0
+    raise ValueError('invalid truth value %r' % (val,))
+
+
 class UpdatingDefaultsHelpFormatter(optparse.IndentedHelpFormatter):
     """
     Custom help formatter for use in ConfigOptionParser that updates
@@ -0,0 +1,273 @@
+import os
+import sys
+try:
+    import threading
+except ImportError:
+    import dummy_threading as threading
+# current_thread() is new in 2.6; currentThread() is deprecated in 3.10
+try:
+    current_thread = threading.current_thread
+except AttributeError:
+    current_thread = threading.currentThread
+try:
+    import json
+except ImportError:
+    json = None
+try:
+    from hashlib import md5
+except ImportError:
+    from md5 import new as md5
+
+from ve import *
+from ve.log import logger
+from ve.utils import join, run_parallel
+
+
+# Where ez_setup.py and distribute_setup.py download from; the bootstrap
+# archives are laid out below it as on PyPI.
+DEFAULT_DOWNLOAD_URL = 'http://pypi.python.org/packages'
+
+PIP_VERSION = '1.1'
+
+# The MD5 digests PyPI publishes for the archives bootstrap_downloads()
+# asks for (and that virtualenv_support/ bundles).  A download of one of
+# these has to match before it is cached.
+DOWNLOAD_MD5 = {
+    'setuptools-0.6c11-py2.3.egg': '2baeac6e13d414a9d28e7ba5b5a596de',
+    'setuptools-0.6c11-py2.4.egg': 'bd639f9b0eac4c42497034dec2ec0c2b',
+    'setuptools-0.6c11-py2.5.egg': '64c94f3bf7a72a13ec83e0b24f2749b2',
+    'setuptools-0.6c11-py2.6.egg': 'bfa92100bd772d5a213eedd356d64086',
+    'setuptools-0.6c11-py2.7.egg': 'fe1f997bc722265116870bc7919059ea',
+    'distribute-0.6.24.tar.gz': '17722b22141aba8235787f79800cc452',
+    'pip-1.1.tar.gz': '62a9f08dd5dc69d76734568a6c040508',
+}
+
+DOWNLOAD_TIMEOUT = 30
+
+
+def bootstrap_downloads(distribute=False, pyversion=None):
+    """
+    Returns ``(filename, path)`` for each archive install_packaging()
+    needs, ``path`` being relative to the download URL.
+    """
+    pyversion = pyversion or sys.version[:3]
+    if distribute:
+        setup = 'distribute-0.6.24.tar.gz'
+        setup_path = 'source/d/distribute/' + setup
+    else:
+        setup = 'setuptools-0.6c11-py%s.egg' % pyversion
+        setup_path = '%s/s/setuptools/%s' % (pyversion, setup)
+    pip = 'pip-%s.tar.gz' % PIP_VERSION
+    return [(setup, setup_path), (pip, 'source/p/pip/' + pip)]
+
+
+def missing_downloads(distribute, search_dirs, pyversion=None):
+    """
+    Returns the bootstrap_downloads() not found in ``search_dirs``; any
+    pip will do, the setuptools or distribute version is fixed.
+    """
+    from ve.archives import best_archive, find_archive
+    missing = []
+    for filename, path in bootstrap_downloads(distribute, pyversion):
+        if filename.startswith('pip-'):
+            found = best_archive('pip', search_dirs, pyversion or sys.version[:3])
+        else:
+            found = find_archive(filename, search_dirs)
+        if found is None:
+            missing.append((filename, path))
+    return missing
+
+
+class DownloadCache(object):
+    """
+    Bootstrap archives downloaded by virtualenv, kept under
+    ``default_storage_dir/downloads`` together with the ``ETag`` and
+    ``Last-Modified`` headers they were served with.
+
+    The directory is searched like the ``--extra-search-dir`` ones, so a
+    cached archive is installed without going to the network at all.
+    Refreshing an archive revalidates it with a conditional request.
+    """
+
+    def __init__(self, storage_dir=None):
+        self.dir = join(storage_dir or default_storage_dir, 'downloads')
+
+    def path(self, filename):
+        return join(self.dir, filename)
+
+    def meta_filename(self, filename):
+        return self.path(filename) + '.json'
+
+    def meta(self, filename):
+        if json is None:
+            return {}
+        try:
+            f = open(self.meta_filename(filename))
+        except IOError:
+            return {}
+        try:
+            try:
+                return json.load(f)
+            except ValueError:
+                return {}
+        finally:
+            f.close()
+
+    def _write(self, filename, write):
+        """
+        Writes ``filename`` through ``write(f)`` into a temporary file that
+        is then renamed, so concurrent creations never see half a file.
+        """
+        tmp = '%s.tmp-%s-%s' % (filename, os.getpid(),
+                                id(current_thread()))
+        f = open(tmp, 'wb')
+        try:
+            write(f)
+        finally:
+            f.close()
+        if sys.platform == 'win32' and os.path.exists(filename):
+            os.remove(filename)
+        os.rename(tmp, filename)
+
+    def fetch(self, url, filename, refresh=False):
+        """
+        Returns the path of the cached ``filename``, downloading it from
+        ``url`` first if it is not cached yet.  With ``refresh`` a cached
+        copy is revalidated.  Returns None if it can't be had.
+        """
+        path = self.path(filename)
+        cached = os.path.exists(path)
+        if cached and not refresh:
+            return path
+        headers = {}
+        if cached:
+            meta = self.meta(filename)
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+        logger.info('%s %s', cached and 'Checking' or 'Downloading', url)
+        # urllib2 pulls in httplib, socket and ssl; only import it when
+        # there is something to download
+        try:
+            from urllib2 import Request, urlopen, HTTPError, URLError
+            from httplib import HTTPException
+        except ImportError:
+            from urllib.request import Request, urlopen
+            from urllib.error import HTTPError, URLError
+            from http.client import HTTPException
+        try:
+            response = urlopen(Request(url, headers=headers),
+                               timeout=DOWNLOAD_TIMEOUT)
+            try:
+                data = response.read()
+                info = response.info()
+            finally:
+                response.close()
+        except HTTPError:
+            e = sys.exc_info()[1]
+            if e.code == 304 and cached:
+                logger.info('%s has not changed', filename)
+                return path
+            return self._failed(url, path, cached, e)
+        except (URLError, HTTPException, IOError, OSError):
+            # a body cut short raises IncompleteRead, an HTTPException
+            return self._failed(url, path, cached, sys.exc_info()[1])
+        error = self.check(filename, data, info)
+        if error is not None:
+            return self._failed(url, path, cached, error)
+        if not os.path.isdir(self.dir):
+            try:
+                os.makedirs(self.dir)
+            except OSError:
+                # created by a concurrent download
+                pass
+        self._write(path, lambda f: f.write(data))
+        if json is not None:
+            meta = {'url': url, 'etag': info.get('ETag'),
+                    'last_modified': info.get('Last-Modified')}
+            self._write(self.meta_filename(filename),
+                        lambda f: f.write(json.dumps(meta).encode('utf-8')))
+        logger.notify('Downloaded %s (%s bytes)', filename, len(data))
+        return path
+
+    def check(self, filename, data, info):
+        """
+        Returns why the downloaded ``data`` of ``filename`` can't be
+        cached, or None: an error page served in its place, a truncated
+        body, or (for the archives in DOWNLOAD_MD5) any other content.
+        """
+        content_type = info.get('Content-Type') or ''
+        if content_type.split(';')[0].strip().lower() in ('text/html',
+                                                          'text/plain'):
+            return 'served as %s' % content_type
+        length = info.get('Content-Length')
+        if length is not None and length.isdigit() and int(length) != len(data):
+            return 'got %s of %s bytes' % (len(data), length)
+        expected = DOWNLOAD_MD5.get(filename)
+        if expected is not None:
+            digest = md5(data).hexdigest()
+            if digest != expected:
+                return 'MD5 %s, expected %s' % (digest, expected)
+        return None
+
+    def _failed(self, url, path, cached, error):
+        if cached:
+            logger.warn('Cannot check %s (%s); using the cached copy', url, error)
+            return path
+        logger.warn('Cannot download %s: %s', url, error)
+        return None
+
+    def fetch_all(self, downloads, base_url=None, refresh=False, workers=4):
+        """
+        Fetches the ``(filename, path)`` pairs of ``downloads`` from
+        ``base_url``, ``workers`` at a time.  Returns the cached paths, or
+        None for the ones that could not be fetched.
+        """
+        base_url = (base_url or DEFAULT_DOWNLOAD_URL).rstrip('/')
+
+        def fetch(download):
+            filename, path = download
+            return self.fetch('%s/%s' % (base_url, path), filename, refresh)
+        return run_parallel(fetch, downloads, workers)
+
+
+class Prefetch(object):
+    """
+    Runs DownloadCache.fetch_all() in a background thread, so downloads
+    overlap with laying out the environment.  Its messages are held back
+    until join().
+    """
+
+    def __init__(self, cache, downloads, base_url=None, refresh=False):
+        self._cache = cache
+        self._downloads = downloads
+        self._base_url = base_url
+        self._refresh = refresh
+        self._captured = []
+        self.paths = None
+        self.error = None
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _run(self):
+        logger.start_capture()
+        try:
+            try:
+                self.paths = self._cache.fetch_all(
+                    self._downloads, self._base_url, self._refresh,
+                    workers=len(self._downloads))
+            except Exception:
+                self.error = sys.exc_info()[1]
+        finally:
+            self._captured = logger.end_capture()
+
+    def join(self):
+        """Waits for the downloads and logs what happened"""
+        self._thread.join()
+        logger.replay(self._captured)
+        self._captured = []
+        if self.error is not None:
+            logger.warn('Downloading bootstrap archives failed: %s', self.error)
+        return self.paths
@@ -0,0 +1,186 @@
+import os
+import sys
+
+from ve.log import logger
+
+
+join = os.path.join
+
+EASY_INSTALL_PTH = 'easy-install.pth'
+
+EGG_INFO = 'EGG-INFO'
+
+
+def module_name(filename):
+    """
+    The top-level name a file or directory of a site dir is imported as;
+    files that aren't modules get a name that nothing imports.
+    """
+    return filename.split('.', 1)[0]
+
+
+def read_pth(filename):
+    f = open(filename)
+    try:
+        return [line.rstrip('\r\n') for line in f]
+    finally:
+        f.close()
+
+
+def egg_dirs(site_dir):
+    """
+    Returns ``(line, egg_dir)`` for each unzipped egg directly inside
+    ``site_dir`` that ``easy-install.pth`` puts on the path, in order.
+    """
+    pth = join(site_dir, EASY_INSTALL_PTH)
+    if not os.path.exists(pth):
+        return []
+    result = []
+    for line in read_pth(pth):
+        entry = line.strip()
+        if not entry or entry.startswith('#') or entry.startswith('import'):
+            continue
+        path = os.path.normpath(join(site_dir, entry))
+        if (path.endswith('.egg') and os.path.dirname(path) == site_dir
+            and os.path.isdir(path)):
+            result.append((line, path))
+    return result
+
+
+def egg_contents(egg_dir):
+    """The entries of ``egg_dir``, without its EGG-INFO"""
+    names = [name for name in os.listdir(egg_dir) if name != EGG_INFO]
+    names.sort()
+    return names
+
+
+def flattenable(site_dir, eggs):
+    """
+    Returns the egg directories of ``eggs`` that can be merged into
+    ``site_dir`` without changing what any import finds: the eggs come
+    before ``site_dir`` on ``sys.path``, so an egg is left alone if one of
+    its modules is also in ``site_dir`` or in another egg.  Eggs with
+    namespace packages, which share their top-level package with other
+    distributions, are left alone too.
+    """
+    providers = {}
+    for name in os.listdir(site_dir):
+        providers.setdefault(module_name(name), []).append(site_dir)
+    for line, egg_dir in eggs:
+        for name in egg_contents(egg_dir):
+            providers.setdefault(module_name(name), []).append(egg_dir)
+    result = []
+    for line, egg_dir in eggs:
+        egg_name = os.path.basename(egg_dir)
+        if os.path.exists(join(egg_dir, EGG_INFO, 'namespace_packages.txt')):
+            logger.notify('Not flattening %s: it has namespace packages',
+                          egg_name)
+            continue
+        if os.path.exists(join(site_dir, egg_name + '-info')):
+            logger.notify('Not flattening %s: %s-info already exists',
+                          egg_name, egg_name)
+            continue
+        clashes = [module_name(name) for name in egg_contents(egg_dir)
+                   if len(providers[module_name(name)]) > 1]
+        if clashes:
+            logger.notify('Not flattening %s: %s also provided elsewhere',
+                          egg_name, ', '.join(sorted(set(clashes))))
+            continue
+        result.append(egg_dir)
+    return result
+
+
+def remove_bytecode(path):
+    """
+    Removes the byte-code under ``path``; it names the files at their old
+    location in tracebacks.
+    """
+    if not os.path.isdir(path):
+        if path.endswith('.pyc') or path.endswith('.pyo'):
+            os.remove(path)
+        return
+    for dirpath, dirnames, filenames in os.walk(path):
+        for name in filenames:
+            if name.endswith('.pyc') or name.endswith('.pyo'):
+                os.remove(join(dirpath, name))
+
+
+def installed_files(site_dir, names, egg_info_dir):
+    """
+    The ``installed-files.txt`` lines of the entries ``names`` of
+    ``site_dir``: every file relative to ``egg_info_dir``, as pip writes
+    them, with the byte-code Python will write for the sources.
+    """
+    files = []
+    for name in names:
+        path = join(site_dir, name)
+        if os.path.isdir(path):
+            for dirpath, dirnames, filenames in os.walk(path):
+                if '__pycache__' in dirnames:
+                    dirnames.remove('__pycache__')
+                files.extend([join(dirpath, filename) for filename in filenames])
+        else:
+            files.append(path)
+    lines = []
+    for path in sorted(files):
+        lines.append(join(os.pardir, path[len(site_dir) + 1:]))
+        if path.endswith('.py'):
+            lines.append(join(os.pardir, path[len(site_dir) + 1:]) + 'c')
+    lines.extend(os.listdir(egg_info_dir) + ['installed-files.txt'])
+    return lines
+
+
+def flatten_egg(site_dir, egg_dir):
+    """
+    Moves the contents of ``egg_dir`` into ``site_dir``, and its EGG-INFO
+    to ``NAME.egg-info`` next to them, with an ``installed-files.txt``
+    that lets ``pip uninstall`` find the moved files.
+    """
+    names = egg_contents(egg_dir)
+    egg_info_dir = join(site_dir, os.path.basename(egg_dir) + '-info')
+    for name in names:
+        os.rename(join(egg_dir, name), join(site_dir, name))
+        remove_bytecode(join(site_dir, name))
+    if os.path.isdir(join(egg_dir, EGG_INFO)):
+        os.rename(join(egg_dir, EGG_INFO), egg_info_dir)
+    else:
+        os.mkdir(egg_info_dir)
+    lines = installed_files(site_dir, names, egg_info_dir)
+    f = open(join(egg_info_dir, 'installed-files.txt'), 'w')
+    try:
+        f.write('\n'.join(lines) + '\n')
+    finally:
+        f.close()
+    os.rmdir(egg_dir)
+
+
+def flatten_eggs(fs, site_dir):
+    """
+    Merges the unzipped eggs listed in ``site_dir/easy-install.pth`` into
+    ``site_dir`` and takes them out of the ``.pth`` file, so they no
+    longer lengthen ``sys.path``.  Returns the flattened egg directories.
+    """
+    site_dir = os.path.abspath(site_dir)
+    eggs = egg_dirs(site_dir)
+    if not eggs:
+        logger.notify('No unzipped eggs in %s', join(site_dir, EASY_INSTALL_PTH))
+        return []
+    flattened = []
+    for egg_dir in flattenable(site_dir, eggs):
+        logger.notify('Flattening %s', os.path.basename(egg_dir))
+        try:
+            flatten_egg(site_dir, egg_dir)
+        except (IOError, OSError):
+            logger.warn('Cannot flatten %s: %s', egg_dir, sys.exc_info()[1])
+            if os.path.isdir(egg_dir):
+                # partly moved; keep it on the path
+                continue
+        flattened.append(egg_dir)
+    if flattened:
+        lines = [line for line, egg_dir in eggs if egg_dir in flattened]
+        kept = [line for line in read_pth(join(site_dir, EASY_INSTALL_PTH))
+                if line not in lines]
+        fs.writefile(join(site_dir, EASY_INSTALL_PTH), '\n'.join(kept) + '\n')
+    logger.notify('Flattened %s of %s eggs into %s', len(flattened), len(eggs),
+                  site_dir)
+    return flattened
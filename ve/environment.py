@@ -3,84 +3,119 @@ import distutils
 from ve.utils import *
 from ve.utils import _find_file
 from ve.log import logger, Logger
-
-def _filter_ez_setup(line, project_name='setuptools'):
-    if not line.strip():
-        return Logger.DEBUG
-    if project_name == 'distribute':
-        for prefix in ('Extracting', 'Now working', 'Installing', 'Before',
-                       'Scanning', 'Setuptools', 'Egg', 'Already',
-                       'running', 'writing', 'reading', 'installing',
-                       'creating', 'copying', 'byte-compiling', 'removing',
-                       'Processing'):
-            if line.startswith(prefix):
-                return Logger.DEBUG
-        return Logger.DEBUG
-    for prefix in ['Reading ', 'Best match', 'Processing setuptools',
-                   'Copying setuptools', 'Adding setuptools',
-                   'Installing ', 'Installed ']:
-        if line.startswith(prefix):
-            return Logger.DEBUG
-    return Logger.INFO
-
-def install_distribute(py_executable, unzip=False,
-                       search_dirs=None, never_download=False):
-    _install_req(py_executable, unzip, distribute=True,
-                 search_dirs=search_dirs, never_download=never_download)
-
-_pip_re = re.compile(r'^pip-.*(zip|tar.gz|tar.bz2|tgz|tbz)$', re.I)
-def install_pip(py_executable, search_dirs=None, never_download=False):
-    if search_dirs is None:
-        search_dirs = file_search_dirs()
-
-    filenames = []
-    for dir in search_dirs:
-        filenames.extend([join(dir, fn) for fn in os.listdir(dir)
-                          if _pip_re.search(fn)])
-    filenames = [(os.path.basename(filename).lower(), i, filename) for i, filename in enumerate(filenames)]
-    filenames.sort()
-    filenames = [filename for basename, i, filename in filenames]
-    if not filenames:
-        filename = 'pip'
-    else:
-        filename = filenames[-1]
-    easy_install_script = 'easy_install'
-    if sys.platform == 'win32':
-        easy_install_script = 'easy_install-script.py'
-    # There's two subtle issues here when invoking easy_install.
-    # 1. On unix-like systems the easy_install script can *only* be executed
-    #    directly if its full filesystem path is no longer than 78 characters.
-    # 2. A work around to [1] is to use the `python path/to/easy_install foo`
-    #    pattern, but that breaks if the path contains non-ASCII characters, as
-    #    you can't put the file encoding declaration before the shebang line.
-    # The solution is to use Python's -x flag to skip the first line of the
-    # script (and any ASCII decoding errors that may have occurred in that line)
-    cmd = [py_executable, '-x', join(os.path.dirname(py_executable), easy_install_script), filename]
-    # jython and pypy don't yet support -x
-    if is_jython or is_pypy:
-        cmd.remove('-x')
-    if filename == 'pip':
-        if never_download:
-            logger.fatal("Can't find any local distributions of pip to install "
-                         "and --never-download is set.  Either re-run virtualenv "
-                         "without the --never-download option, or place a pip "
-                         "source distribution (zip/tar.gz/tar.bz2) in one of these "
-                         "locations: %r" % search_dirs)
-            sys.exit(1)
-        logger.info('Installing pip from network...')
-    else:
-        logger.info('Installing existing %s distribution: %s' % (
-                os.path.basename(filename), filename))
-    logger.start_progress('Installing pip...')
-    logger.indent += 2
-    def _filter_setup(line):
-        return _filter_ez_setup(line, 'pip')
+from ve.bytecompile import byte_compile
+from ve.download import DownloadCache, Prefetch, missing_downloads
+from ve.eggs import flatten_eggs
+from ve.runner import LAUNCHER_BAT, LAUNCHER_SH
+from ve.bootstrap import PackagingCache, install_packaging, install_requirements, \
+     packaging_archives
+from ve.manifest import file_hash
+from ve.cache import interpreter_cache
+from ve.probe import interpreter_probe, probe_executable
+from ve.manifest import Manifest
+from ve.plan import Plan, PlanExecutor
+from ve.layers import LayerStore
+from ve.template import TemplateStore
+from ve.timing import timings
+
+# Facts about the running interpreter that don't depend on the
+# environment being created.  They are computed once per process, and
+# processes forked by a batch creation inherit them.
+_interpreter_facts = {}
+
+
+def required_module_files():
+    """
+    Returns the files of the bootstrap modules (``ve.required_modules()``)
+    of the running interpreter, with the ``.py`` source of every ``.pyc``.
+
+    The result is kept in the interpreter cache, so that later runs only
+    need to check that the files are still there instead of searching
+    ``sys.path`` for every module.
+    """
+    if 'modules' in _interpreter_facts:
+        return _interpreter_facts['modules']
+    cache = interpreter_cache()
+    entry = cache.get('modules')
+    if entry and entry.get('names') == ve.required_modules():
+        file_list = entry['files']
+        missing = [fn for fn in file_list if not os.path.exists(fn)]
+        if not missing:
+            logger.debug('Using cached bootstrap module locations')
+            _interpreter_facts['modules'] = file_list
+            return file_list
+        logger.info('Cached bootstrap module %s is gone; searching again',
+                    missing[0])
+    file_list = find_required_module_files()
+    cache.set('modules', {'names': ve.required_modules(), 'files': file_list})
+    _interpreter_facts['modules'] = file_list
+    return file_list
+
+
+def site_module_filename():
+    """Returns the source file of the running interpreter's site module"""
+    import site
+    site_filename = site.__file__
+    if site_filename.endswith('.pyc'):
+        site_filename = site_filename[:-1]
+    elif site_filename.endswith('$py.class'):
+        site_filename = site_filename.replace('$py.class', '.py')
+    return site_filename
+
+
+def find_required_module_files():
+    """Searches ``sys.path`` for the files of the bootstrap modules"""
+    import imp
+    # If we are running under -p, we need to remove the current
+    # directory from sys.path temporarily here, so that we
+    # definitely get the modules from the site directory of
+    # the interpreter we are running under, not the one
+    # virtualenv.py is installed under (which might lead to py2/py3
+    # incompatibility issues)
+    file_list = []
+    _prev_sys_path = sys.path
+    if os.environ.get('VIRTUALENV_INTERPRETER_RUNNING'):
+        sys.path = sys.path[1:]
     try:
-        call_subprocess(cmd, show_stdout=False,
-                        filter_stdout=_filter_setup)
+        for modname in ve.required_modules():
+            if modname in sys.builtin_module_names:
+                logger.info("Ignoring built-in bootstrap module: %s" % modname)
+                continue
+            try:
+                f, filename, _ = imp.find_module(modname)
+            except ImportError:
+                logger.info("Cannot import bootstrap module: %s" % modname)
+            else:
+                if f is not None:
+                    f.close()
+                file_list.append(filename)
+                if filename.endswith('.pyc'):
+                    pyfile = filename[:-1]
+                    if os.path.exists(pyfile):
+                        file_list.append(pyfile)
     finally:
-        logger.indent -= 2
-        logger.end_progress()
+        sys.path = _prev_sys_path
+    return file_list
+
+
+def required_lib_files(stdlib_dirs):
+    """
+    Returns the entries of ``stdlib_dirs`` named in ``ve.REQUIRED_FILES``
+    as ``(source, name)`` pairs.
+    """
+    key = ('lib_files',) + tuple(stdlib_dirs)
+    if key in _interpreter_facts:
+        return _interpreter_facts[key]
+    file_list = []
+    for stdlib_dir in stdlib_dirs:
+        if not os.path.isdir(stdlib_dir):
+            continue
+        for fn in os.listdir(stdlib_dir):
+            bn = os.path.splitext(fn)[0]
+            if fn != 'site-packages' and bn in ve.REQUIRED_FILES:
+                file_list.append((join(stdlib_dir, fn), fn))
+    _interpreter_facts[key] = file_list
+    return file_list
 
 
 class BasePythonDistribution(object):
@@ -90,6 +125,9 @@ class BasePythonDistribution(object):
         self._fs = fs
         self._options = options
         self._ignore_exec_prefix = False
+        self._planned_executable = None
+        self._py_executable = None
+        self._probe = None
 
     def path_locations(self):
         raise NotImplementedError
@@ -104,23 +142,172 @@ class BasePythonDistribution(object):
     
         If ``clear`` is true (default False) then the environment will
         first be cleared.
+
+        If ``use_template`` is true a new environment is cloned from the
+        template stored for this interpreter and options, or saved as
+        that template once it has been created.
+
+        Running it again on an existing environment only redoes the steps
+        whose results changed since the last run, as recorded in its
+        Manifest.
         """
         # home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir)
         self.path_locations()
 
-        self.clear()
-
-        res = self.install_python()
+        store = template_key = None
+        if self._options.use_template:
+            store = TemplateStore(self._fs)
+            template_key = store.key(self._options, packaging_archives(
+                self.should_install_distribute(), self.search_dirs()))
+            if os.path.exists(self._home_dir):
+                logger.info('Not using a template; %s already exists',
+                            self._home_dir)
+                store = None
+            elif store.has(template_key):
+                timings.timed('template_clone', store.clone, template_key,
+                              self._home_dir)
+                timings.timed('activate', self.install_activate)
+                if getattr(self._options, 'compile', False):
+                    timings.timed('compile', self.byte_compile)
+                # the cloned manifest still has the stats of the template's
+                # files; record the relocated ones
+                manifest = Manifest.load(self._home_dir)
+                if manifest is not None:
+                    timings.start('manifest')
+                    manifest.refresh()
+                    manifest.save()
+                    timings.stop()
+                timings.timed('site_caches', self.write_site_caches)
+                return
+
+        timings.start('plan')
+        manifest = Manifest.load(self._home_dir)
+        plan = self.plan()
+        if manifest is not None:
+            manifest.filter(plan, clear=self._options.clear)
+        else:
+            manifest = Manifest(self._home_dir)
+        timings.stop()
+
+        if self._options.dry_run:
+            plan.report()
+            if manifest.phase_up_to_date('packaging',
+                                         self.phase_signature('packaging')):
+                logger.notify('Then install: nothing')
+            else:
+                logger.notify('Then install: %s, pip', self.should_install_distribute()
+                              and 'distribute' or 'setuptools')
+            if getattr(self._options, 'requirements', None):
+                logger.notify('Then install requirements from: %s',
+                              ', '.join(self._options.requirements))
+            if getattr(self._options, 'compile', False):
+                logger.notify('Then byte-compile the environment')
+            return
+        prefetch = None
+        if not manifest.phase_up_to_date('packaging',
+                                         self.phase_signature('packaging')):
+            prefetch = self.start_downloads()
+        PlanExecutor(self._fs, workers=self._options.workers).execute(plan)
+        if self._planned_executable is None:
+            return
+        manifest.record_plan(plan)
+        changed = bool(plan.operations)
+
+        self._py_executable = os.path.abspath(self._planned_executable)
+        if [op for op in plan.operations
+            if op.phase.startswith('install_python')]:
+            # the layout changed, so the executable has to be checked again
+            manifest.forget_phase('check_python')
+        if self.run_phase(manifest, 'check_python', self.check_python,
+                          self._planned_executable):
+            changed = True
+        if prefetch is not None:
+            timings.timed('download', prefetch.join)
+        if self.run_phase(manifest, 'packaging', self.install_packaging):
+            changed = True
+        if getattr(self._options, 'requirements', None):
+            if self.run_phase(manifest, 'requirements',
+                              self.install_requirements):
+                changed = True
+        if getattr(self._options, 'compile', False):
+            # not a manifest phase: only the files without up to date
+            # byte-code are compiled, whichever phase wrote them
+            timings.timed('compile', self.byte_compile)
+
+        timings.start('manifest')
+        manifest.refresh()
+        manifest.save()
+        timings.stop()
+        # last, since they record the mtimes of the environment's dirs;
+        # when nothing changed only missing or stale ones are written
+        timings.timed('site_caches', self.write_site_caches, force=changed)
+
+        if store is not None:
+            timings.timed('template_save', store.save, template_key,
+                          self._home_dir)
+
+    def phase_signature(self, phase):
+        """
+        Returns what a phase's results depend on besides its own files;
+        the phase runs again when this changes.
+        """
+        signature = '%s %s %r %r %r' % (phase, os.path.realpath(sys.executable),
+                                        self._options.search_dirs,
+                                        bool(self._options.unzip_setuptools),
+                                        bool(self.should_install_distribute()))
+        if phase == 'requirements':
+            for filename in self._options.requirements:
+                signature += ' %s' % file_hash(filename)
+        return signature
+
+    def run_phase(self, manifest, phase, func, *args):
+        """
+        Runs ``func(*args)`` unless the manifest shows the results of an
+        earlier run of ``phase`` are all in place, and records the files
+        it changed.  Returns whether it ran.
+        """
+        timings.start(phase)
+        signature = self.phase_signature(phase)
+        if manifest.phase_up_to_date(phase, signature):
+            logger.notify('Skipping %s; it is up to date', phase)
+            timings.stop(skipped=True)
+            return False
+        try:
+            before = manifest.snapshot()
+            func(*args)
+            manifest.record_changes(before, phase, signature)
+        finally:
+            timings.stop()
+        return True
 
-        self._py_executable = os.path.abspath(res)
+    def plan(self):
+        """
+        Returns the Plan of filesystem operations that lay out the
+        environment: clearing it, the Python installation, the distutils
+        patch and the activate scripts.  Nothing is changed on disk; the
+        steps record their operations in the plan instead.
+        """
+        fs = self._fs
+        self._fs = plan = Plan(fs)
+        try:
+            plan.phase('clear')
+            self.clear()
+            self._planned_executable = self.copy_python()
+            plan.phase('distutils')
+            self.install_distutils()
+            plan.phase('activate')
+            self.install_activate()
+        finally:
+            self._fs = fs
+        return plan
 
-        self.install_distutils()
-        if self.should_install_distribute():
-            self.install_distribute()
-        else:
-            self.install_setuptools()
-        self.install_pip()
-        self.install_activate()
+    def step(self, name):
+        """
+        Starts phase ``name`` of the plan being recorded, if any; the plan
+        is applied and timed phase by phase.
+        """
+        if isinstance(self._fs, Plan):
+            self._fs.phase(name)
 
     def clear(self):
         self._fs.rmtree(self._lib_dir)
@@ -128,39 +315,38 @@ class BasePythonDistribution(object):
         ## Maybe it should delete everything with #!/path/to/venv/python in it
         logger.notify('Not deleting %s', self._bin_dir)
 
+    def warm_up(self):
+        """
+        Computes the facts about the running interpreter that every
+        environment needs, so that processes forked afterwards share them.
+        """
+        required_module_files()
+        required_lib_files(self.stdlib_dirs())
+        interpreter_probe()
+
     def list_required_lib_files(self, stdlib_dirs):
-        file_list = []
-        for stdlib_dir in stdlib_dirs:
-            if not os.path.isdir(stdlib_dir):
-                continue
-            for fn in os.listdir(stdlib_dir):
-                bn = os.path.splitext(fn)[0]
-                if fn != 'site-packages' and bn in ve.REQUIRED_FILES:
-                    source = join(stdlib_dir, fn)
-                    dest = join(self._lib_dir, fn)
-                    file_list.append((source, dest))
-        return file_list
+        return [(source, join(self._lib_dir, fn))
+                for source, fn in required_lib_files(stdlib_dirs)]
 
     def copy_site_packages(self):
         home_dir = self._home_dir
         self._fs.mkdir(join(self._lib_dir, 'site-packages'))
-        import site
-        site_filename = site.__file__
-        if site_filename.endswith('.pyc'):
-            site_filename = site_filename[:-1]
-        elif site_filename.endswith('$py.class'):
-            site_filename = site_filename.replace('$py.class', '.py')
-        site_filename_dst = change_prefix(site_filename, home_dir)
+        site_filename_dst = change_prefix(site_module_filename(), home_dir)
         site_dir = os.path.dirname(site_filename_dst)
-        self._fs.writefile(site_filename_dst, ve.SITE_PY)
+        self._fs.writefile(site_filename_dst, get_resource('SITE_PY'))
         self._fs.writefile(join(site_dir, 'orig-prefix.txt'), self.prefix())
         site_packages_filename = join(site_dir, 'no-global-site-packages.txt')
         if not self._options.system_site_packages:
             self._fs.writefile(site_packages_filename, '')
         else:
-            if os.path.exists(site_packages_filename):
-                logger.info('Deleting %s' % site_packages_filename)
-                os.unlink(site_packages_filename)
+            self._fs.remove(site_packages_filename)
+        layers_filename = join(site_dir, 'layers.txt')
+        layers = getattr(self._options, 'layers', None)
+        if layers:
+            paths = LayerStore(self._fs).resolve(layers)
+            self._fs.writefile(layers_filename, '\n'.join(paths) + '\n')
+        else:
+            self._fs.remove(layers_filename)
 
     def prefix(self):
         if hasattr(sys, 'real_prefix'):
@@ -170,17 +356,37 @@ class BasePythonDistribution(object):
             prefix = sys.prefix
         return prefix
 
-    def copy_stdinc(self):
+    def list_stdinc_files(self):
         if os.path.exists(self._stdinc_dir):
-            self._fs.copyfile(self._stdinc_dir, self._inc_dir)
-        else:
-            logger.debug('No include dir %s' % self._stdinc_dir)
+            return [(self._stdinc_dir, self._inc_dir)]
+        logger.debug('No include dir %s' % self._stdinc_dir)
+        return []
+
+    def copy_stdinc(self):
+        self._fs.copyfiles(self.list_stdinc_files())
+
+    def list_exec_prefix_files(self):
+        # pypy never uses exec_prefix, just ignore it
+        if self._ignore_exec_prefix or sys.exec_prefix == self.prefix():
+            return []
+        return [(join(self._exec_dir, fn), join(self._lib_dir, fn))
+                for fn in os.listdir(self._exec_dir)]
 
     def copy_executable(self):
         pass
 
     def install_python(self):
         """Install just the base environment, no distutils patches etc"""
+        py_executable = self.copy_python()
+        if py_executable is not None:
+            return self.check_python(py_executable)
+
+    def copy_python(self):
+        """
+        Lays out the base environment on disk.  Returns the new
+        executable, or None if virtualenv is run by an environment's
+        own python.
+        """
         home_dir = self._home_dir
         lib_dir = self._lib_dir
         inc_dir = self._inc_dir
@@ -191,6 +397,7 @@ class BasePythonDistribution(object):
             print('Please use the *system* python to run this script')
             return
 
+        self.step('install_python.modules')
         self._fs.mkdir(self._lib_dir)
         self.fix_lib64()
 
@@ -201,25 +408,23 @@ class BasePythonDistribution(object):
             logger.info('Copying Python bootstrap modules')
         logger.indent += 2
         try:
-            for src, dest in self.list_required_lib_files(stdlib_dirs):
-                self._fs.copyfile(src, dest)
-            self.copy_required_modules()
+            files = self.list_required_lib_files(stdlib_dirs)
+            files.extend(self.list_required_modules())
+            self._fs.copyfiles(files, workers=self._options.workers)
         finally:
             logger.indent -= 2
 
+        # site.py has to be written before the exec-prefix files are
+        # linked in, or it could end up written through a symlink
+        self.step('install_python.site')
         self.copy_site_packages()
-        self.copy_stdinc()
-
-        # pypy never uses exec_prefix, just ignore it
-        if not self._ignore_exec_prefix:
-            if sys.exec_prefix != self.prefix():
-                for fn in os.listdir(self._exec_dir):
-                    self._fs.copyfile(join(self._exec_dir, fn),
-                                      join(self._lib_dir, fn))
+        files = self.list_stdinc_files() + self.list_exec_prefix_files()
+        self._fs.copyfiles(files, workers=self._options.workers)
 
         self.platform_specific()
 
         # Bin exec
+        self.step('install_python.executable')
         self._fs.mkdir(bin_dir)
         py_executable = self.py_executable()
 
@@ -233,12 +438,9 @@ class BasePythonDistribution(object):
             self._fs.writefile(pyd_pth, pcbuild_dir)
         else:
             pcbuild_dir = None
-            if os.path.exists(pyd_pth):
-                logger.info('Deleting %s (not Windows env or not build directory python)' % pyd_pth)
-                os.unlink(pyd_pth)
+            self._fs.remove(pyd_pth)
 
         if sys.executable != py_executable:
-            ## FIXME: could I just hard link?
             executable = sys.executable
             if sys.platform == 'cygwin' and os.path.exists(executable + '.exe'):
                 # Cygwin misreports sys.executable sometimes
@@ -250,7 +452,10 @@ class BasePythonDistribution(object):
             logger.info("Reference Python Executable: %s", executable)
             # For the way CPython's prefix loads we can't use symlinks for the executable
             # http://svn.python.org/projects/python/trunk/Modules/getpath.c
-            self._fs.copyfile(executable, py_executable, symlink=False)
+            # Nor hard links: make_exe() and copy_executable() change the
+            # new executable in place, which would change the system one
+            self._fs.copyfile(executable, py_executable, symlink=False,
+                              hardlink=False)
             self._fs.make_exe(py_executable)
             self.copy_executable()
 
@@ -267,34 +472,37 @@ class BasePythonDistribution(object):
             else:
                 logger.notify('Also creating executable in %s' % secondary_exe)
                 
-                self._fs.copyfile(sys.executable, secondary_exe, symlink=False)
+                self._fs.copyfile(sys.executable, secondary_exe, symlink=False,
+                                  hardlink=False)
                 self._fs.make_exe(secondary_exe)
 
+        return py_executable
+
+    def check_python(self, py_executable):
+        """
+        Checks that the new executable works and reports the environment
+        as its prefix.  Returns the executable.
+        """
+        home_dir = self._home_dir
         if sys.platform == 'win32' and ' ' in py_executable:
             # There's a bug with subprocess on Windows when using a first
             # argument that has a space in it.  Instead we have to quote
             # the value:
             py_executable = '"%s"' % py_executable
 
-        # NOTE: keep this check as one line, cmd.exe doesn't cope with line breaks
-        cmd = [py_executable, '-c', 'import sys;import os;out=sys.stdout;'
-            'getattr(out, "buffer", out).write(os.path.abspath(sys.prefix.encode("utf-8")))']
-        logger.info('Testing executable with %s %s "%s"' % tuple(cmd))
-
-        proc_stdout = call_subprocess(cmd)[0]
-
-        proc_stdout = os.path.normcase(os.path.abspath(proc_stdout))
+        facts = probe_executable(py_executable)
+        prefix = os.path.normcase(facts['prefix'])
         norm_home_dir = os.path.normcase(os.path.abspath(home_dir))
 
         if hasattr(norm_home_dir, 'decode'):
             norm_home_dir = norm_home_dir.decode(sys.getfilesystemencoding())
 
-        if proc_stdout != norm_home_dir:
+        if prefix != norm_home_dir:
             logger.fatal(
                 'ERROR: The executable %s is not functioning' % py_executable)
             logger.fatal(
                 'ERROR: It thinks sys.prefix is %r (should be %r)'
-                % (proc_stdout, norm_home_dir))
+                % (prefix, norm_home_dir))
             logger.fatal(
                 'ERROR: virtualenv is not compatible with this system or executable')
             if sys.platform == 'win32':
@@ -306,7 +514,8 @@ class BasePythonDistribution(object):
                     'this problem.')
             sys.exit(100)
         else:
-            logger.info('Got sys.prefix result: %r' % proc_stdout)
+            logger.info('Got sys.prefix result: %r' % prefix)
+        self._probe = facts
 
         pydistutils = os.path.expanduser('~/.pydistutils.cfg')
         if os.path.exists(pydistutils):
@@ -325,35 +534,195 @@ class BasePythonDistribution(object):
         # we also check VIRTUALENV_USE_DISTRIBUTE for backwards compatibility
         return self._options.use_distribute or os.environ.get('VIRTUALENV_USE_DISTRIBUTE')
 
-    def install_distribute(self):
-        install_distribute(self._py_executable, unzip=self._options.unzip_setuptools,
-                           search_dirs=self._options.search_dirs,
-                           never_download=self._options.never_download)
-
-    def install_setuptools(self):
-        self._py_executable,
-        unzip=self._options.unzip_setuptools
-        search_dirs=self._options.search_dirs
-        never_download=self._options.never_download
-
-        self._install_req(self._py_executable,
-                          unzip,
-                          search_dirs,
-                          never_download=never_download)
+    def search_dirs(self):
+        """
+        Returns the dirs searched for the bootstrap archives: the
+        download cache, then the ``--extra-search-dir`` ones, which win
+        when both have an archive.
+        """
+        return [DownloadCache().dir] + list(self._options.search_dirs)
 
-    def install_pip(self):
-        install_pip(self._py_executable,
-                    search_dirs=self._options.search_dirs,
-                    never_download=self._options.never_download)
+    def start_downloads(self):
+        """
+        Starts fetching the bootstrap archives that are neither in the
+        search dirs nor in the download cache, in the background; returns
+        the Prefetch, or None when there is nothing to fetch.
+        """
+        if self._options.never_download:
+            return None
+        cache = DownloadCache()
+        downloads = missing_downloads(self.should_install_distribute(),
+                                      self._options.search_dirs)
+        if not getattr(self._options, 'refresh_downloads', False):
+            downloads = [(filename, path) for filename, path in downloads
+                         if not os.path.exists(cache.path(filename))]
+        if not downloads:
+            return None
+        logger.info('Fetching %s in the background',
+                    ', '.join([filename for filename, path in downloads]))
+        return Prefetch(cache, downloads,
+                        base_url=getattr(self._options, 'download_url', None),
+                        refresh=getattr(self._options, 'refresh_downloads', False))
+
+    def install_packaging(self):
+        """
+        Installs setuptools (or distribute) and pip, from the packaging
+        cache when the same archives were installed before for this
+        interpreter.
+        """
+        site_dir = join(self._lib_dir, 'site-packages')
+        bin_dir = os.path.dirname(self._py_executable)
+        distribute = self.should_install_distribute()
+        unzip = self._options.unzip_setuptools
+        cache = key = None
+        archives = packaging_archives(distribute, self.search_dirs())
+        if archives is not None:
+            cache = PackagingCache(self._fs)
+            key = cache.key(archives, unzip)
+            if cache.has(key):
+                cache.restore(key, self._home_dir, site_dir, bin_dir)
+                return
+            before = cache.listing(site_dir, bin_dir)
+        install_packaging(self._py_executable, site_dir,
+                          distribute=distribute,
+                          unzip=unzip,
+                          search_dirs=self.search_dirs(),
+                          never_download=self._options.never_download)
+        if cache is not None:
+            cache.save(key, self._home_dir, site_dir, bin_dir, before)
+
+    def install_requirements(self):
+        """Installs the ``--requirements`` files in a single pip run"""
+        install_requirements(self._py_executable, self._options.requirements,
+                             search_dirs=self.search_dirs(),
+                             never_download=self._options.never_download)
+
+    def site_caches(self):
+        """
+        Returns ``(option, filename, variable, fallback)`` for each cache
+        the environment's site.py writes next to itself when run with
+        ``variable`` set; ``option`` turns it off.
+        """
+        site_dir = os.path.dirname(change_prefix(site_module_filename(),
+                                                 self._home_dir))
+        return [
+            ('path_cache', join(site_dir, 'path-cache.txt'),
+             'VIRTUALENV_WRITE_PATH_CACHE',
+             'interpreter starts will probe every directory'),
+            ('pth_index', join(site_dir, 'pth-index.dat'),
+             'VIRTUALENV_WRITE_PTH_INDEX',
+             'interpreter starts will read every .pth file'),
+            ('module_index', join(site_dir, 'module-index.dat'),
+             'VIRTUALENV_WRITE_MODULE_INDEX',
+             'imports will search every directory of sys.path'),
+        ]
+
+    def write_site_caches(self, names=None, force=True):
+        """
+        Has the environment's site.py write its caches (or those of
+        ``names``), in a single interpreter run:
+
+        ``path-cache.txt``
+            the result of its directory probing, used while the probed
+            directories don't change.  It must be written again after
+            every change.
+
+        ``pth-index.dat``
+            the directories and import lines of the ``.pth`` files of each
+            site directory, replayed while the directory and its ``.pth``
+            files are unchanged.  The interpreter updates it itself.
+
+        ``module-index.dat``
+            where its import finder looks up the directory of each
+            top-level module instead of searching all of ``sys.path``.
+            The interpreter relists the directories it finds changed, so
+            after installing into the base Python this only needs to run
+            again (``--refresh-module-index``) to save that work.
+
+        Unless ``force`` is set only the missing caches, and a path cache
+        whose directories changed, are written; checking takes stat calls
+        only.  Not a manifest phase: the caches record the mtimes of the
+        environment's directories, so they are written last.
+        """
+        extra_env = {}
+        written = []
+        for option, filename, variable, fallback in self.site_caches():
+            if names is not None and option not in names:
+                continue
+            if not getattr(self._options, option, True):
+                self._fs.remove(filename)
+            elif force or self.site_cache_stale(filename):
+                logger.info('Writing %s', filename)
+                extra_env[variable] = '1'
+                written.append((filename, fallback))
+        if not extra_env:
+            return
+        py_executable = self._py_executable or self.py_executable()
+        call_subprocess([py_executable, '-c', 'pass'], show_stdout=False,
+                        extra_env=extra_env)
+        for filename, fallback in written:
+            if not os.path.exists(filename):
+                logger.warn('%s was not written; %s', filename, fallback)
+
+    def site_cache_stale(self, filename):
+        """
+        True if the cache ``filename`` is missing, or is a path cache
+        recording a directory mtime that changed since
+        """
+        try:
+            f = open(filename)
+        except IOError:
+            return True
+        if not filename.endswith('.txt'):
+            f.close()
+            return False
+        try:
+            lines = f.read().split('\n')
+        finally:
+            f.close()
+        for line in lines:
+            parts = line.split('\t')
+            if len(parts) != 3 or parts[0] != 'mtime':
+                continue
+            try:
+                mtime = repr(os.stat(parts[2]).st_mtime)
+            except OSError:
+                mtime = '-'
+            if mtime != parts[1]:
+                return True
+        return False
+
+    def write_module_index(self):
+        """Writes ``module-index.dat`` again; see write_site_caches()"""
+        self.write_site_caches(['module_index'])
+
+    def flatten_eggs(self):
+        """
+        Merges the unzipped eggs of the environment's site-packages into
+        it (see ve.eggs.flatten_eggs()), then brings the manifest and the
+        caches of site.py up to date.
+        """
+        if not flatten_eggs(self._fs, join(self._lib_dir, 'site-packages')):
+            return
+        manifest = Manifest.load(self._home_dir)
+        if manifest is not None:
+            # the moved files are no longer checked, so the phases that
+            # installed them are not run again
+            manifest.refresh()
+            manifest.save()
+        self.write_site_caches()
+
+    def byte_compile(self):
+        """Byte-compiles the environment's own Python files"""
+        byte_compile(self._home_dir)
 
     def install_activate(self):
         home_dir = os.path.abspath(self._home_dir)
-        prompt=self._options.prompt
         if sys.platform == 'win32' or is_jython and os._name == 'nt':
             files = {
-                'activate.bat': ACTIVATE_BAT,
-                'deactivate.bat': DEACTIVATE_BAT,
-                'activate.ps1': ACTIVATE_PS,
+                'activate.bat': get_resource('ACTIVATE_BAT'),
+                'deactivate.bat': get_resource('DEACTIVATE_BAT'),
+                'activate.ps1': get_resource('ACTIVATE_PS'),
             }
 
             # MSYS needs paths of the form /c/path/to/file
@@ -363,29 +732,46 @@ class BasePythonDistribution(object):
             # Run-time conditional enables (basic) Cygwin compatibility
             home_dir_sh = ("""$(if [ "$OSTYPE" "==" "cygwin" ]; then cygpath -u '%s'; else echo '%s'; fi;)""" %
                            (home_dir, home_dir_msys))
-            files['activate'] = ACTIVATE_SH.replace('__VIRTUAL_ENV__', home_dir_sh)
+            files['activate'] = get_resource('ACTIVATE_SH').replace('__VIRTUAL_ENV__', home_dir_sh)
+            files['virtualenv-exec.bat'] = LAUNCHER_BAT
 
         else:
-            files = {'activate': ACTIVATE_SH}
+            files = {'activate': get_resource('ACTIVATE_SH')}
 
             # suppling activate.fish in addition to, not instead of, the
             # bash script support.
-            files['activate.fish'] = ACTIVATE_FISH
+            files['activate.fish'] = get_resource('ACTIVATE_FISH')
 
             # same for csh/tcsh support...
-            files['activate.csh'] = ACTIVATE_CSH
+            files['activate.csh'] = get_resource('ACTIVATE_CSH')
 
-        files['activate_this.py'] = ACTIVATE_THIS
+            files['virtualenv-exec'] = LAUNCHER_SH
+
+        files['activate_this.py'] = get_resource('ACTIVATE_THIS')
+        values = self.activate_values()
+        for name, content in files.items():
+            for placeholder, value in values:
+                content = content.replace(placeholder, value)
+            self._fs.writefile(os.path.join(self._bin_dir, name), content)
+        if 'virtualenv-exec' in files:
+            self._fs.make_exe(os.path.join(self._bin_dir, 'virtualenv-exec'))
+
+    def activate_values(self):
+        """
+        Returns the ``(placeholder, value)`` pairs install_activate()
+        substitutes in the activate scripts, in order; ``virtualenv exec``
+        runs commands with the same values.
+        """
+        home_dir = os.path.abspath(self._home_dir)
         if hasattr(home_dir, 'decode'):
             home_dir = home_dir.decode(sys.getfilesystemencoding())
+        prompt = getattr(self._options, 'prompt', None)
         vname = os.path.basename(home_dir)
-        for name, content in files.items():
-            content = content.replace('__VIRTUAL_PROMPT__', prompt or '')
-            content = content.replace('__VIRTUAL_WINPROMPT__', prompt or '(%s)' % vname)
-            content = content.replace('__VIRTUAL_ENV__', home_dir)
-            content = content.replace('__VIRTUAL_NAME__', vname)
-            content = content.replace('__BIN_NAME__', os.path.basename(self._bin_dir))
-            self._fs.writefile(os.path.join(self._bin_dir, name), content)
+        return [('__VIRTUAL_PROMPT__', prompt or ''),
+                ('__VIRTUAL_WINPROMPT__', prompt or '(%s)' % vname),
+                ('__VIRTUAL_ENV__', home_dir),
+                ('__VIRTUAL_NAME__', vname),
+                ('__BIN_NAME__', os.path.basename(self._bin_dir))]
 
     def platform_specific(self):
         pass
@@ -396,21 +782,17 @@ class BasePythonDistribution(object):
         Python 2.7) need to be given an additional "local" location, sigh.
         """
         home_dir = self._home_dir
-        try:
-            import sysconfig
-        except ImportError:
-            pass
-        else:
-            if sysconfig._get_default_scheme() == 'posix_local':
-                local_path = os.path.join(home_dir, 'local')
-                if not os.path.exists(local_path):
-                    self._fs.mkdir(local_path)
-                    for subdir_name in os.listdir(home_dir):
-                        if subdir_name == 'local':
-                            continue
-                        src = os.path.abspath(os.path.join(home_dir, subdir_name))
-                        dst = os.path.join(local_path, subdir_name)
-                        self._fs.mklink(src,dst)
+        facts = self._probe or interpreter_probe()
+        if facts['scheme'] == 'posix_local':
+            local_path = os.path.join(home_dir, 'local')
+            if not os.path.exists(local_path):
+                self._fs.mkdir(local_path)
+                for subdir_name in os.listdir(home_dir):
+                    if subdir_name == 'local':
+                        continue
+                    src = os.path.abspath(os.path.join(home_dir, subdir_name))
+                    dst = os.path.join(local_path, subdir_name)
+                    self._fs.mklink(src,dst)
 
     def fix_lib64(self):
         """
@@ -418,8 +800,7 @@ class BasePythonDistribution(object):
         instead of lib/pythonX.Y.  If this is such a platform we'll just create a
         symlink so lib64 points to lib
         """
-        if [p for p in distutils.sysconfig.get_config_vars().values()
-            if isinstance(p, basestring) and 'lib64' in p]:
+        if interpreter_probe()['lib64']:
             logger.debug('This system uses lib64; symlinking lib64 to lib')
             assert os.path.basename(self._lib_dir) == 'python%s' % sys.version[:3], (
                 "Unexpected python lib dir: %r" % self._lib_dir)
@@ -430,134 +811,13 @@ class BasePythonDistribution(object):
             target = os.path.join(os.path.dirname(lib_parent), 'lib64')
             self._fs.copyfile(lib_parent, target)
 
-    def copy_required_modules(self):
-        import imp
-        # If we are running under -p, we need to remove the current
-        # directory from sys.path temporarily here, so that we
-        # definitely get the modules from the site directory of
-        # the interpreter we are running under, not the one
-        # virtualenv.py is installed under (which might lead to py2/py3
-        # incompatibility issues)
-        dst_prefix = self._home_dir
-        _prev_sys_path = sys.path
-        if os.environ.get('VIRTUALENV_INTERPRETER_RUNNING'):
-            sys.path = sys.path[1:]
-        try:
-            for modname in ve.REQUIRED_MODULES:
-                if modname in sys.builtin_module_names:
-                    logger.info("Ignoring built-in bootstrap module: %s" % modname)
-                    continue
-                try:
-                    f, filename, _ = imp.find_module(modname)
-                except ImportError:
-                    logger.info("Cannot import bootstrap module: %s" % modname)
-                else:
-                    if f is not None:
-                        f.close()
-                    dst_filename = change_prefix(filename, dst_prefix)
-                    self._fs.copyfile(filename, dst_filename)
-                    if filename.endswith('.pyc'):
-                        pyfile = filename[:-1]
-                        if os.path.exists(pyfile):
-                            self._fs.copyfile(pyfile, dst_filename[:-1])
-        finally:
-            sys.path = _prev_sys_path
-
-    def _install_req(self, py_executable, unzip=False, distribute=False,
-                     search_dirs=None, never_download=False):
+    def list_required_modules(self):
+        return [(filename, change_prefix(filename, self._home_dir))
+                for filename in required_module_files()]
 
-        if search_dirs is None:
-            search_dirs = file_search_dirs()
-
-        if not distribute:
-            setup_fn = 'setuptools-0.6c11-py%s.egg' % sys.version[:3]
-            project_name = 'setuptools'
-            bootstrap_script = EZ_SETUP_PY
-            source = None
-        else:
-            setup_fn = None
-            source = 'distribute-0.6.24.tar.gz'
-            project_name = 'distribute'
-            bootstrap_script = DISTRIBUTE_SETUP_PY
-
-        if setup_fn is not None:
-            setup_fn = _find_file(setup_fn, search_dirs)
-
-        if source is not None:
-            source = _find_file(source, search_dirs)
-
-        if is_jython and os._name == 'nt':
-            # Jython's .bat sys.executable can't handle a command line
-            # argument with newlines
-            fd, ez_setup = tempfile.mkstemp('.py')
-            os.write(fd, bootstrap_script)
-            os.close(fd)
-            cmd = [py_executable, ez_setup]
-        else:
-            cmd = [py_executable, '-c', bootstrap_script]
-        if unzip:
-            cmd.append('--always-unzip')
-        env = {}
-        remove_from_env = []
-        if logger.stdout_level_matches(logger.DEBUG):
-            cmd.append('-v')
-
-        old_chdir = os.getcwd()
-        if setup_fn is not None and os.path.exists(setup_fn):
-            logger.info('Using existing %s egg: %s' % (project_name, setup_fn))
-            cmd.append(setup_fn)
-            if os.environ.get('PYTHONPATH'):
-                env['PYTHONPATH'] = setup_fn + os.path.pathsep + os.environ['PYTHONPATH']
-            else:
-                env['PYTHONPATH'] = setup_fn
-        else:
-            # the source is found, let's chdir
-            if source is not None and os.path.exists(source):
-                logger.info('Using existing %s egg: %s' % (project_name, source))
-                os.chdir(os.path.dirname(source))
-                # in this case, we want to be sure that PYTHONPATH is unset (not
-                # just empty, really unset), else CPython tries to import the
-                # site.py that it's in virtualenv_support
-                remove_from_env.append('PYTHONPATH')
-            else:
-                if never_download:
-                    logger.fatal("Can't find any local distributions of %s to install "
-                                 "and --never-download is set.  Either re-run virtualenv "
-                                 "without the --never-download option, or place a %s "
-                                 "distribution (%s) in one of these "
-                                 "locations: %r" % (project_name, project_name,
-                                                    setup_fn or source,
-                                                    search_dirs))
-                    sys.exit(1)
-
-                logger.info('No %s egg found; downloading' % project_name)
-            cmd.extend(['--always-copy', '-U', project_name])
-        logger.start_progress('Installing %s...' % project_name)
-        logger.indent += 2
-        cwd = None
-        if project_name == 'distribute':
-            env['DONT_PATCH_SETUPTOOLS'] = 'true'
-
-        if not os.access(os.getcwd(), os.W_OK):
-            cwd = tempfile.mkdtemp()
-            if source is not None and os.path.exists(source):
-                # the current working dir is hostile, let's copy the
-                # tarball to a temp dir
-                target = os.path.join(cwd, os.path.split(source)[-1])
-                shutil.copy(source, target)
-        try:
-            call_subprocess(cmd, show_stdout=False,
-                            filter_stdout=_filter_ez_setup,
-                            extra_env=env,
-                            remove_from_env=remove_from_env,
-                            cwd=cwd)
-        finally:
-            logger.indent -= 2
-            logger.end_progress()
-            if os.getcwd() != old_chdir:
-                os.chdir(old_chdir)
-            if is_jython and os._name == 'nt':
-                os.remove(ez_setup)
+    def copy_required_modules(self):
+        self._fs.copyfiles(self.list_required_modules(),
+                           workers=self._options.workers)
 
     def install_distutils(self):
         distutils_path = change_prefix(distutils.__path__[0], self._home_dir)
@@ -567,5 +827,7 @@ class BasePythonDistribution(object):
         ## FIXME: this is breaking things, removing for now:
         #home_dir = os.path.abspath(self._home_dir)
         #distutils_cfg = DISTUTILS_CFG + "\n[install]\nprefix=%s\n" % home_dir
-        self._fs.writefile(join(distutils_path, '__init__.py'), DISTUTILS_INIT)
-        self._fs.writefile(join(distutils_path, 'distutils.cfg'), DISTUTILS_CFG, overwrite=False)
+        self._fs.writefile(join(distutils_path, '__init__.py'),
+                           get_resource('DISTUTILS_INIT'))
+        self._fs.writefile(join(distutils_path, 'distutils.cfg'),
+                           get_resource('DISTUTILS_CFG'), overwrite=False)
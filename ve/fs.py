@@ -1,52 +1,168 @@
+import errno
 import os
 import shutil
 
 from ve import *
 from ve.log import logger
+from ve.utils import run_parallel
+from ve.timing import timings
+
+# The ways a file can be materialized without a symlink, cheapest first
+COPY_STRATEGIES = ['reflink', 'hardlink', 'copy_file_range', 'copy']
+
+# ioctl request to clone a file's extents (linux/fs.h)
+FICLONE = 0x40049409
 
 
 class FileSystemService(object):
 
+    def __init__(self, copy_strategy='auto'):
+        """
+        ``copy_strategy`` is the first of COPY_STRATEGIES to try for files
+        that can't be symlinked; the ones after it are used as fallbacks.
+        ``'auto'`` tries all of them.
+        """
+        if copy_strategy == 'auto':
+            self._strategies = list(COPY_STRATEGIES)
+        else:
+            self._strategies = COPY_STRATEGIES[COPY_STRATEGIES.index(copy_strategy):]
+        # (strategy, src device, dest device) combinations known to fail
+        self._unsupported = set()
+
     def mkdir(self, path):
+        timings.count('mkdir')
         if not os.path.exists(path):
             logger.info('Creating %s', path)
             os.makedirs(path)
         else:
             logger.info('Directory %s already exists', path)
     def mklink(self, src, dst):
+        timings.count('mklink')
         os.symlink(src,dst)
     
     def rmtree(self, *args):
         rmtree(*args)
 
     def copytree(self, *args):
+        timings.count('copytree')
         shutil.copytree(*args)
 
     def copyfile(self, src, dest, **kwds):
         copyfile(src, dest, **kwds)
 
-    def copyfileordir(self, src, dest):
+    def copyfiles(self, pairs, workers=1, **kwds):
+        """
+        Copies (or symlinks) every ``(src, dest)`` pair, running up to
+        ``workers`` copies at once.  See copyfile() for the keywords.
+        """
+        def copy(pair):
+            self.copyfile(pair[0], pair[1], **kwds)
+        run_parallel(copy, pairs, workers)
+
+    def copyfileordir(self, src, dest, hardlink=True):
         if os.path.isdir(src):
             shutil.copytree(src, dest, True)
         else:
-            shutil.copy2(src, dest)
+            self.materialize(src, dest, hardlink)
+
+    def materialize(self, src, dest, hardlink=True):
+        """
+        Makes ``dest`` a real file with the content of ``src``, trying the
+        configured strategies in order until one works.  Without
+        ``hardlink`` the result never shares its inode with ``src``, so
+        either can be changed later without affecting the other.  Returns
+        the name of the strategy used.
+        """
+        # os.link() on a symlink links the symlink itself on some systems
+        src = os.path.realpath(src)
+        src_dev = os.stat(src).st_dev
+        dest_dev = os.stat(os.path.dirname(os.path.abspath(dest))).st_dev
+        for strategy in self._strategies:
+            if strategy == 'hardlink' and not hardlink:
+                continue
+            key = (strategy, src_dev, dest_dev)
+            if key in self._unsupported:
+                continue
+            try:
+                if getattr(self, '_' + strategy)(src, dest, src_dev == dest_dev):
+                    logger.info('Materialized %s with %s', dest, strategy)
+                    return strategy
+            except (IOError, OSError):
+                e = sys.exc_info()[1]
+                logger.debug('Cannot %s %s (%s)', strategy, dest, e)
+                if os.path.lexists(dest):
+                    os.unlink(dest)
+            self._unsupported.add(key)
+        raise OSError('Could not copy %s to %s' % (src, dest))
+
+    def _reflink(self, src, dest, same_device):
+        try:
+            import fcntl
+        except ImportError:
+            return False
+        fsrc = open(src, 'rb')
+        try:
+            fdst = open(dest, 'wb')
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+            finally:
+                fdst.close()
+        finally:
+            fsrc.close()
+        shutil.copystat(src, dest)
+        return True
+
+    def _hardlink(self, src, dest, same_device):
+        if not same_device or not hasattr(os, 'link'):
+            return False
+        os.link(src, dest)
+        return True
+
+    def _copy_file_range(self, src, dest, same_device):
+        if not hasattr(os, 'copy_file_range'):
+            return False
+        fsrc = open(src, 'rb')
+        try:
+            fdst = open(dest, 'wb')
+            try:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(),
+                                                remaining)
+                    if not copied:
+                        break
+                    remaining -= copied
+            finally:
+                fdst.close()
+        finally:
+            fsrc.close()
+        if remaining > 0:
+            # some filesystems report 0 bytes copied instead of failing;
+            # leave the file to the next strategy
+            raise OSError(errno.EIO, 'copy_file_range stopped %s bytes short'
+                          % remaining)
+        shutil.copystat(src, dest)
+        return True
+
+    def _copy(self, src, dest, same_device):
+        shutil.copy2(src, dest)
+        return True
 
     def resolve_link(self, linkname):
         """
         recursively read the link
         """
         file_visited = set()
-        current_dir = os.getcwd()
         while True:
             if not os.path.islink(linkname):
                 return os.path.abspath(linkname)
             else:
                 linkname_path = os.readlink(linkname)
                 if not os.path.isabs(linkname_path):
-                    dirname = os.path.dirname(linkname)
-                    os.chdir(dirname)
-                    linkname = os.path.abspath(linkname_path)
-                    os.chdir(current_dir)
+                    # Resolve against the link's directory without
+                    # chdir, which would race with other copy threads
+                    dirname = os.path.dirname(os.path.abspath(linkname))
+                    linkname = os.path.abspath(os.path.join(dirname, linkname_path))
                 else:
                     linkname = linkname_path
                     
@@ -54,7 +170,14 @@ class FileSystemService(object):
                     raise ValueError("Recursive Links found %s -> %s", file_visited, linkname)
                 file_visited.add(linkname)
 
-    def copyfile(self, src, dest, symlink=True):
+    def copyfile(self, src, dest, symlink=True, hardlink=True):
+        """
+        Symlinks ``src`` to ``dest``, or materializes it when ``symlink``
+        is False or symlinks aren't supported.  Pass ``hardlink=False``
+        for files that are changed in place afterwards, like executables,
+        so the change doesn't reach ``src``.
+        """
+        timings.count('copyfile')
         if not os.path.exists(src):
             # Some bad symlink in the src
             logger.warn('Cannot find file %s (bad symlink)', src)
@@ -64,11 +187,16 @@ class FileSystemService(object):
             if os.path.islink(dest) and not symlink:
                 logger.debug('File %s already exists but is a symlink.', dest)
                 os.unlink(dest)
-                return self.copyfile(src, dest, symlink)
+                return self.copyfile(src, dest, symlink, hardlink)
             return
         if not os.path.exists(os.path.dirname(dest)):
             logger.info('Creating parent directories for %s' % os.path.dirname(dest))
-            os.makedirs(os.path.dirname(dest))
+            try:
+                os.makedirs(os.path.dirname(dest))
+            except OSError:
+                # another copy thread may have created it meanwhile
+                if not os.path.isdir(os.path.dirname(dest)):
+                    raise
 
         srcpath = self.resolve_link(src)
 
@@ -82,7 +210,7 @@ class FileSystemService(object):
             else:
                 logger.debug('Symlink %s found but is incorrect. Will try to fix', dest)
                 os.unlink(dest)
-                return self.copyfile(src, dest, symlink)
+                return self.copyfile(src, dest, symlink, hardlink)
 
         if symlink and hasattr(os, 'symlink') and not is_win:
             logger.info('Symlinking %s to %s', srcpath, dest)
@@ -91,12 +219,13 @@ class FileSystemService(object):
             except (OSError, NotImplementedError):
                 e = sys.exc_info()[1]
                 logger.info('Symlinking failed (%s), copying to %s', str(e), dest)
-                self.copyfileordir(srcpath, dest)
+                self.copyfileordir(srcpath, dest, hardlink)
         else:
             logger.info('Copying to %s', dest)
-            self.copyfileordir(src, dest)
+            self.copyfileordir(srcpath, dest, hardlink)
 
     def writefile(self, dest, content, overwrite=True):
+        timings.count('writefile')
         if not os.path.exists(dest):
             logger.info('Writing %s', dest)
             f = open(dest, 'wb')
@@ -118,7 +247,14 @@ class FileSystemService(object):
             else:
                 logger.info('Content %s already in place', dest)
 
+    def remove(self, path):
+        timings.count('remove')
+        if os.path.exists(path):
+            logger.info('Deleting %s', path)
+            os.unlink(path)
+
     def rmtree(self, dir):
+        timings.count('rmtree')
         if os.path.exists(dir):
             logger.notify('Deleting tree %s', dir)
             shutil.rmtree(dir)
@@ -126,11 +262,16 @@ class FileSystemService(object):
             logger.info('Do not need to delete %s; already gone', dir)
 
     def make_exe(self, fn):
+        timings.count('make_exe')
         if os.path.islink(fn):
             logger.info("Trying to change %s to exe mode but is a link", fn)
             return
         if hasattr(os, 'chmod'):
             oldmode = os.stat(fn).st_mode & 0xFFF # 0o7777
             newmode = (oldmode | 0x16D) & 0xFFF # 0o555, 0o7777
+            if newmode == oldmode:
+                # nothing to do, and a hard linked file may not be ours
+                logger.info('Mode of %s is already %s', fn, oct(newmode))
+                return
             os.chmod(fn, newmode)
             logger.info('Changed mode of %s to %s', fn, oct(newmode))
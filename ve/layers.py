@@ -0,0 +1,66 @@
+import os
+import sys
+
+from ve import *
+from ve.log import logger
+
+
+join = os.path.join
+
+
+class LayerStore(object):
+    """
+    Shared, read-only site-packages trees registered under
+    ``default_storage_dir/layers``.  An environment created with
+    ``--layer NAME`` lists the layer in ``layers.txt`` next to its
+    ``site.py``, which adds it to ``sys.path`` after the environment's own
+    site-packages; nothing is copied into the environment.
+    """
+
+    def __init__(self, fs, storage_dir=None):
+        self._fs = fs
+        self._dir = join(storage_dir or default_storage_dir, 'layers')
+
+    def path(self, name):
+        return join(self._dir, name)
+
+    def has(self, name):
+        return os.path.isdir(self.path(name))
+
+    def names(self):
+        if not os.path.isdir(self._dir):
+            return []
+        names = [name for name in os.listdir(self._dir) if self.has(name)]
+        names.sort()
+        return names
+
+    def register(self, name, source):
+        """
+        Registers the directory ``source`` (a site-packages like tree) as
+        layer ``name``, with a symlink where possible and a copy otherwise.
+        """
+        source = os.path.abspath(source)
+        if not os.path.isdir(source):
+            logger.fatal('Cannot register layer %s: %s is not a directory',
+                         name, source)
+            sys.exit(2)
+        if os.path.lexists(self.path(name)):
+            logger.fatal('A layer named %s is already registered at %s',
+                         name, self.path(name))
+            sys.exit(2)
+        if not os.path.isdir(self._dir):
+            self._fs.mkdir(self._dir)
+        logger.notify('Registering %s as layer %s', source, name)
+        if hasattr(os, 'symlink'):
+            os.symlink(source, self.path(name))
+        else:
+            self._fs.copytree(source, self.path(name))
+
+    def resolve(self, names):
+        """Returns the directories of the layers ``names``, in order"""
+        missing = [name for name in names if not self.has(name)]
+        if missing:
+            logger.fatal('Unknown layer(s): %s (registered: %s)',
+                         ', '.join(missing), ', '.join(self.names()) or 'none')
+            sys.exit(2)
+        return [self.path(name) for name in names]
@@ -1,5 +1,8 @@
 import sys
-import logging
+try:
+    import threading
+except ImportError:
+    import dummy_threading as threading
 
 
 class Logger(object):
@@ -9,16 +12,18 @@ class Logger(object):
     levels, to avoid some redundancy of displayed information.
     """
 
-    DEBUG = logging.DEBUG
-    INFO = logging.INFO
-    NOTIFY = (logging.INFO + logging.WARN) / 2
-    WARN = WARNING = logging.WARN
-    ERROR = logging.ERROR
-    FATAL = logging.FATAL
+    # The levels of the logging module, which isn't imported just for them
+    DEBUG = 10
+    INFO = 20
+    NOTIFY = (INFO + 30) / 2
+    WARN = WARNING = 30
+    ERROR = 40
+    FATAL = 50
 
     LEVELS = [DEBUG, INFO, NOTIFY, WARN, ERROR, FATAL]
 
     def __init__(self, consumers):
+        self._local = threading.local()
         self.init(consumers)
 
     def init(self, consumers):
@@ -44,6 +49,10 @@ class Logger(object):
             if kw:
                 raise TypeError(
                     "You may give positional or keyword arguments, not both")
+        captured = getattr(self._local, 'captured', None)
+        if captured is not None:
+            captured.append((level, msg, args or kw))
+            return
         args = args or kw
         rendered = None
         for consumer_level, consumer in self.consumers:
@@ -64,6 +73,29 @@ class Logger(object):
                 else:
                     consumer(rendered)
 
+    def start_capture(self):
+        """
+        Collects the messages logged from the current thread instead of
+        writing them out, until end_capture() is called.
+        """
+        self._local.captured = []
+
+    def end_capture(self):
+        """
+        Stops capturing for the current thread and returns the collected
+        messages, ready to be passed to replay().
+        """
+        captured = self._local.captured
+        self._local.captured = None
+        return captured
+
+    def replay(self, captured):
+        for level, msg, args in captured:
+            if isinstance(args, dict):
+                self.log(level, msg, **args)
+            else:
+                self.log(level, msg, *args)
+
     def start_progress(self, msg):
         assert not self.in_progress, (
             "Tried to start_progress(%r) while in_progress %r"
@@ -1,3 +1,4 @@
+import re
 import ve
 from ve.unix import UnixDistribution
 from ve.utils import *
@@ -34,7 +35,8 @@ class DarwinDistribution(UnixDistribution):
             if 'EPD' in prefix:
                 logger.debug('EPD framework detected')
                 original_python = os.path.join(prefix, 'bin/python')
-            self._fs.copyfile(original_python, py_executable)
+            # install_name_tool edits it in place below
+            self._fs.copyfile(original_python, py_executable, hardlink=False)
 
             # Copy the framework's dylib into the virtual
             # environment
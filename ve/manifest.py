@@ -0,0 +1,293 @@
+import os
+import sys
+try:
+    import json
+except ImportError:
+    json = None
+
+try:
+    from hashlib import sha1
+except ImportError:
+    from sha import new as sha1
+
+from ve import *
+from ve.log import logger
+
+
+join = os.path.join
+
+
+def file_hash(filename):
+    h = sha1()
+    f = open(filename, 'rb')
+    try:
+        while True:
+            chunk = f.read(65536)
+            if not chunk:
+                break
+            h.update(chunk)
+    finally:
+        f.close()
+    return h.hexdigest()
+
+
+def content_hash(content):
+    return sha1(content.encode('utf-8')).hexdigest()
+
+
+class Manifest(object):
+    """
+    Records the size, mtime and content hash of every artifact of an
+    environment, grouped by the creation phase that produced it, in
+    ``virtualenv-manifest.json`` at the top of the environment.
+
+    When virtualenv runs again on the same environment the planned
+    operations and install phases are checked against the manifest with
+    stat calls only, and just the ones whose artifacts changed are run.
+    Paths are kept relative to the environment, so an environment cloned
+    from a template only has to refresh() the stats of its copy.
+    """
+
+    filename = 'virtualenv-manifest.json'
+
+    # Written by the environment's site.py whenever it likes (and by
+    # virtualenv after the phases), so never an artifact of a phase
+    untracked = ('path-cache.txt', 'pth-index.dat', 'module-index.dat')
+
+    def __init__(self, home_dir, data=None):
+        self._home_dir = os.path.abspath(home_dir)
+        if data is None:
+            data = {'files': {}, 'phases': {}}
+        self._files = data['files']
+        self._phases = data['phases']
+
+    def load(cls, home_dir):
+        """Returns the Manifest of ``home_dir``, or None if it has none"""
+        if json is None:
+            return None
+        filename = join(home_dir, cls.filename)
+        try:
+            f = open(filename)
+        except IOError:
+            return None
+        try:
+            try:
+                data = json.load(f)
+            except ValueError:
+                logger.warn('Ignoring unreadable manifest %s', filename)
+                return None
+        finally:
+            f.close()
+        logger.info('Checking environment against %s', filename)
+        return cls(home_dir, data)
+
+    load = classmethod(load)
+
+    def save(self):
+        if json is None:
+            return
+        filename = join(self._home_dir, self.filename)
+        logger.info('Writing %s', filename)
+        f = open(filename, 'w')
+        try:
+            json.dump({'files': self._files, 'phases': self._phases}, f,
+                      indent=1, sort_keys=True)
+        finally:
+            f.close()
+
+    def relpath(self, path):
+        path = os.path.abspath(path)
+        if path == self._home_dir:
+            return '.'
+        return path[len(self._home_dir) + 1:]
+
+    def unchanged(self, path):
+        """
+        Returns the recorded entry of ``path`` if a stat shows it still
+        has the recorded size and mtime, else None.
+        """
+        entry = self._files.get(self.relpath(path))
+        if entry is None:
+            return None
+        try:
+            st = os.lstat(path)
+        except OSError:
+            return None
+        if st.st_size != entry['size'] or st.st_mtime != entry['mtime']:
+            return None
+        return entry
+
+    def record(self, path, phase, content=None, src=None):
+        """
+        Records the current state of ``path`` as produced by ``phase``.
+        ``content`` (for written files) saves reading the file back to
+        hash it; ``src`` is the file it was copied or linked from.
+        """
+        try:
+            st = os.lstat(path)
+        except OSError:
+            self._files.pop(self.relpath(path), None)
+            return
+        entry = {'size': st.st_size, 'mtime': st.st_mtime,
+                 'mode': st.st_mode, 'phase': phase}
+        if os.path.islink(path):
+            entry['link'] = os.readlink(path)
+        elif content is not None:
+            entry['sha1'] = content_hash(content)
+        elif os.path.isfile(path):
+            entry['sha1'] = file_hash(path)
+        if src is not None:
+            entry['src'] = src
+            try:
+                src_st = os.stat(src)
+            except OSError:
+                pass
+            else:
+                entry['src_size'] = src_st.st_size
+                entry['src_mtime'] = src_st.st_mtime
+        self._files[self.relpath(path)] = entry
+
+    def up_to_date(self, op):
+        """True if the result of a planned operation is still in place"""
+        if op.name in ('remove', 'rmtree'):
+            return not os.path.lexists(op.dest)
+        if op.name == 'mkdir':
+            return os.path.isdir(op.dest)
+        entry = self.unchanged(op.dest)
+        if entry is None:
+            return False
+        if op.name == 'writefile':
+            return entry.get('sha1') == content_hash(op.content)
+        if op.name == 'copyfile':
+            if entry.get('src') != op.src:
+                return False
+            if 'link' in entry:
+                return True
+            try:
+                src_st = os.stat(op.src)
+            except OSError:
+                return False
+            return (src_st.st_size == entry.get('src_size')
+                    and src_st.st_mtime == entry.get('src_mtime'))
+        if op.name == 'make_exe':
+            return bool(entry['mode'] & 0x49)  # 0o111
+        return True
+
+    def filter(self, plan, clear=False):
+        """
+        Drops the operations of ``plan`` whose results are unchanged.
+        Clearing the environment is dropped too unless ``clear`` is set,
+        since it would remove the artifacts the manifest vouches for.
+        """
+        kept = []
+        for op in plan.operations:
+            if op.name == 'rmtree' and op.phase == 'clear':
+                if clear:
+                    kept.append(op)
+                    self._files.clear()
+                    self._phases.clear()
+                continue
+            if not self.up_to_date(op):
+                kept.append(op)
+        logger.info('%s of %s planned operations are up to date',
+                    len(plan.operations) - len(kept), len(plan.operations))
+        plan.operations = kept
+
+    def record_plan(self, plan):
+        for op in plan.operations:
+            if op.name in ('remove', 'rmtree'):
+                self.forget(op.dest)
+            elif op.name == 'make_exe':
+                entry = self._files.get(self.relpath(op.dest))
+                if entry is not None and os.path.lexists(op.dest):
+                    entry['mode'] = os.lstat(op.dest).st_mode
+            else:
+                self.record(op.dest, op.phase,
+                            content=getattr(op, 'content', None),
+                            src=getattr(op, 'src', None))
+
+    def forget(self, path):
+        rel = self.relpath(path)
+        for name in list(self._files.keys()):
+            if name == rel or name.startswith(rel + os.sep):
+                del self._files[name]
+
+    def phase_up_to_date(self, phase, signature):
+        """
+        True if ``phase`` last ran with the same ``signature`` and all the
+        files it produced are unchanged.
+        """
+        if self._phases.get(phase) != signature:
+            return False
+        for name, entry in self._files.items():
+            if entry['phase'] == phase and self.tracked(name):
+                if self.unchanged(join(self._home_dir, name)) is None:
+                    return False
+        return True
+
+    def forget_phase(self, phase):
+        self._phases.pop(phase, None)
+
+    def tracked(self, name):
+        """
+        False for the byte-code and the caches of site.py, which are
+        rewritten whenever the interpreter likes, so never recorded
+        """
+        if name.endswith('.pyc') or name.endswith('.pyo') or '__pycache__' in name:
+            return False
+        basename = os.path.basename(name)
+        for untracked in self.untracked:
+            # including the temporary files they are written to
+            if basename == untracked or basename.startswith(untracked + '.'):
+                return False
+        return True
+
+    def snapshot(self):
+        """
+        Returns ``{relpath: (size, mtime)}`` for the whole environment,
+        leaving out what isn't tracked
+        """
+        result = {}
+        for dirpath, dirnames, filenames in os.walk(self._home_dir):
+            for name in dirnames + filenames:
+                if not self.tracked(name):
+                    continue
+                path = join(dirpath, name)
+                try:
+                    st = os.lstat(path)
+                except OSError:
+                    continue
+                result[self.relpath(path)] = (st.st_size, st.st_mtime)
+        return result
+
+    def record_changes(self, before, phase, signature):
+        """
+        Records every path that is new or changed since the ``before``
+        snapshot as produced by ``phase``.
+        """
+        after = self.snapshot()
+        for name, state in after.items():
+            if before.get(name) != state:
+                path = join(self._home_dir, name)
+                if os.path.isdir(path) and not os.path.islink(path):
+                    continue
+                self.record(path, phase)
+        self._phases[phase] = signature
+
+    def refresh(self):
+        """
+        Re-stats every recorded file, keeping the phases they belong to;
+        files that are no longer tracked are dropped
+        """
+        for name, entry in list(self._files.items()):
+            if not self.tracked(name):
+                del self._files[name]
+                continue
+            path = join(self._home_dir, name)
+            try:
+                st = os.lstat(path)
+            except OSError:
+                del self._files[name]
+                continue
+            if (st.st_size, st.st_mtime) != (entry['size'], entry['mtime']):
+                self.record(path, entry['phase'], src=entry.get('src'))
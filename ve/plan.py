@@ -0,0 +1,327 @@
+import os
+import sys
+
+from ve import *
+from ve.log import logger
+from ve.utils import run_parallel
+from ve.timing import timings
+
+
+def _overlaps(path, other):
+    """True if one of the paths is the other or lies inside it"""
+    return (path == other or path.startswith(other + os.sep)
+            or other.startswith(path + os.sep))
+
+
+def _tree_size(path):
+    if os.path.islink(path) or not os.path.isdir(path):
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+    size = 0
+    for dirpath, dirnames, filenames in os.walk(path):
+        for fn in filenames:
+            try:
+                size += os.path.getsize(os.path.join(dirpath, fn))
+            except OSError:
+                pass
+    return size
+
+
+class Operation(object):
+    """
+    A single filesystem change in a Plan.  ``apply()`` performs it through
+    a FileSystemService; ``cost()`` estimates it without touching the disk
+    (besides stat calls on the sources).
+    """
+
+    name = None
+    # Whether the operation creates ``dest``, so its parent directory has
+    # to exist before it is applied.
+    creates = True
+
+    def __init__(self, dest):
+        self.dest = dest
+        self.phase = None
+        self.depends = []
+        self.level = 0
+
+    def key(self):
+        return (self.name, self.dest)
+
+    def reads(self):
+        return []
+
+    def writes(self):
+        return [self.dest]
+
+    def apply(self, fs):
+        raise NotImplementedError
+
+    def cost(self):
+        """Returns an estimate of (filesystem calls, bytes written)"""
+        return 2, 0
+
+    def describe(self):
+        return '%s %s' % (self.name, self.dest)
+
+
+class MkDir(Operation):
+    name = 'mkdir'
+
+    def apply(self, fs):
+        fs.mkdir(self.dest)
+
+
+class CopyFile(Operation):
+    name = 'copyfile'
+
+    def __init__(self, src, dest, symlink=True, hardlink=True):
+        super(CopyFile, self).__init__(dest)
+        self.src = src
+        self.symlink = symlink
+        self.hardlink = hardlink
+
+    def key(self):
+        return (self.name, self.dest, self.src, self.symlink, self.hardlink)
+
+    def reads(self):
+        return [self.src]
+
+    def apply(self, fs):
+        fs.copyfile(self.src, self.dest, symlink=self.symlink,
+                    hardlink=self.hardlink)
+
+    def cost(self):
+        if self.symlink and hasattr(os, 'symlink') and not is_win:
+            return 5, 0
+        size = _tree_size(self.src)
+        # open, fstat, read/write per 16k block, close, utime and chmod
+        return 8 + 2 * (size // 16384 + 1), size
+
+    def describe(self):
+        if self.symlink:
+            return 'symlink %s -> %s' % (self.dest, self.src)
+        return 'copy %s -> %s' % (self.src, self.dest)
+
+
+class WriteFile(Operation):
+    name = 'writefile'
+
+    def __init__(self, dest, content, overwrite=True):
+        super(WriteFile, self).__init__(dest)
+        self.content = content
+        self.overwrite = overwrite
+
+    def key(self):
+        return (self.name, self.dest, self.content, self.overwrite)
+
+    def apply(self, fs):
+        fs.writefile(self.dest, self.content, overwrite=self.overwrite)
+
+    def cost(self):
+        return 4, len(self.content.encode('utf-8'))
+
+    def describe(self):
+        return 'write %s (%s bytes)' % (self.dest, len(self.content))
+
+
+class MakeExe(Operation):
+    name = 'make_exe'
+    creates = False
+
+    def apply(self, fs):
+        fs.make_exe(self.dest)
+
+    def cost(self):
+        return 3, 0
+
+
+class Remove(Operation):
+    name = 'remove'
+    creates = False
+
+    def apply(self, fs):
+        fs.remove(self.dest)
+
+
+class RmTree(Operation):
+    name = 'rmtree'
+    creates = False
+
+    def apply(self, fs):
+        fs.rmtree(self.dest)
+
+    def cost(self):
+        calls = 1
+        for dirpath, dirnames, filenames in os.walk(self.dest):
+            calls += 2 + len(filenames)
+        return calls, 0
+
+
+class Plan(object):
+    """
+    An ordered list of filesystem operations that lay out an environment.
+
+    A Plan stands in for a FileSystemService while the distribution
+    decides what to do: the calls are recorded as operations instead of
+    being performed.  Every operation depends on the earlier ones that
+    touch the same paths (or paths inside each other); repeating an
+    operation that is already the latest change to its paths is dropped.
+    """
+
+    def __init__(self, fs):
+        self._fs = fs
+        self._phase = None
+        self.operations = []
+        self.duplicates = 0
+
+    def phase(self, name):
+        """Tags the operations added from now on with the phase ``name``"""
+        self._phase = name
+
+    def add(self, op):
+        paths = [os.path.abspath(p) for p in op.reads() + op.writes()]
+        written = [os.path.abspath(p) for p in op.writes()]
+        depends = []
+        for prev in self.operations:
+            prev_paths = prev._paths
+            if ([p for p in written for q in prev_paths if _overlaps(p, q)]
+                or [p for p in paths for q in prev._written if _overlaps(p, q)]):
+                depends.append(prev)
+        if depends and depends[-1].key() == op.key():
+            logger.debug('Dropping duplicate operation: %s', op.describe())
+            self.duplicates += 1
+            return
+        op._paths = paths
+        op._written = written
+        op.phase = self._phase
+        op.depends = depends
+        for prev in depends:
+            op.level = max(op.level, prev.level + 1)
+        self.operations.append(op)
+
+    def schedule(self):
+        """
+        Returns ``[(phase, [operations, ...]), ...]``: the phases in the
+        order they were planned, each split into groups of operations
+        that do not depend on each other and may run at the same time.
+        """
+        phases = []
+        levels = {}
+        for op in self.operations:
+            if op.phase not in levels:
+                phases.append(op.phase)
+                levels[op.phase] = {}
+            levels[op.phase].setdefault(op.level, []).append(op)
+        result = []
+        for phase in phases:
+            groups = levels[phase]
+            keys = list(groups.keys())
+            keys.sort()
+            result.append((phase, [groups[k] for k in keys]))
+        return result
+
+    def cost(self):
+        """Returns the estimated (filesystem calls, bytes written)"""
+        calls = size = 0
+        for op in self.operations:
+            op_calls, op_size = op.cost()
+            calls += op_calls
+            size += op_size
+        return calls, size
+
+    def report(self):
+        """Logs the plan and its estimated cost"""
+        logger.notify('Planned %s filesystem operations (%s duplicates dropped)',
+                      len(self.operations), self.duplicates)
+        logger.indent += 2
+        try:
+            for phase, groups in self.schedule():
+                ops = []
+                for group in groups:
+                    ops.extend(group)
+                counts = {}
+                for op in ops:
+                    counts[op.name] = counts.get(op.name, 0) + 1
+                names = list(counts.keys())
+                names.sort()
+                logger.notify('%s: %s operations in %s steps (%s)', phase,
+                              len(ops), len(groups),
+                              ', '.join(['%s %s' % (counts[n], n) for n in names]))
+                logger.indent += 2
+                for op in ops:
+                    logger.info(op.describe())
+                logger.indent -= 2
+        finally:
+            logger.indent -= 2
+        calls, size = self.cost()
+        logger.notify('Estimated cost: about %s filesystem calls, %s bytes written',
+                      calls, size)
+
+    # FileSystemService interface, recording instead of acting
+
+    def mkdir(self, path):
+        self.add(MkDir(path))
+
+    def copyfile(self, src, dest, symlink=True, hardlink=True):
+        self.add(CopyFile(src, dest, symlink, hardlink))
+
+    def copyfiles(self, pairs, workers=1, **kwds):
+        for src, dest in pairs:
+            self.copyfile(src, dest, **kwds)
+
+    def writefile(self, dest, content, overwrite=True):
+        self.add(WriteFile(dest, content, overwrite))
+
+    def make_exe(self, fn):
+        self.add(MakeExe(fn))
+
+    def remove(self, path):
+        self.add(Remove(path))
+
+    def rmtree(self, dir):
+        self.add(RmTree(dir))
+
+    def resolve_link(self, linkname):
+        return self._fs.resolve_link(linkname)
+
+
+class PlanExecutor(object):
+    """
+    Applies a Plan through a FileSystemService, phase by phase.  The
+    independent operations of each step run on up to ``workers``
+    threads; their parent directories are created once per step
+    beforehand.
+    """
+
+    def __init__(self, fs, workers=1):
+        self._fs = fs
+        self._workers = workers
+
+    def execute(self, plan):
+        for phase, groups in plan.schedule():
+            timings.timed(phase, self.execute_phase, phase, groups)
+
+    def execute_phase(self, phase, groups):
+        logger.debug('Running %s', phase)
+        for group in groups:
+            self.make_parents(group)
+            run_parallel(self.apply, group, self._workers)
+
+    def apply(self, op):
+        op.apply(self._fs)
+
+    def make_parents(self, group):
+        seen = set()
+        for op in group:
+            if not op.creates:
+                continue
+            parent = os.path.dirname(os.path.abspath(op.dest))
+            if parent in seen:
+                continue
+            seen.add(parent)
+            if not os.path.exists(parent):
+                logger.info('Creating %s', parent)
+                os.makedirs(parent)
@@ -0,0 +1,140 @@
+import os
+import sys
+try:
+    import json
+except ImportError:
+    json = None
+
+from ve import *
+from ve.log import logger, Logger
+from ve.cache import interpreter_cache
+from ve.utils import call_subprocess
+
+
+# Bump when PROBE_SCRIPT reports something new, so cached probes of an
+# older version are not used.
+PROBE_VERSION = 1
+
+# Runs in the probed interpreter, either in-process through exec() or as
+# ``python -c`` with the result written to stdout: as JSON, or as the
+# repr() of the dict where json is missing (Python 2.5).  It has to work
+# unchanged on every Python virtualenv supports.
+PROBE_SCRIPT = '''
+import sys, os
+
+def probe():
+    facts = {
+        'executable': sys.executable,
+        'prefix': os.path.abspath(sys.prefix),
+        'exec_prefix': os.path.abspath(sys.exec_prefix),
+        'real_prefix': getattr(sys, 'real_prefix', None),
+        'version': list(sys.version_info[:3]),
+        'abiflags': getattr(sys, 'abiflags', ''),
+        'platform': sys.platform,
+        'lib64': False,
+        'scheme': None,
+        'site_packages': None,
+        'user_site': None,
+    }
+    try:
+        import distutils.sysconfig
+    except ImportError:
+        pass
+    else:
+        for value in distutils.sysconfig.get_config_vars().values():
+            if isinstance(value, str) and 'lib64' in value:
+                facts['lib64'] = True
+                break
+        facts['site_packages'] = distutils.sysconfig.get_python_lib()
+    try:
+        import sysconfig
+    except ImportError:
+        pass
+    else:
+        get_scheme = getattr(sysconfig, 'get_default_scheme', None)
+        if get_scheme is None:
+            get_scheme = getattr(sysconfig, '_get_default_scheme', None)
+        if get_scheme is not None:
+            facts['scheme'] = get_scheme()
+    try:
+        import site
+        facts['user_site'] = getattr(site, 'USER_SITE', None)
+    except ImportError:
+        pass
+    return facts
+
+if __name__ == '__main__':
+    try:
+        import json
+    except ImportError:
+        output = repr(probe())
+    else:
+        output = json.dumps(probe())
+    out = sys.stdout
+    getattr(out, 'buffer', out).write(output.encode('ascii', 'backslashreplace'))
+'''
+
+
+def run_probe():
+    """Returns the facts about the running interpreter"""
+    namespace = {'__name__': 've_probe'}
+    exec(compile(PROBE_SCRIPT, '<probe>', 'exec'), namespace)
+    return namespace['probe']()
+
+
+def interpreter_probe():
+    """
+    Returns the facts about the running interpreter, from the interpreter
+    cache when it already has them.
+    """
+    cache = interpreter_cache()
+    entry = cache.get('probe')
+    if entry and entry.get('version') == PROBE_VERSION:
+        return entry['facts']
+    facts = run_probe()
+    cache.set('probe', {'version': PROBE_VERSION, 'facts': facts})
+    return facts
+
+
+def _filter_probe(line):
+    return Logger.DEBUG
+
+
+def probe_executable(py_executable):
+    """
+    Runs PROBE_SCRIPT with ``py_executable`` and returns the facts it
+    reports, as a dict.
+    """
+    if sys.platform == 'win32' and ' ' in py_executable:
+        # There's a bug with subprocess on Windows when using a first
+        # argument that has a space in it.  Instead we have to quote
+        # the value:
+        py_executable = '"%s"' % py_executable
+    cmd = [py_executable, '-c', PROBE_SCRIPT]
+    logger.info('Probing executable %s', py_executable)
+    output = ''.join(call_subprocess(
+        cmd, show_stdout=False, filter_stdout=_filter_probe))
+    try:
+        return parse_probe_output(output)
+    except (ValueError, SyntaxError):
+        logger.fatal('ERROR: Unreadable output from %s: %r',
+                     py_executable, output)
+        raise
+
+
+def parse_probe_output(output):
+    """
+    Returns the facts PROBE_SCRIPT wrote: JSON, or the repr() of a dict
+    from an interpreter without json, which is read as a literal only.
+    """
+    if json is None:
+        # Python 2.5 has neither json nor ast.literal_eval; both outputs
+        # are Python literals with these names, and nothing can be called
+        return eval(output.strip(), {'__builtins__': {}},
+                    {'None': None, 'True': True, 'False': False,
+                     'null': None, 'true': True, 'false': False})
+    try:
+        return json.loads(output)
+    except ValueError:
+        from ast import literal_eval
+        return literal_eval(output.strip())
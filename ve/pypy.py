@@ -1,4 +1,4 @@
-from environment import BasePythonDistribution
+from ve.environment import BasePythonDistribution
 
 class PyPyDistribution(BasePythonDistribution):
 
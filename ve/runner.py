@@ -0,0 +1,64 @@
+import os
+import sys
+
+
+# bin/virtualenv-exec: what bin/activate does for a single command, in a
+# shell that starts faster than an interactive one and parses nothing
+# else.  The placeholders are those of the activate scripts.
+LAUNCHER_SH = '''#!/bin/sh
+# Runs a command in this environment without sourcing bin/activate:
+#   virtualenv-exec COMMAND [ARGS...]
+VIRTUAL_ENV="__VIRTUAL_ENV__"
+PATH="$VIRTUAL_ENV/__BIN_NAME__:$PATH"
+export VIRTUAL_ENV PATH
+unset PYTHONHOME
+exec "$@"
+'''
+
+LAUNCHER_BAT = '''@echo off
+rem Runs a command in this environment without activate.bat:
+rem   virtualenv-exec COMMAND [ARGS...]
+setlocal
+set "VIRTUAL_ENV=__VIRTUAL_ENV__"
+set "PATH=%VIRTUAL_ENV%\\__BIN_NAME__;%PATH%"
+set PYTHONHOME=
+%*
+exit /b %ERRORLEVEL%
+'''
+
+
+def activation_environ(virtual_env, bin_name, environ=None):
+    """
+    Returns a copy of ``environ`` (``os.environ`` by default) with the
+    changes the activate scripts make for the environment
+    ``virtual_env`` with its scripts in ``bin_name``; the prompt is left
+    alone, nothing interactive runs in it.
+    """
+    if environ is None:
+        environ = os.environ
+    environ = dict(environ)
+    environ['VIRTUAL_ENV'] = virtual_env
+    path = os.path.join(virtual_env, bin_name)
+    if environ.get('PATH'):
+        path += os.pathsep + environ['PATH']
+    environ['PATH'] = path
+    environ.pop('PYTHONHOME', None)
+    return environ
+
+
+def exec_command(virtual_env, bin_name, argv, environ=None):
+    """
+    Replaces this process with ``argv`` run in the environment
+    ``virtual_env``, looking the command up on the environment's ``PATH``.
+    Windows has no exec, so there the command runs as a child process
+    whose exit status is passed on.
+    """
+    environ = activation_environ(virtual_env, bin_name, environ)
+    if sys.platform == 'win32':
+        import subprocess
+        sys.exit(subprocess.call(argv, env=environ, shell=True))
+    try:
+        os.execvpe(argv[0], argv, environ)
+    except OSError:
+        sys.stderr.write('Cannot run %s: %s\n' % (argv[0], sys.exc_info()[1]))
+        sys.exit(127)
@@ -0,0 +1,177 @@
+import os
+import re
+import sys
+
+try:
+    from hashlib import sha1
+except ImportError:
+    from sha import new as sha1
+
+from ve import *
+from ve.log import logger
+from ve.archives import archive_hash
+from ve.manifest import Manifest, file_hash
+
+
+join = os.path.join
+
+# Options that change the contents of a finished environment; two
+# creations may only share a template when all of these agree.
+TEMPLATE_OPTIONS = ['system_site_packages', 'use_distribute',
+                    'unzip_setuptools', 'prompt', 'search_dirs', 'layers',
+                    'compile']
+
+
+def prefix_pattern(prefix):
+    """
+    Returns a regular expression (of bytes) matching ``prefix`` where it
+    is a whole path or the start of one: followed by a path separator, a
+    quote, whitespace or the end of a line.  ``/env`` does not match the
+    start of ``/env2`` or ``/env-old``.
+    """
+    seps = re.escape(os.sep + (os.altsep or ''))
+    end = '(?=[%s\'"\\s]|$)' % seps
+    return re.compile(re.escape(prefix.encode('utf-8')) + end.encode('ascii'),
+                      re.MULTILINE)
+
+
+def replace_prefix_in_file(filename, old_prefix, new_prefix):
+    """
+    Replaces the paths starting with ``old_prefix`` in a text file with
+    the same paths under ``new_prefix`` (see prefix_pattern()).  Binary
+    files (like the copied interpreter) are left alone.  Returns True if
+    the file was changed.
+    """
+    f = open(filename, 'rb')
+    try:
+        content = f.read()
+    finally:
+        f.close()
+    if '\0'.encode('ascii') in content:
+        return False
+    new = new_prefix.encode('utf-8')
+    new_content, count = prefix_pattern(old_prefix).subn(lambda m: new, content)
+    if not count:
+        return False
+    logger.debug('Rewriting prefix in %s', filename)
+    f = open(filename, 'wb')
+    try:
+        f.write(new_content)
+    finally:
+        f.close()
+    return True
+
+
+def replace_prefix_in_link(filename, old_prefix, new_prefix):
+    """
+    Re-points an absolute symlink into ``old_prefix`` at the same place
+    under ``new_prefix``.  Returns True if the link was changed.
+    """
+    target = os.readlink(filename)
+    if target != old_prefix and not target.startswith(old_prefix + os.sep):
+        return False
+    new_target = new_prefix + target[len(old_prefix):]
+    logger.debug('Re-linking %s to %s', filename, new_target)
+    os.unlink(filename)
+    os.symlink(new_target, filename)
+    return True
+
+
+class TemplateStore(object):
+    """
+    Keeps finished environments under ``default_storage_dir`` so later
+    creations with the same interpreter and options can clone them
+    instead of running the whole install sequence again.
+    """
+
+    def __init__(self, fs, storage_dir=None):
+        self._fs = fs
+        self._dir = join(storage_dir or default_storage_dir, 'templates')
+
+    def key(self, options, archives=None):
+        """
+        Returns the template key for the running interpreter (path and
+        mtime), the given options and the packaging ``archives`` the
+        environment is installed from.  The virtualenv version and the
+        embedded files (site.py, activate scripts...) are part of it, so
+        an upgraded virtualenv doesn't clone a template of the old one.
+        """
+        executable = os.path.realpath(sys.executable)
+        parts = [executable, repr(os.stat(executable).st_mtime), sys.prefix,
+                 virtualenv_version, resources_hash()]
+        for name in TEMPLATE_OPTIONS:
+            parts.append('%s=%r' % (name, getattr(options, name, None)))
+        for filename in getattr(options, 'requirements', None) or []:
+            parts.append('requirements=%s' % file_hash(filename))
+        for archive in archives or []:
+            parts.append('%s %s' % (os.path.basename(archive),
+                                    archive_hash(archive)))
+        return sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def path(self, key):
+        return join(self._dir, key)
+
+    def has(self, key):
+        return os.path.exists(join(self.path(key), 'prefix.txt'))
+
+    def save(self, key, home_dir):
+        """
+        Stores the environment at ``home_dir`` as the template for ``key``.
+        The copy is made next to its final location and renamed into
+        place, so concurrent creations never see half a template.
+        """
+        if self.has(key):
+            logger.info('Template %s already stored', key)
+            return
+        home_dir = os.path.abspath(home_dir)
+        tmp_dir = '%s.tmp-%s' % (self.path(key), os.getpid())
+        logger.notify('Saving environment as template %s', key)
+        self._fs.rmtree(tmp_dir)
+        self._fs.copytree(home_dir, join(tmp_dir, 'env'), True)
+        self._fs.writefile(join(tmp_dir, 'prefix.txt'), home_dir)
+        try:
+            os.rename(tmp_dir, self.path(key))
+        except OSError:
+            # Another process stored the same template first
+            logger.info('Template %s appeared while saving; discarding copy', key)
+            self._fs.rmtree(tmp_dir)
+
+    def clone(self, key, home_dir):
+        """
+        Copies the template for ``key`` to ``home_dir`` and rewrites the
+        references to the template's absolute prefix: scripts, activate
+        files, ``orig-prefix.txt``, ``.pth``/``.egg-link`` files and
+        symlinks into the environment.  The caches of site.py, which list
+        the template's directories, are dropped; the environment writes
+        them again.
+        """
+        f = open(join(self.path(key), 'prefix.txt'))
+        try:
+            old_prefix = f.read().strip()
+        finally:
+            f.close()
+        new_prefix = os.path.abspath(home_dir)
+        logger.notify('Cloning template %s into %s', key, home_dir)
+        self._fs.copytree(join(self.path(key), 'env'), home_dir, True)
+        self.relocate(new_prefix, old_prefix)
+
+    def relocate(self, home_dir, old_prefix):
+        count = 0
+        for dirpath, dirnames, filenames in os.walk(home_dir):
+            for name in dirnames + filenames:
+                filename = join(dirpath, name)
+                if os.path.islink(filename):
+                    if replace_prefix_in_link(filename, old_prefix, home_dir):
+                        count += 1
+                elif name in Manifest.untracked:
+                    self._fs.remove(filename)
+                elif name in filenames and self.should_relocate(dirpath, name):
+                    if replace_prefix_in_file(filename, old_prefix, home_dir):
+                        count += 1
+        logger.info('Rewrote %s references to %s', count, old_prefix)
+
+    def should_relocate(self, dirpath, name):
+        if os.path.basename(dirpath) in ('bin', 'Scripts'):
+            return True
+        return (name == 'orig-prefix.txt' or name.endswith('.pth')
+                or name.endswith('.egg-link'))
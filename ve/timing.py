@@ -0,0 +1,127 @@
+import os
+import time
+try:
+    import threading
+except ImportError:
+    import dummy_threading as threading
+
+from ve.log import logger
+
+
+def _cpu_times():
+    """Returns (user, system, children user, children system) CPU seconds"""
+    if hasattr(os, 'times'):
+        return os.times()[:4]
+    return (time.clock(), 0.0, 0.0, 0.0)
+
+
+class Timings(object):
+    """
+    Collects the wall-clock time, CPU time and the number of filesystem
+    operations and subprocesses of each phase of an environment creation.
+
+    Phases run one after another; everything counted while a phase is
+    running is attributed to it.  The filesystem and subprocess helpers
+    call ``count()`` unconditionally, which costs a dict update.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.phases = []
+        self._counts = {}
+        self._phase = None
+        self._started = time.time()
+        self._start_cpu = _cpu_times()
+
+    def count(self, name, n=1):
+        self._lock.acquire()
+        try:
+            self._counts[name] = self._counts.get(name, 0) + n
+        finally:
+            self._lock.release()
+
+    def start(self, phase):
+        if self._phase is not None:
+            self.stop()
+        self._phase = {'phase': phase, 'wall': time.time(),
+                       'cpu': _cpu_times()}
+        self._counts = {}
+
+    def stop(self, **extra):
+        """Ends the running phase; ``extra`` is added to its record"""
+        if self._phase is None:
+            return
+        wall = time.time()
+        cpu = _cpu_times()
+        record = self._record(self._phase['phase'], wall - self._phase['wall'],
+                              self._phase['cpu'], cpu, self._counts)
+        record.update(extra)
+        self.phases.append(record)
+        self._phase = None
+        self._counts = {}
+
+    def timed(self, phase, func, *args, **kw):
+        """Calls ``func(*args, **kw)`` as phase ``phase``"""
+        self.start(phase)
+        try:
+            return func(*args, **kw)
+        finally:
+            self.stop()
+
+    def _record(self, phase, wall, start_cpu, end_cpu, counts):
+        counts = dict(counts)
+        subprocesses = counts.pop('subprocess', 0)
+        return {
+            'phase': phase,
+            'wall': round(wall, 6),
+            'cpu_user': round(end_cpu[0] - start_cpu[0], 6),
+            'cpu_system': round(end_cpu[1] - start_cpu[1], 6),
+            'children_cpu_user': round(end_cpu[2] - start_cpu[2], 6),
+            'children_cpu_system': round(end_cpu[3] - start_cpu[3], 6),
+            'fs_ops': counts,
+            'fs_op_count': sum(counts.values()),
+            'subprocesses': subprocesses,
+        }
+
+    def report(self):
+        """Returns the phases and the totals since the last reset()"""
+        totals = {}
+        subprocesses = 0
+        for record in self.phases:
+            for name, n in record['fs_ops'].items():
+                totals[name] = totals.get(name, 0) + n
+            subprocesses += record['subprocesses']
+        total = self._record('total', time.time() - self._started,
+                             self._start_cpu, _cpu_times(), totals)
+        total['subprocesses'] = subprocesses
+        return {'phases': self.phases, 'total': total}
+
+    def log(self):
+        for record in self.phases + [self.report()['total']]:
+            logger.info('%-26s %8.3fs wall %8.3fs cpu %5s fs ops %3s subprocesses',
+                        record['phase'], record['wall'],
+                        record['cpu_user'] + record['cpu_system']
+                        + record['children_cpu_user']
+                        + record['children_cpu_system'],
+                        record['fs_op_count'], record['subprocesses'])
+
+
+def write_timings(filename, data):
+    """Writes a timing report (or a list of them) to ``filename`` as JSON"""
+    try:
+        import json
+    except ImportError:
+        logger.warn('Cannot write %s: the json module is not available', filename)
+        return
+    logger.notify('Writing timings to %s', filename)
+    f = open(filename, 'w')
+    try:
+        json.dump(data, f, indent=1, sort_keys=True)
+    finally:
+        f.close()
+
+
+timings = Timings()
@@ -1,30 +1,98 @@
+import errno
 import os
 import sys
+try:
+    import threading
+except ImportError:
+    import dummy_threading as threading
 from ve import *
 from ve.log import logger
+from ve.timing import timings
 
 
 join = os.path.join
 
 def _find_file(filename, dirs):
-    for dir in reversed(dirs):
-        if os.path.exists(join(dir, filename)):
-            return join(dir, filename)
-    return filename
+    from ve.archives import find_archive
+    return find_archive(filename, dirs) or filename
 
 
-def change_prefix(filename, dst_prefix):
-    prefixes = [sys.prefix]
+def run_parallel(func, items, workers=1):
+    """
+    Calls ``func(item)`` for every item, using up to ``workers`` threads.
+
+    Messages logged by ``func`` are held back and written out in item
+    order once all the calls are done, so the output is the same as for
+    a serial run.  Returns the results in item order; if any call raised,
+    the exception of the first failing item is raised again.
+    """
+    items = list(items)
+    if workers is None or workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    results = [None] * len(items)
+    errors = [None] * len(items)
+    captured = [[]] * len(items)
+    lock = threading.Lock()
+    pending = list(range(len(items)))
+    pending.reverse()
+
+    def worker():
+        while True:
+            lock.acquire()
+            try:
+                if not pending:
+                    return
+                i = pending.pop()
+            finally:
+                lock.release()
+            logger.start_capture()
+            try:
+                try:
+                    results[i] = func(items[i])
+                except Exception:
+                    errors[i] = sys.exc_info()[1]
+            finally:
+                captured[i] = logger.end_capture()
+
+    threads = [threading.Thread(target=worker)
+               for i in range(min(workers, len(items)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for i in range(len(items)):
+        logger.replay(captured[i])
+        if errors[i] is not None:
+            raise errors[i]
+    return results
 
-    if sys.platform == "darwin":
-        prefixes.extend((
-            join("/Library/Python", sys.version[:3], "site-packages"),
-            join(sys.prefix, "Extras", "lib", "python"),
-            join("~", "Library", "Python", sys.version[:3], "site-packages")))
 
-    if hasattr(sys, 'real_prefix'):
-        prefixes.append(sys.real_prefix)
-    prefixes = [os.path.abspath(p) for p in prefixes]
+_source_prefixes = []
+
+
+def source_prefixes():
+    """
+    Returns the absolute prefixes the files of the running interpreter
+    may live under; they don't change during a run, so they are computed
+    once.
+    """
+    if not _source_prefixes:
+        prefixes = [sys.prefix]
+
+        if sys.platform == "darwin":
+            prefixes.extend((
+                join("/Library/Python", sys.version[:3], "site-packages"),
+                join(sys.prefix, "Extras", "lib", "python"),
+                join("~", "Library", "Python", sys.version[:3], "site-packages")))
+
+        if hasattr(sys, 'real_prefix'):
+            prefixes.append(sys.real_prefix)
+        _source_prefixes.extend([os.path.abspath(p) for p in prefixes])
+    return _source_prefixes
+
+
+def change_prefix(filename, dst_prefix):
+    prefixes = source_prefixes()
     filename = os.path.abspath(filename)
     for src_prefix in prefixes:
         if filename.startswith(src_prefix):
@@ -41,6 +109,7 @@ def call_subprocess(cmd, show_stdout=True,
                     raise_on_returncode=True, extra_env=None,
                     remove_from_env=None,
                     capture_stdout=True):
+    import subprocess
     cmd_parts = []
     for part in cmd:
         if len(part) > 45:
@@ -58,6 +127,7 @@ def call_subprocess(cmd, show_stdout=True,
         stdout = subprocess.PIPE
 
     logger.debug("Running command %s" % cmd_desc)
+    timings.count('subprocess')
     if extra_env or remove_from_env:
         env = os.environ.copy()
         if extra_env:
@@ -1,4 +1,9 @@
-from enviroment import BasePythonDistribution
+import shutil
+
+from ve.environment import BasePythonDistribution
+from ve.utils import *
+from ve import *
+from ve.log import logger
 
 
 class Win32Distribution(BasePythonDistribution):
@@ -8,6 +13,7 @@ class Win32Distribution(BasePythonDistribution):
         # the name; this function will remove them (using the ~1
         # format):
         self._fs.mkdir(self._home_dir)
+        home_dir = self._home_dir
         if ' ' in home_dir:
             try:
                 import win32api
@@ -30,6 +36,7 @@ class Win32Distribution(BasePythonDistribution):
 
     def copy_executable(self):
         if sys.platform == 'win32' or sys.platform == 'cygwin':
+            py_executable = self.py_executable()
             pythonw = os.path.join(os.path.dirname(sys.executable), 'pythonw.exe')
             if os.path.exists(pythonw):
                 logger.info('Also created pythonw.exe')
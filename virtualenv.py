@@ -1776,142 +1776,243 @@ def convert(s):
 
 ##file site.py
 SITE_PY = convert("""
-eJzFPf1z2zaWv/OvwMqTIZXKdD66nR2n7o2TOK333MTbpLO5dT1aSoIs1hTJEqRl7c3d337vAwAB
-kvLHpp3TdGKJBB4eHt43HtDRaHRcljJfiHWxaDIplEyq+UqUSb1SYllUol6l1WK/TKp6C0/n18mV
-VKIuhNqqGFvFQfD0Cz/BU/FplSqDAnxLmrpYJ3U6T7JsK9J1WVS1XIhFU6X5lUjztE6TLP0XtCjy
-WDz9cgyC01zAzLNUVuJGVgrgKlEsxfm2XhW5iJoS5/w8/nPycjwRal6lZQ0NKo0zUGSV1EEu5QLQ
-hJaNAlKmtdxXpZyny3RuG26KJluIMkvmUvzznzw1ahqGgSrWcrOSlRQ5IAMwJcAqEQ/4mlZiXixk
-LMRrOU9wAH7eEitgaBNcM4VkzAuRFfkVzCmXc6lUUm1FNGtqAkQoi0UBOKWAQZ1mWbApqms1hiWl
-9djAI5Ewe/iTYfaAeeL4fc4BHD/kwc95ejth2MA9CK5eMdtUcpneigTBwk95K+dT/SxKl2KRLpdA
-g7weY5OAEVAiS2cHJS3Ht3qFvjsgrCxXJjCGRJS5Mb+kHnFwWoskU8C2TYk0UoT5WzlLkxyokd/A
-cAARSBoMjbNIVW3HodmJAgBUuI41SMlaiWidpDkw64/JnND+e5ovio0aEwVgtZT4tVG1O/9ogADQ
-2iHAJMDFMqvZ5Fl6LbPtGBD4BNhXUjVZjQKxSCs5r4sqlYoAAGpbIW8B6YlIKqlJyJxp5HZC9Cea
-pDkuLAoYCjy+RJIs06umIgkTyxQ4F7ji3YefxNuT16fH7zWPGWAss1drwBmg0EI7OMEA4qBR1UFW
-gEDHwRn+EcligUJ2heMDXm2Dg3tXOohg7mXc7eMsOJBdL64eBuZYgzKhsQLq99/QZaJWQJ//uWe9
-g+B4F1Vo4vxtsypAJvNkLcUqYf5Czgi+1XC+i8t69Qq4QSGcGkilcHEQwRThAUlcmkVFLkUJLJal
-uRwHQKEZtfVXEVjhfZHv01p3OAEgVEEOL51nYxoxlzDRPqxXqC9M4y3NTDcJ7Dqvi4oUB/B/Pidd
-lCX5NeGoiKH420xepXmOCCEvBOFeSAOr6xQ4cRGLM2pFesE0EiFrL26JItEALyHTAU/K22RdZnLC
-4ou69W41QoPJWpi1zpjjoGVN6pVWrZ3qIO+9iD93uI7QrFeVBODNzBO6ZVFMxAx0NmFTJmsWr3pT
-EOcEA/JEnZAnqCX0xe9A0WOlmrW0L5FXQLMQQwXLIsuKDZDsMAiE2MNGxij7zAlv4R38C3Dx30zW
-81UQOCNZwBoUIr8LFAIBkyBzzdUaCY/bNCt3lUyas6YoqoWsaKiHEfuAEX9gY5xr8L6otVHj6eIq
-F+u0RpU00yYzZYuXhzXrx1c8b5gGWG5FNDNNWzqtcXpZuUpm0rgkM7lESdCL9MouO4wZDIxJtrgW
-a7Yy8A7IIlO2IMOKBZXOspbkBAAMFr4kT8smo0YKGUwkMNC6JPjrBE16oZ0lYG82ywEqJDbfc7A/
-gNu/QIw2qxToMwcIoGFQS8HyzdK6Qgeh1UeBb/RNfx4fOPV0qW0TD7lM0kxb+SQPTunhSVWR+M5l
-ib0mmhgKZpjX6Npd5UBHFPPRaBQExh3aKvO1UEFdbQ+BFYQZZzqdNSkavukUTb3+oQIeRTgDe91s
-OwsPNITp9B6o5HRZVsUaX9u5fQRlAmNhj2BPnJOWkewge5z4CsnnqvTSNEXb7bCzQD0UnP908u70
-88lHcSQuWpU26eqzSxjzJE+ArckiAFN1hm11GbRExZei7hPvwLwTU4A9o94kvjKpG+BdQP1T1dBr
-mMbcexmcvD9+fXYy/fnjyU/Tj6efTgBBsDMy2KMpo3lswGFUMQgHcOVCxdq+Br0e9OD18Uf7IJim
-alpuyy08AEMJLFxFMN+JCPHhVNvgaZovi3BMjX9lJ/yI1Yr2uC4Ov74UR0ci/DW5ScIAvJ62KS/i
-jyQAn7alhK41/IkKNQ6ChVyCsFxLFKnoKXmyY+4ARISWhbasvxZpbt4zH7lDkMRH1ANwmE7nWaIU
-Np5OQyAtdRj4QIeY3WGUkwg6llu361ijgp9KwlLk2GWC/wygmMyoH6LBKLpdTCMQsPU8UZJb0fSh
-33SKWmY6jfSAIH7E4+AiseIIhWmCWqZKwRMlXkGtM1NFhj8RPsotiQwGQ6jXcJF0sBPfJFkjVeRM
-CogYRR0yompMFXEQOBUR2M526cbjLjUNz0AzIF9WgN6rOpTDzx54KKBgTNiFoRlHS0wzxPSvHBsQ
-DuAkhqiglepAYX0mzk/OxctnL/bRAYEocWGp4zVHm5rmjbQPl7BaV7J2EOZe4YSEYezSZYmaEZ8e
-3g1zHduV6bPCUi9xJdfFjVwAtsjAziqLn+gNxNIwj3kCqwiamCw4Kz3j6SUYOfLsQVrQ2gP11gTF
-rL9Z+j0O32WuQHVwKEyk1nE6G6+yKm5SdA9mW/0SrBuoN7RxxhUJnIXzmAyNGGgI8FtzpNRGhqDA
-qoZdTMIbQaKGX7SqMCZwZ6hbL+nrdV5s8inHrkeoJqOxZV0ULM282KBdgj3xDuwGIFlAKNYSjaGA
-ky5QtvYBeZg+TBcoS9EAAALTrCjAcmCZ4IymyHEeDoswxq8ECW8l0cLfmCEoODLEcCDR29g+MFoC
-IcHkrIKzqkEzGcqaaQYDOyTxue4s5qDRB9ChYgyGLtLQuJGh38UhKGdx5iolpx/a0M+fPzPbqBVl
-RBCxGU4ajf6SzFtcbsEUpqATjA/F+RVigw24owCmUZo1xf5HUZTsP8F6nmvZBssN8Vhdl4cHB5vN
-Jtb5gKK6OlDLgz//5Ztv/vKMdeJiQfwD03GkRSfH4gN6hz5o/K2xQN+ZlevwY5r73EiwIkl+FDmP
-iN/3TbooxOH+2OpP5OLWsOK/xvkABTI1gzKVgbajFqMnav9J/FKNxBMRuW2jMXsS2qRaK+ZbXehR
-F2C7wdOYF01eh44iVeIrsG4QUy/krLkK7eCejTQ/YKoop5Hlgf3nl4iBzxmGr4wpnqKWILZAi++Q
-/idmm4T8Ga0hkLxoonrx7nZYixniLh4u79Y7dITGzDBVyB0oEX6TBwugbdyXHPxoZxTtnuOMmo9n
-CIylDwzzalcwQsEhXHAtJq7UOVyNPipI04ZVMygYVzWCgga3bsbU1uDIRoYIEr0bE57zwuoWQKdO
-rs9E9GYVoIU7Ts/adVnB8YSQB47Ec3oiwak97L17xkvbZBmlYDo86lGFAXsLjXa6AL6MDICJGFU/
-j7ilCSw+dBaF12AAWMFZG2SwZY+Z8I3rA472RgPs1LP6u3ozjYdA4CJFnD16EHRC+YhHqBRIUxn5
-PXexuCVuf7A7LQ4xlVkmEmm1Q7i6ymNQqO40TMs0R93rLFI8zwrwiq1WJEZq3/vOAkUu+HjImGkJ
-1GRoyeE0OiJvzxPAULfDhNdVg6kBN3OCGK1TRdYNybSCf8CtoIwEpY+AlgTNgnmolPkT+x1kzs5X
-f9nBHpbQyBBu011uSM9iaDjm/Z5AMur8CUhBDiTsCyO5jqwOMuAwZ4E84YbXcqd0E4xYgZw5FoTU
-DOBOL70AB5/EuGdBEoqQb2slS/GVGMHydUX1Ybr7d+VSkzaInAbkKuh8w5Gbi3DyEEedvITP0H5G
-gnY3ygI4eAYuj5uad9ncMK1Nk4Cz7ituixRoZMqcjMYuqpeGMG76909HTouWWGYQw1DeQN4mjBlp
-HNjl1qBhwQ0Yb827Y+nHbsYC+0ZhoV7I9S3Ef2GVqnmhQgxwe7kL96O5ok8bi+1ZOhvBH28BRuNL
-D5LMdP4Csyz/xiChBz0cgu5NFtMii6TapHlICkzT78hfmh4elpSekTv4SOHUAUwUc5QH7yoQENqs
-PABxQk0AUbkMlXb7+2DvnOLIwuXuI89tvjh8edkn7mRXhsd+hpfq5LauEoWrlfGisVDgavUNOCpd
-mFySb/V2o96OxjChKhREkeLDx88CCcGZ2E2yfdzUW4ZHbO6dk/cxqINeu5dcndkRuwAiqBWRUQ7C
-x3Pkw5F97OTumNgjgDyKYe5YFANJ88m/A+euhYIx9hfbHPNoXZWBH3j9zdfTgcyoi+Q3X4/uGaVD
-jCGxjzqeoB2ZygDE4LRNl0omGfkaTifKKuYt79g25ZgVOsV/mskuB5xO/Jj3xmS08HvNe4Gj+ewR
-PSDMLma/QrCqdH7rJkkzSsoDGvv7qOdMnM2pg2F8PEh3o4w5KfBYnk0GQyF18QwWJuTAftyfjvaL
-jk3udyAgNZ8yUX1U9vQGfLt/5G2qu3uHfajamBgeesaZ/hcDWsKb8ZBd/xINh5/fRRlYYB4NRkNk
-9xzt/+9ZPvtjJvnAqZht39/RMD0S0O81E9bjDE3r8XHHIA4tu2sCDbAHWIodHuAdHlp/aN7oWxo/
-i1WSEk9Rdz0VG9rrpzQnbtoAlAW7YANwcBn1jvGbpqp435dUYCmrfdzLnAgsczJOGFVP9cEcvJc1
-YmKbzSlt7BTFFENqJNSJYDuTsHXhh+VsVZj0kcxv0gr6gsKNwh8+/HgS9hlAD4OdhsG562i45OEm
-HOE+gmlDTZzwMX2YQo/p8u9LVTeK8AlqttNNclaTbdA++DlZE9IPr8E9yRlv75T3qDFYnq/k/Hoq
-ad8d2RS7OvnpN/gaMbHb8X7xlEqWVAEGM5lnDdKKfWAs3Vs2+Zy2KmoJro6us8W6G9pN50zcMkuu
-RESdF5gF0txIiaKbpNKOYFkVWNkpmnRxcJUuhPytSTKMsOVyCbjgPpJ+FfPwlAwSb7kggCv+lJw3
-VVpvgQSJKvQ2HNUOOA1nW55o5CHJOy5MQKwmOBQfcdr4ngm3MOQycbq/+YCTxBAYO5h9UuQueg7v
-82KKo06pQHbCSPW3yOlx0B2hAAAjAArzH411Es1/I+mVu9dHa+4SFbWkR0o36C/IGUMo0RiTDvyb
-fvqM6PLWDiyvdmN5dTeWV10srwaxvPKxvLobS1ckcGFt/shIwlAOqbvDMFis4qZ/eJiTZL7idlg4
-iQWSAFGUJtY1MsX1w16SibfaCAipbWfvlx62xScpV2RWBWejNUjkftxP0nG1qfx2OlMpi+7MUzHu
-7K4CHL/vQRxTndWMurO8LZI6iT25uMqKGYitRXfSApiIbi0Opy3zm+mME60dSzU6/69PP3x4j80R
-1MhUGlA3XEQ0LDiV6GlSXam+NLVxWAnsSC39mhjqpgHuPTDJxaPs8T9vqdgCGUdsqFigECV4AFQS
-ZZu5hUNh2HmuK4z0c2Zy3vc5EqO8HrWT2kGk4/Pzt8efjkeUfRv978gVGENbXzpcfEwL26Dvv7nN
-LcWxDwi1TjO1xs+dk0frliPut7EGbM+H7zx48RCDPRix+7P8QykFSwKEinUe9jGEenAM9EVhQo8+
-hhF7lXPuJhc7K/adI3uOi+KI/tAOQHcAf98RY4wpEEC7UJGJDNpgqqP0rXm9g6IO0Af6el8cgnVD
-r24k41PUTmLAAXQoa5vtdv+8LRM2ekrWr0++P31/dvr6/PjTD44LiK7ch48HL8TJj58FlWqgAWOf
-KMEqhRqLgsCwuKeExKKA/xrM/CyamvO10Ovt2ZneNFnjOREsHEabE8Nzriiy0Dh9xQlh+1CXAiFG
-mQ6QnAM5VDlDB3YwXlrzYRBV6OJiOuczQ2e10aGXPmhlDmTRFnMM0geNXVIwCK72gldUAl6bqLDi
-zTh9SGkAKW2jbY1GRum53s69sxVlNjq8nCV1hidtZ63oL0IX1/AyVmWWQiT3KrSypLthpUrLOPqh
-3WtmvIY0oNMdRtYNedY7sUCr9Srkuen+45bRfmsAw5bB3sK8c0mVGlS+jHVmIsRGvKkSylv4apde
-r4GCBcM9txoX0TBdCrNPILgWqxQCCODJFVhfjBMAQmcl/Nz8oZMdkAUWSoRv1ov9v4WaIH7rX34Z
-aF5X2f4/RAlRkOCqnnCAmG7jtxD4xDIWJx/ejUNGjqpkxd8arK0Hh4QSoI60UykRb2ZPIyWzpS71
-8PUBvtB+Ar3udK9kWenuw65xiBLwREXkNTxRhn4hVl5Z2BOcyrgDGo8NWMzw+J1bEWA+e+LjSmaZ
-LhY/fXt2Ar4jnmRACeItsBMYjvMluJut6+D4eGAHFO51w+sK2bhCF5bqHRax12wwaY0iR729Egm7
-TpQY7vfqZYGrJFUu2hFOm2GZWvwYWRnWwiwrs3anDVLYbUMUR5lhlpieV1RL6vME8DI9TTgkglgJ
-z0mYDDxv6KZ5bYoHs3QOehRULijUCQgJEhcPAxLnFTnnwItKmTNE8LDcVunVqsZ9Bugc0/kFbP7j
-8eez0/dU0//iZet1DzDnhCKBCddzHGG1HmY74ItbgYdcNZ0O8ax+hTBQ+8Cf7isuFDniAXr9OLGI
-f7qv+BDXkRMJ8gxAQTVlVzwwAHC6DclNKwuMq42D8eNW47WY+WAoF4lnRnTNhTu/Pifalh1TQnkf
-8/IRGzjLUtMwMp3d6rDuR89xWeKO0yIabgRvh2TLfGbQ9br3ZlcdmvvpSSGeJwWM+q39MUyhVq+p
-no7DbLu4hcJabWN/yZ1cqdNunqMoAxEjt/PYZbJhJaybMwd6Fc09YOJbja6RxEFVPvolH2kPw8PE
-ErsXp5iOdKKEjABmMqQ+ONOAD4UWARQIFeJGjuROxk9feHN0rMH9c9S6C2zjD6AIdVksHbcoKuBE
-+PIbO478itBCPXooQsdTyWVe2JIt/GxW6FU+9+c4KAOUxESxq5L8SkYMa2JgfuUTe0cKlrStR+qL
-9HLIsIhTcE5vd3B4Xy6GN04Mah1G6LW7ltuuOvLJgw0GT2XcSTAffJVsQPeXTR3xSg6L/PBBtN1Q
-74eIhYDQVO+DRyGmY34Ld6xPC3iQGhoWeni/7diF5bUxjqy1j50DRqF9oT3YeQWhWa1oW8Y52Wd8
-UesFtAb3qDX5I/tU1+zY3wNHtpyckAXKg7sgvbmNdINOOmHEJ4f42GVKlentwRb9biFvZFaA6wVR
-HR48+NUePBjHNp0yWJL1xdidb8+3w7jRmxazQ3MyAj0zVcL6xbmsDxCdwYzPXZi1yOBS/6JDkiS/
-Ji/5zd9PJ+LN+5/g39fyA8RVeHJwIv4BaIg3RQXxJR99pTsJ8FBFzYFj0Sg8XkjQaKuCr29At+3c
-ozNui+jTHv4xD6spBRa4Vmu+MwRQ5AnScfDWTzBnGOC3OWTV8UaNpzi0KCP9Emmw+9wJntU40C3j
-Vb3O0F44WZJ2NS9GZ6dvTt5/PInrW+Rw83PkZFH82iicjt4jrnA/bCLsk3mDTy4dx/kHmZUDfrMO
-Os0ZFgw6RQhxSWkDTb6PIrHBRVJh5kCU20Uxj7ElsDwfm6s34EiPnfjyXkPvWVmEFY31LlrrzeNj
-oIb4pauIRtCQ+ug5UU9CKJnh+S1+HI+GTfFEUGob/jy93izczLg+iEMT7GLazjryu1tduGI6a3iW
-kwivI7sM5mxmliZqPZu7Z/Y+5EJfJwJajvY55DJpslrIHCSXgny61wE0vXvMjiWEWYXNGZ09ozRN
-tkm2yilCSpQY4agjOpqOGzKUMYQY/Mfkmu0Bnv8TDR8kBuiEKMVPhdNVNfMVSzCHRES9gcKDTZq/
-dOt5NIV5UI6Q560jC/NEt5ExupK1nj8/iMYXz9tKB8pKz71DtvMSrJ7LJnugOsunT5+OxH/c7/0w
-KnFWFNfglgHsQa/ljF7vsNx6cna1+p69eRMDP85X8gIeXFL23D5vckpN3tGVFkTavwZGiGsTWmY0
-7Tt2mZN2FW80cwvesNKW4+c8pUuDMLUkUdnqu5cw7WSkiVgSFEOYqHmahpymgPXYFg2ej8M0o+YX
-eQscnyKYCb7FHTIOtVfoYVItq+Uei86RGBHgEdWW8Wh0wJhOiAGe0/OtRnN6mqd1e7Tjmbt5qg/S
-1/YuIM1XItmgZJh5dIjhHLX0WLX1sIs7WdSLWIr5hZtw7MySX9+HO7A2SFqxXBpM4aFZpHkhq7kx
-p7hi6TytHTCmHcLhznQFElmfOBhAaQTqnazCwkq0ffsnuy4uph9oH3nfjKTLh2p7rRQnh5K8U2AY
-x+34lIayhLR8a76MYZT3lNbWnoA3lviTTqpiXb93+4V7xLDJ9a0WXL/RXnUBcOgmJasgLTt6OsK5
-vsvCZ6bdcRcFfihEJ9xu0qpukmyqL0+YosM2tRvrGk97NO3OQ5fWWwEnvwAPeF9X0YPjYKpskJ5Y
-BGtOSRyJpU5RxO5pL/9gVFmgl/eCfSXwKZAyi6k5o2ySSBeWXe3hT12z6ah4BPWVOVC0wzM3J1l6
-h0BczCdU52SOIOzwog0u3TslxHdHIno+EX/uBELzcou3IgHKTxbxk0Xo+2TU9eLwRWtn+oFnB8JO
-IC8vHz3dLJ3R9MKh8u/7++qiQwwA1yA7y1Qu9p8oxI5x/lKoGko7r92cQjPG0+F7tupJH4xuj4vQ
-qbAZePWbVqE4qsX4n3YQc+Ja6wE+nIpCyxbIHqg3hSed4j976RkWBmr0/JVFz2U6tDmF3/DiEniv
-Ceo6Ojs3LXWFuwU7EJPrY4y8BdU2bDn+Xo/qUaLUrRHvtcLtyVbiXNZ/BA+HdMkLMc1XnW3hP5J5
-uGh/1+ZiD8tvvr4LT1fBDJ5YGFhQbzGdVn8gU+9k2ccuzAP26+/n/4fz/l18/2gq6V7DtMJQCguZ
-Vwm/QZPYlIc21WBUAm4FRW55G37q68EzMawOUDfW1+Fd0+f+d81dtwjszM3ubm/u/tk3lwa6725+
-GaIBh3maEA+qGW8FdlgXuGI80UUFwylL/UHyu51wpju0wn1gTAkDJkCJTTX2Rmuvk7n7HStk9vl6
-V/eo46Ct6Ey7d/azy/EPUfRcDYDP7elnKvFYaA5kv5Hu65py0eBUXl2paYJ3xU0p2KACl54XadzX
-d3TVl0zU1nideKEKgDDcpEsR3WpjYAwIaPjOWq4PcW7OEDQ0VVE6ZZkqXXAGSbu4AC7mzBH1N5lJ
-rqscZRITfqqpygqigpG+2ZQLF4ZqPVugJpGxTtS1Qd30mOiLLnEIrpYxxyM5X8WRhkcdIASfmnKu
-beJC5enUvgN+edYeA08nliFk3qxlldTtFSj+NmkqvnNGoEOxuMBOqqKVzA6nuIillj8cpDBZYL9/
-pZ1sL8i44+z32Gq9h7MV9dApsMccK3dsj+Hm9NZegeZevbOgC3NdI2+btdxnr32BpTD3eZGu1LkD
-fqvvGOKbKzmziW6Cw0cg9+6RNL8816o1dlIsGs4zVzH0L5XBU81ki4fuiutxQf9WuE6gYcf39YZl
-ll5osqOxpaJ2rQYVTzvauI2osZLunojar5Z+ZETtwX9gRK1v9gODo/HR+mCwfvqe0JvVhHtNXssI
-0GcKRMKdvc4la8ZkRm41MoS96e3IXlPLOtM54mTMBHJk//4kAsHX4Sm3dNO7ruquiNqXLnr8/dmH
-18dnRIvp+fGb/zz+nqpVMH3csVkPTjnkxT5Te9+ri3XTD7rCYGjwFtuBeyf5cIeG0Hvf25wdgDB8
-kGdoQbuKzH29q0PvQES/EyB+97Q7UHep7EHIPf9MF9+7dQWdAtZAP+VqQ/PL2bI1j8zOBYtDuzNh
-3rfJZC2jvVzbroVz6v766kT7rfqmwh15wLGtPqUVwBwy8pdNIZujBDZRyY5K938eQCWzeAzL3PIB
-UjiXzm1zdNEcg6r9/0tBBcouwX0wdhgn9sZfasfpcmWvssa9sLmMDUG8c1Cj/vxcYV/IbAcVgoAV
-nr5LjREx+k9vMNnt2CdKXOzTict9VDaX9heumXZy/57ipmtt7yRSXLnB207QeNlk7kaq7dPrQM4f
-ZeeLpVPiD5rvAOjciqcC9kafiRXibCtCCCT1hiFWDRId9YViDvJoNx3sDa2eif1d5/Hc82hCPN/d
-cNE58qZ7vOAe6p4eqjGnnhwLjOVruw7aie8IMm/vCLqEyHM+cE9R330LX28unh/aZCvyO752FAmV
-2Ywcw37hlKndefGd052YpZpQHRPGbM4xTd3i0oHKPsGuGKdXq78jDjL7vgxp5L0fLvIxPbwLvUdd
-TC3rHcKURPREjWlazukGjbt9Mu5Pt1VbfSB8UuMBQHoqEGAhmJ5udCrntlz+Gj3TUeGsoStD3Yx7
-6EgFVdH4HME9jO/X4tftTicsH9SdUTT9uUGXA/WSg3Cz78Ctxl5KZLdJ6E695YMdLgAfVh3u//wB
-/fv1Xbb7i7v8atvq5eABKfZlsSQQKyU6JDKPYzAyoDcj0tZYR24EHe/naOnoMlQ7N+QLdPyozBAv
-BKYAg5zZqfYArFEI/g9Yl+sB
+eJztfWt320aS6Hf+ih7q+IB0KMqPmTl75FHucWxl4h3H9trOJruyDhciQQkxCDAAaJmTk/3tt17d
+qG40KSmPvfvh8iQWCfSjurq6uqq6qno4HD5dr7NyYVbVYlNkpsnSen5l1ml71ZhlVZv2Kq8Xh+u0
+brfwdP4xvcwa01am2TZTLDUdDO7/xs/gvnl/lTcWBPiWbtpqlbb5PC2KrclX66pus4VZbOq8vDR5
+mbd5WuT/hBJVOTX3fzsEgxelgZEXeVabT1ndQLuNqZbmzba9qkoz2qxxzA+nf0kfjyemmdf5uoUC
+tcAMGLlK20GZZQsAE0puGkBl3maHzTqb58t87gpeV5tiYdZFOs/Mf/0XD42KJsmgqVbZ9VVWZ6YE
+YKDNDNpaIxzwNa/NvFpkU2O+yuYpdsDPO2QNuLUJzlmDaCwrU1TlJYypzOZZ06T11owuNi01RCCb
+RQUw5QBBmxfF4LqqPzZjmFKaj2t4ZFImD38wTB4wTuy/TzkA4+ty8F2Zf55w20A92Fx7xWRTZ8v8
+s0mxWfiZfc7mM3k2ypdmkS+XgIOyHWORAQPQmCK/OFrTdPxNZujLI4LKUWUKfWQIMhfml1RjOnjR
+mrRogGw3a8RRQ5A/zy7ytARslJ+gO2gRUDqI9bPIm9b1Q6MzFTRQ4zy2sEpWjRmt0rwEYv02nRPY
+3+florpuxoQBmK3G/LhpWj3+UQQBUFohYDLAybKzuSmL/GNWbMcAwHuAvs6aTdHigljkdTZvqzrP
+GmoAQNua7DMAPTFpnQkKmTLtup0Q/gkneYkTiwsMFzy+RJQs88tNTSvMLHOgXKCKr1+/Nc9Pv3rx
+9JXQmG2M1+zlCmCGVmiiFUzQgTnaNPVRUcGCng5e4h+TLha4yC6xf4CrK3B040wPRjD29TSsoyYc
+0C6TK93AGFtgJtTXgOr9DFUmzRXg55cb5nsweLoLKzRw/nZ9VcGaLNNVZq5Spi+kjMHfpJ0vp+v2
+6glQQ4PttICqBicHAcyxPUCJxtmoKjOzBhIr8jIbDwBDF1TWn0UghVdVeUhzHVACtFAPSnipno2p
+xzKDgfbbeoL8whbe0sikyMDN86qqiXEA/Zdz4kVFWn4kGBsiKP52kV3mZYkAIS0MkoOEOm4+5kCJ
+i6l5SaWIL9hCJmHuxSVxSWyAlpDogCazz+lqXWQTXr7IW/ezEeosa42d64IpDkq2xF5p1rqhRmnv
+0fSHgOoIzPaqzqDxzYW36JZVNTEXwLMJmnW64uXVXldEOYPIeqJKSBNUEurid8Do06bZrDL3EmkF
+OAsR1GBZFUV1DSg7HgyMOcBCdlP2iRPewjv4F9rFf4usnV8NBqon17A0hcDvagobgS0hK4WqBQiP
+2oSUQyaTl8wpqnqR1dTV7ZB9xIDfsjCOdfCqamVT4+HiLFervEWWdCFbZs47Xpm0zB+f8LhhGLBz
+N4QzW7TD0wqHV6yv0ovMiiQX2RJXgkzSEzft0Ocg0iftxa1Z8S4D7wAtWc47SJyxINNZthkJAdAG
+L760zNebggo1SGAmhY5Wa2p/leKWXomwBOTN2/IAGRJv33PYfwC2f8Iyur7KAT9zaAE4DHIpmL6L
+vK1RQOj40cDf9G197h8o9cVS9ibucpnmhezyaTl4QQ9P65qW7zxbY62JIKOBEZYtinaXJeARl/lw
+OBwMrDi0bezXqhm09fYYSMHYfmazi02OG99shlu9/GgG3ItRHXvVXDnXHnAIW+kVYElVWdbVCl+7
+sb0DZgJ9YY3BgXlDXCZjAdmjxCeIPs3S17Yo7t2KnA3yocGbt6dfv/jh9J05MWcdS5uE/Owc+jwt
+UyBr2hGAqIJuO14GJZHx5cj7zNewvRNRwH5GtWn5Zmm7AdoF0N/XG3oNw5h7Lwenr55+9fJ09t27
+07ezdy/enwKAsM9kgwMaMm6PGxAYmyksDqDKRTOV/XXQq0EPvnr6zj0YzPJmtt6ut/AANkog4XoE
+452YBB/OZA+e5eWySsZU+EcWwk+YrYjEdXb853NzcmKSH9NPaTIAqacrypP4LS2A99t1BlVb+DOq
+mjFOHwpPmnUhKqcAz7quLmRSkZsVVfURlg6I/rBacQEeztP5VTZtP4NgdmCua1zmJeymn1sWhYGw
+SRK42JpPed1uUiDyTyDStqbeMANH8SOrYVJxZdPWeGD+/cXb9989fXn66t9n378FxM3ePH3/zezZ
+02ffnOJUWmmP+gaZbw6clNtatTlyJtYCoCE9JBZGRM4wC1jBC1JS8GlaNteA5CcoKablVhpYQQtz
+2Ngvs8WEmucOcXnzGiUeh5LD1hcSCGvw9hI2k+mgA372zenT56dvAffJgcYHMzxq/KG5t5jSf+Ze
+k5h7ZsTrEqZZk8HZ8eNz84UZ6emfjIE2sKkZNyXEpR7NGFeO7BYZkIh6jVOFzHE0ZnKBSdnUINeI
+YPVjlZcj+wMGTEVnVGs2GyO1ehQBpEo9FFW6UL3YxoG7veX2EbWEMpHfaQID6sK1iUCLLE9UxawM
++HzeNLj3QpEKlAOovEjbDLknFnC8jbgYjL0CyX8UH/aYClqu+VqxP4UOwl2vZZbyTsxyWmfpYjSe
+Nusib0fJhzLhVpd5ifukgmU6L4D4RvwaxkVNnD04N386MT2i2Q3Gx7K6Rlbw8y/cT8UCMi5RbvHh
+8XlXe02K5wm9cjC2AqMFBBBE5cYIyuOuMn5wBeXlJnMPP4JaNzGf0mID2yiR8gn3opvEQsSbaIkm
+fpMeIu2HCkJTdbaukeqAmbYjbB5Q287o7dirJNP2+l0wbWGDyWHivQPo+BWMlUbRrxqinLqDjcQv
+SRNxNmJ8EKTAjrlJGvrDRK8qKm3XIFK/ruiWiF1uJJo1ozERuTzLG1iE+IhXy0TYGCqtuFkjC+QZ
+d9zlGgVWYL6ojeWtXSG5xwWsZIaD7cbXmyIZharoj7zDE0/LP7JtZF7WadNYGByJ0LgSTfDIFXDl
+egOnfgb9qegVF9x15f0BW64YHXe/XG+CuT89tfKE51b37rFVmfWECyTSotRSQ4xWYhx5dXD3zTSj
+ZXg7WvoeC0S4bV7KJop7dsh3RcNjUuJ1Ika2bsu7qooFMuAsRWsXb35EdSOk1iUp+Gi+y5pWGKzo
+5ilozCBB144wPU0ErW5Y/L3XWbVUcgVvzw3VJxX+YgsyINny0FrH8gg10skkoKq2C1CdYFNdARf8
+SAjIYagNv2VLHj1joSdbtrixUDNsIbpOt3aXn9pVRFp0R3R2f7S/04sG/3b7JZPidQpqWYZbMgg2
+shUQ9vHR2bnj6JroJpbE3cRNYWJXjd1Z8QPdR4DplgD1fYUoRJqX9nBwWBH/4mN/vcH/43D1okku
+0g8WDXmsLXyCXfRZ7AVsmx+9pzwErqa3Enp+Qvi+YWcS5E5B+fBBYgxP2Qg4Uri1qJXZsZv6WW87
+7mYGwYGJaMgeP5Iux3s4Z3RjQ/Ai+9q+PS22nxHAdly8135o7zX4PwmT9GSCMI81rU0ReqE+HFMf
+IThELnu8ozPqZeF64iYUYT3EreuBkLAViVjwgkHE5TEWs1ZrHOW9ZipN2/cTpLvLrF3nCyu6OfkO
+KoFAei1yjS8DTolTkmjGMi0NZAzy9F2kNeibYQfYSrTRwRiDHccCqqgBStTZqvqUdS8H7jkNmiDv
+XopyBoisik/AFawCI0yY7DFkPMMnrIug8sZk2ZiPSD55Ca1AwUOYk+zzFKTjvop27PH0nFSjjEwf
+IFcUKNOiIk0mFWBlVbFps4k1H2JXbBQgTE7QQLSGNhdou+vAIQ0MGyHCxboOequ5Ib/dlKJ0Ifyw
+SIp0q0QaQ2NAZRM2JhT3LzLcSQpAOJQCErtKP9GJGOw5Cjk4gCddfTRKHcBDq7GO8nBPk+0DbQRj
+3p5Q+xDIpoMDmRfbGrwttmiGWGgNhfcx0CuVsjcHUFo+YQI9GKHYpQlH9GDgQi9ePT/9gdVgguIl
+WlFgmsTwMRqzrsqIY7DgbROZ3tRZ/FKlK4MumxVZSxYy2J4RzmsUF3Gg8LDI0k8Zbudsq/NoEFoB
+vZhQ7ybdKdB4qkKWLlji84/2TCRFk3fLkgOSAKjLdoyzf5z+ByznUaI1ZTxYQUhA9Hk40Wox6r7A
+QXg+nOprn8wAlBbNK2T/sVK3e/ubFV+9tny91/YB0thPG0Dx4oRAiCvBdnRoWPsZUQidzVMQbg0s
++Xr7S6gGk92exRt4iDZXqW/p+gImv+RzOTm3pTWFPcIMoKF067QAXsGrtG6u0mKv6hzBGyChvkj2
+688As0VCVJcQBVY9iavavR31Y7adGDvzMoApoh9YsKjjvS11dPr6a4JvYv4dNTT5jrYx+jreB+LN
+uwOARGq8JuaeCi+tyS9mbFqUd7RD/46Pd82Tt49GJuc3b6MX+/ZRi/DFZrVuRiNvyDIt4/H/tl01
+YAC0vEay4iZGLb3oQvV3XSkdbFG4hlPal/AIHdsYMbZFBiORfRyu6K1lmMx97eIk+LzpxRkbaTgt
+BrkoLHNfkQ1XFFSbCSRr1HdOuGJ/mnlSSEiV7jpBFUncNRRdMJ7JBEXLPg7Ilgwg+PVVtx4bdnNE
+E+mDEgEjBsouoTosJ78RNquVE7EICFFyYWx2RPOGvBUyO/c86XHhzZJRXnZEZOf/sqgu0sKEGxrP
+uezMTl/0ps9ND6tp8XmMzND+qWGKLblUH+MHIMQh30Xp6QnCw7ZwkTp1hz7uo/rNncjAB5Qx4/S8
+yPob34Ii6GeH+jM13Wj/GamlJD2OgypO/MDjJaElFtCwjD8YgWzCBkLSixQ9PV2vQaBz9LFHIZDG
+0sYTDtnogA5XTxzBkbqPTJePeOYgn4ifWxbI9XxIukqZ8PA0iM5J5EBIPLKAw2d1Ak3U0KYl4CXJ
+hVC0TzRs96OnZw/ONd/pLILsB+ETGp4GjqjWw3O1vRdQEY0X9ObROXaoMBnbUGwbfvPOn0Sop9cT
+wd61TFYG6ZTUNiW20kZpvfn2aWHe0Ri0cbNK8O3r59+9PFVawbF1kjssQB0sUCZPUbUiEdszozkX
+Fjr1rqtP+UJ0Opwt1iWJLhiWZV7DXta1QAoEW5JZz4PmVlmbEjpwq1+gqw7QCO6DGh6hKXQgJBGW
+pgT1FPaXs7qJ6wl4arFhBcaCDK3gdkVeFuRhkVrPACsA22NwM6JjZqpMPoqJOhoeTwjHoDqmi05/
+VkogEDUwABoeYcIeNQVbPWmTzicTut40MPOMS9R7Go1NdBOiunYEsnKdYos4qTNyD2GVtk0/ov65
+XCoX0zspoDCA0970kzZGR5ysjxGLblpS35j3Xlv/Fk2G7Lr4xMkpsBNgK8Q7WAlnXi+2AQFwv6ot
+Z8ekbE/vZvDFjYgR2DCR0m4aNwSTM0irVFFuwm4TA72WYtqn9cbdoYAyX+dCv5NiGXIMT7fUPd1G
+vdTgRzXJQIvkveKP1CR34Or/K5NRZTIkz7vqkx693EGl3DFL/6NaZTj2/92KpWCs2SzJ0ynu8uCE
+NGPLEVemuSDXJPGPn7DHOnBm2oHVqW3PK+TBufnSO7CnfYqbLPKL6Qo2AZDk6q3ziSsKB6Wr5MA5
+8d6PYoet0g78iVU/4+/sFEZfJzgqIA50PiJZcLVGKlGdsARof/PJBCyAE8AwnifgeLMTlKPHmtjd
+IHgCcCeSWWhGrKNJgehUOOlEZCWUikHKtUIRbp/d/m0Nzynr0RXGDmAAAzojW39RYKJWdAJJBvtp
+yDcFBVP2W+7meeAmSmz2PUHCnTEydPqsEDHr1mpOOwuOvX9eB+SSTBOWjEtXxedL1DzJsT6120/v
+gK2bVzoCExT3tEXb2hSjFhB9Iy467muOwnNsjbPjQ3RGkeLnveIo66dymKCG1x9af4jd8ISEEG/0
+tJFlvFmjH1GEbYZOGl9JDA7uGRwWgxXd0blndhdnjSe2V3u0XmbX1m4EYwHxhrZaEFNEzgo2V9SI
+6fevO3auigXqpEhLnTUpwScg1/z8y9iaiJrOr8jKe14NbDshLyGSyoPl73Zc0ifYLsV+gx5dujfU
+oSsqZ7z4wD+MhjGNqEhAP3igg67AnzrRepFRqE7FyxxjebST9lYiPuosaEcUkW4F7l8GPRmiaZXd
+gkENRYboke6B5TjkigKs+nJiNtBZQb4IoIfCpuhVQIydUQdkiUCET8xZoKTi7ifzTbNG5Sdm9GAy
+HuOWEXV8cYN10062i714EM0bRz19N3vx7vmLt6OmnTIrznqz9c98LfK61RVIVeNIhTtNAAwPEd4b
+pOfVhoXUUFkCKBaIASA1gbNvQfRRDBVuxIFbAT0jLH7U+ujLCbtJKphpBe4k2O5ket2GdzvS6w0k
+MvEyv/YNBbcAd0bQxohD/GEnYdyTToV18gkcPkdTEznO+86L+aTjCFm5WWU1MFPtCiWgeGzDH4w1
+Y9q3grizh+d9ArdbiGwdDqj4/uFen2ElnIpc7yE/M0c8Ft8J5qjHBAP8cpXhkfv+y0SsgvMibRoz
+e7FavwRtI6tH1cWPwKa6bYYf4w5iQxlgoBuMXyF5boomF6GC0diMRE17NKY4AqIhFI1mGCs6m42a
+rFhOuAGFV3w65VZP+GVXVSmdtvamKAKJOSIQkqB7oprWZr5djoU4IN2h7Wpi7ncNjVUfgQIgU2sj
+0nYzOAotscqCTAL7yb9Agv2a7Fi9uYgau9AO4SRJJ70zLyMH5ZJtt3Z3dYY0Xzcno5oYYFf7Jk/r
+cG7yxAOXTdVMjuf9EsQyyA0YhB73dOwXXGWri6y2AueuUt35A5aSfonwz4OSesFLuW5JdEAeeKY+
+AzPSWiPVREtGK/a1cm4odtfXDVU2CJdEELSBMYrXVUPxKCyk5a0P6Ey6mwky92JpxnA04RbJL60k
+Qiyum0iaA6lILatpRFdNGaVDAgUjuyjKmOVQAstU/2RsRCvik8BYyo4dqOCgzlJuKcCaYniBPtGj
+cLXGSEPXEtkBO2uxPqDkbZtmCNafU1Rk9bk6JycRxIbywKpqKABqgTFhGBDEi64hg11qftrk84/k
+WpTWeVOVMa7hTYgroOm4I+uds8i7hS+0OsOz2fXRO5L0cO7G7ZbcbehMugrJzKOkvePuyIyJn5oX
+nsE8NNhNfW3YzZrt0V9FYt0R82FbuVbINUjirNTZkTM6BMRho6SdQKY2bQTBhrSJkESa2c1nzLmd
+ZcdZSBz0lVnoPbfSmdUvGIXeuozoF8oq31yhll56KyE4fLgR2l27nzfjZ/ldvelpNmT8RpGg15Ij
+p7PuYZTme5uq089sH/1dVVq3h2eBNG4/4TDFC0Hz8AAxsdcOIhHh9K50V8j0JLllRIIVBn321tAJ
+a1xtWgOR0Q9FMx2GeZx6MaplGMq0+S7NIepScYOB7w30wCJMx01gIABT92bajY/BEijsuDwIqbZa
+OvibBLWsjkN9IKawZo35PWw8NW4+V8guEEoSCZabmra8BUYzRdltbPx2vQAUwXx5gmowY//Dk3Qr
+U+2vnE3VZzijggFvTtVAIoK6Xv1SIVj8bJqsbeQpckv7jL23Y8q34MBV3iuPI71Yy4ARLwS0C/QK
+CtGduHZ7o+4znHxpOlrdDYNCKhfvm0VCdVla74dNMEI5bGu+qftRFKozj2rwE42Ms6FAnaYYan88
+5aL1jn007IoJ1x9vI4myxLz8lBY52Udp2ntCbE/gR/GXa1JYtG9WpTOf8OgSfafSvi7mfFMAmxRS
+4uSVqvSdECbUEplxUf3CaCQS96m3CXtiw4tx3zHDP2mRw8A9h67UojtrcmfyMRe8rsmJsrHssTW3
+mzXyMSsVul7cAXzNA9pzprnz/C+UK0ZyzjqxRqJxb/MP+nLzvUVzJ0xPbcMrnqUlrgb6Ze41x/D/
+hzKJrjXvc8/sORjmNABz4qGjMfrjuANAZgZ91V2NVMxLHSPSFiaPdHxTE/A0Csq3FScmmZFAOpsl
+E5plsn8lHQcOfJW8tjEzQFaDqjwRsP0FqsjEryYSi61Dq2mVfsxor7qvHcX86C/yMpD3lnhUEgHU
+nkcSVAXDIgsIMfZZArS1a76gwpRdQehAByqut7rquG8ApHM4+CcCoj2mcFFauootVFb1Cp3uuBQN
+H+rZkw11yEqpKQprgkmMLYLJQer8YtNSigdMFiKRLLTHa1e1lZV/xYozpSheTyMAJI5GARpJAG2I
+w4FGMFpNVMaF8TjEpk31sCJy4o0mwBx+DthuZLOlYUY1TnLGOENI/5VTenEAX4UBlCBvNUErEm/x
+5vSNefzg0SHmDSpyaMtixyveP+qD2bLLgAHmWpb+NV6WcdGo1+Zq6mamTwpLmWI+f18AtEjAapbN
+W3pj4FWRz/HAzQpmnKvE7gopHp/z6GG14EZAuR2wFTv/durRpQqdtcpmU1s3NFbrKL0eq6xyRENm
+19A5ymYQGqiJ84iMJOEJuoOVxEyzBJ29NpwZynmVofK46CyEU2ruZaeqaYfG8DTYxiP2lLcD8zWo
+pBknSeiQxq2MKozva3APbGD4OZ2ikQgGDZErMOZFU21Zd3UaIqdn4xhB2MGfGAmDltM4G1GLi06Q
+oVpi70n3wHIJbIk8cITBeQGcImnZYr6Pp091Ly3f7AWlhs6bnie9xd/ZMWqlLzVTUvXQz/OHH35g
+smmuyA8AAbvIKAWCdeuervFAxoZT5byIswWTAVrXoJlNI6RpDt+Zas1pjyrrbTU15l2Wmau2XR8f
+HV1fX08ljV9VXx41y6O//Mtf//ovD5gnLhZEP5QcQDsO40no9IjeYeqo6d9s5pAv7cwF9Cie6I4a
+qa1RRumPKOcTwvf3Tb6ozPHh2PFPdmWw+XA2dHzJygZ6ethOGcuA22EH0b3m8N70cTNEGUCXtTu/
+c7UTGvCT5UCNtmoxWHE5rzZlm2hx1HyBkbLr7SK72FwmrvO9nniOBg5BzgAIfMqwdNW4mH20zeMb
+Fk5CR5OU0hAJh6Dod9iiemnqtnEuZpG7uP1670mB7AW1N6L71gvQFe6vHPyIOOkc4PZsBHanH1ji
+tb7qgVe8WnXiIq9VeaRwTDNFfhTEpoHZaDYJzHperS4Y89rzPcHmE3I74Ax7PMk2GGMZpuu0zuiw
+Ir+3+wMxSs4b2hiVWpLplN35UYwEZlhOnP7iwv2myqdLw9zbRUMSUxIW0taJeUhPevkw6N0DJhk5
+Rwtp3w+oGPQI6NY2jAOcAsl+SNG8Odax3tDD74Y4rEu0HhGByynl4+nDh74pxDoLdgd/w3qo/fzD
+9CvRGt8Nb3QjlUiXXfYAem3Xui/qKEnd92FUKXiWvTXImXc60Xl4MIyswl0Ghl5tJsdYE3psu+0c
+FEbBGTV7r3o47qBbIAVJnDdV706DgRVjo0m/QYJK43NkV9OEmhzHqxCI9P52aCLcS4oj0OPrfD3y
+a+5icW4R9PHBPqL9rDKxVBc3UFQfC9I4sSM6sUV2lEiwQTLx4B33utstCXGCMmo8rrHrfSzK3/fK
+SDd73RLvUaE+ntwaBtp5cpVsBr1YO1Uowv8TKYcpUy83mFxS596kVE8SwYGYuYJ/Ci8ML+fV7Jq5
+LWP2B/Y7sOlYbGGEUh2i6QRLFd0lEfeEF2nHvj8wiEY+54XFDYOU5CvrYM5yHT8bp3WpcrswW9vo
+WvDbb+4u0aN3i66LzEZPeLKut8rB1psDaoI3GSiS9YWeIMKRHVFV3hUafxjKqcdtHVv7/rW+by12
+/7ltsrX5wgwBAdGtgVB30jc433JqY22d9d1z1ZiCIEwdfak/d5H/PHXwNhDfKn7XC+H8vViYzUo6
+8kYBi1HSmZ7oVKcqzelJkPbU53Z+wlNKnr6ugL1dFFujM39rHmg5msvCChPnC4IOKJCfKBp0ONag
+nlvE6OzSfzpRJRQHkE7s5HsdeTnebU/jgVNspGlc39KMJ7aFfcljnRET646SqnmUrTBeK6nzZl41
+CSXRC1Oj6o/QQx83DtqX+cUQ/ngTMAz80ykS1WZ2/RWdJF7rSax1b7Bovl2k9XVecnSL4O/En5rY
+aud3nlR59I7MPkcwUEyBfPQ1BvPSXQhHwE9wm1iviyxpRH7vN7t3iEPXLlcfeuo9JjftI3cS7UJ/
+4lN1+rmt0wZnq+BJ40WBsxUXePEEEnPA6lg3NGfUFQZZmtfvfiBHcg5KvJZY6LuTEEFz45i8jwUd
+GPuN6ApGR+SCHumwLSChHCV3p8jbA3vXwe0Z2B0auRPB7JkU25LQya9pZ99EQR+Hi22J9v6QZeAH
+Xv/1z7PICY4G8q9/Ht7QS4CM2LIf2dyUrku6XsREx2tBqbO0IAlUVRK/m7NemfWYOTkZqIS6wjh7
++7Hv7V7Rtd8rHj0Vx88BIeIya8VzUAzwn9K8oIg6AOPwEBmcNQSybTMOj9fSfpDlQO/BJGpTwZy+
+6AtOlseIzCNi41N7OLXjUB4/3sF8N2q+2KPLS+9d1qHDj6JGAk08HAyRPIqwB2/EsQ39t7A2/Pwu
+XMA15uFgGEP7TuvG/4tRPvhjBnnLodjrJH7HHemODf1eI2EGzq0JAw8MOdFp13ufbewWW8QO0W+P
+aBZzeKIgTitgMUtqzH3kXffNNSX3k7S1wJ3TesGyV6SdzuXVPGPfmEIO6NZZfYh3JEwMXp9kpS+6
+lanfzNGrrEVIXLEuvlVuM6libCSRkyo3kqST3ePr7Kqyduis/JTXUJeCCr95/e3pLuPhkirFm9Pz
+aKnk9ns3tnsHok0EOcld6jCG7lLl16+qUH3wEWqv6bCnR4K26P4gyaituSOO/BtsdZ5XR3f7APm/
+zzK6yAPpE6uqk7Nn+BpBcPd7+Bk6m3SZsVNPOS82iKQuY/RyU87pELXN0LbqnMb4eg62ES+L9NKM
+qDInsGYyJLvhp7QW0W9dV3hVnNnki6PLfGGynzZpgTp1tlwCLHjCLa8kYTVZHsxzvmGEs+k02XxT
+5y2GV6RNJQ4C5O+mCl5seaAjD0g+C2YEYoDJsXmHwybTLiFuYdFlNXP/WBQHiUovVrAeHEhW9Bze
+l9UMeyWzSCLxeX3nHUmcGfRQQQNDaBTGPxyLTdV/k9Er7YVAc66RiuzRQ6VW8zmLBLYyojhj/k0/
+9zveRqC83A3l5X4oL0MoL6NQXvpQXu6HUi+JLjEYLCS7EmJWo/C8M3r7jTb4cDeU/ofKccYmEI2v
+gTlb7dauKb6Q0DMrqagi4tfKK4UedrfZ5BycVFeVThNFd8cUhdWk7VWSqjLdjSOVeShWjt11o49f
+92g6pRRWFxnnP6JT8bRNp966kBR6DtxJ18DEhJf7sEW4/DS7YLt7sEUN3/zH+29ev8Li2NTQ+kBR
+NZxE3FFwKKP7aX0ZiYXtDpHWQI5U0vfWo2rS4MEtzVrcywH/85zcwJBwzDUdU1dmDVs/3bHkiumb
+iJIkeC5XFslzP4XKsGyH3aB2IOnpmzfPn75/OiR72/C/veAfi1t/dWh4bInOut4T3HRxh/ELsuIO
+xbDU7Xp6TB6uO4q4eXO1zfaE9+DBo9vs1FEdPUiv8kdiCqYEEDUVy+tdEHVr5ec36Qc9/FhC7F3F
+hSxdpBT3UC06JZuoNd+TTiIt+6dPqFXMYOQiNI2sLtCpTwG3d/vqHlSqRm8p3f1mpStUtkLdRVDp
+oI+IfAqlrthugc87FuFtrsnar07//uLVyxdf4eUKSuhD4e31u6NH5vTbHyg8iLYsloJS9Jhq0UER
+thJ90bBZVPDfBo08i40kRoVaz1++lIORFV41i3cPUpJMeG7z40lrbKlio697KG6J7ykEhXUhdacv
+efE1ks8HGCM5/fAlIuhKhwG7FxKizxsD39VsQ73J8WEK6w0Ka1RwE+xZ1HA6DHEzIgM9NSWBvxGg
+ZFd2/mIFWeJ63j7quMkeZnh2SaoMT7rKwtrPEg1rcm7vkHqSuEUk1dBrriMceeicDRiuGM9T1aFn
+Kcij3gkF7lNP3G0OF9y0I7SfNgBhR2DPYdxlRp5iFKWJPq8mwUJ8cII38rSJm3qZgwYmDM/VWpxE
+l6KyoSz7qbnKMQVrCSLSNWkG0EIwE779/VgZArIKXZeSZ6vF4b8lghC/9IcPkeJtXRz+J6fGZA/D
+JIJMXfg5qDrTbGpOX389Thg4TnfwbxvM8RckOSDq6eccCNI94IdCfcSnDP8E1fGeE6keF4YTXAH3
+5HKre43FH6WTc21PcCjjoGmMOXeQoYNQGN2HnwPz7iorCrlv8sXzl6cgLeJlqLiC+Jjr9DOmhUTT
+CKWwLF3my7wOmsKTf3hdIxlTEBk5vCymXrGofVoCZPLS85Fx80Q24BsisQhnad5osJVflL3Oc4qk
+DHNhp5VJOyiDGNZlCOO4ZiQNyZua/Np7iS/oacpKEGhHeNWqNbbzoW1ettaRucjnwEeB5WZ4k5Sf
+DB0dt8jcXdVd/p95td7W+eUVJUqDylOX/eLbpz+8fPGKrgV99HhnQgwmFJT9OSdfc4Kew2jYgC9h
+cBpH8IQ0K6+wDeQ+8Cd8xZ5CnKMsTCJgk2rhn/CVvUzID6SbzYBBbdbh8kCRX1Xb60oisPZSrVvb
+TgdZ4DAZ5I7T4+tTosoI6W0lZOmJ54vDz86zmuVacKhSRnb+muFHxrhcSwrOHU1G15b99K+Yws8u
+z1D96a3CnO6YTPul/T6sc16vqAxHEdsuaiFFNrxLMig3p0u4KFGeqjzWRBZnwlKcKdBzp+k1Zv4m
+4NqVGGXlww/lUCQMDxKH7J5mYivSpbS0CVC2Cbl7dwMyFO4IwEAoKGCkVu5kfP+RN0a1G9w8RuFd
+sDd+A4xQXPQp9KuqOb3FTyw48isCC/nosfFv2yor57OHH75T7aE/xugaILMlXeGGYZwjbmti2/zC
+R/YOoytxWw/VZ/l5bGMxFBC5g8L76yJ+RmJBCwihVw7T1e5wLWP0YIG9Psk7mUbXfJ1eA+9fb9oR
+z+Quz+HYXda7W725RUnHK0feowQNMD8lO+ana3iXox29PcEm4i3w3FhB1u2PQbBj4l6IBDuvQTVr
+GzqBUZeDW1nUSQHdhnvSbflD91T8ctzvSPiosgK5Rrlz3aQ3tqEUCAwIw391eaVXaU5RMl2Qnbxb
+YGqtao3JfEYYBPWjC4IaT50BJep29Zuhe7N9s43DRm86yI5tlBZKZs0a5m9aZu0RghO18eyDrAMG
+p/qDqCQpXloJ/OjZ9y8m5tmrt/DvV9lr0Kvw8vGJ+U8AwzyratAvOQMMJbnEAC+5JaLaNHhDObXG
+KVzXlIYDxLY3Hp7xIEQiz/yQM8cpDXo41yvqB6U1HuDupKQuD6lPh1ZSjE3KUF4iDnbHwGHc2JGU
+nF61qwL3C2Ue6WbzbPjyxbPTV+9O8YJTbFR+DpX5xPd/wuHIcTDlb5gY94QzOpwrwfmbrFhH5GZR
+Om08HSqdJgG9ZO0UzZyjh5xykdaUhm+9XVTzKZYEkucQ3vZa3Y4aJIiLb/TeLottjcZybtZJ8/gY
+sGE+hIxoiLfqYR0ZE9UkgNILunCbHk+H8a14YsiYDX/uf7xeaFu4BAXSAENIu1GP/OqOF14xnqU9
+R0kE14mbBhsnXuRps7qY6/jh16X5Pi8X1TUlGMOTjWyZ4m2VWQkrl5R81PuR0+uQX14hTCq8nfFF
+iWim4YthO3+jtDFD7HVImQbwCIZMhaCDf5tKRhO+P4UOACnHPgJK+lOlqjab+RWv4EzHivV8DK7z
+8rF23bG3t1CnrCHPO0EWxmlOLESXWSvj5weUXEFLhFDaC/ifr2HX02RyAKxzff/+/aH5PzdLPwzK
+FK8HAbEM2o5KLS/p9Y6dWwbnZqsv2ds3U7mgGh5wiin3fFPyNdy7q9KEZO6vbSPBuUkcMdrywb7M
+Rruaj5a5BB9Ryc7xXZnzFRWrdZEhs2U+SmYnu5qIJIExJGkzz/OEzRQwH9tqg7G6aGYUesk+A8Xn
+2MwE3+KZGKvalCiE/FUd9ThwTsyQGh6SGxn3xleWYzgKwDl7sxUwZy/KvO1iex7o49JTOokm2Z03
+E6Erk17jyrDjCJChwr49Uu0k7GoviXoaSzXv5XdVo+TXN8EOpA0rjW5aYUjhoZ2keZXVc7ud4ozl
+c5U38sCVw3a48rwqZfeZDiIgDYG9066wcCvavf2TmxcN6Ws6OT60PYmnEDsio7mZjUNpGfgSTqdd
+/2SGcoh0dGu/jKGXV2TWFknA68v8SYyq6LuPJv/5pmmrVf5P7bTxdlMafs4eG+40d06Z/2GUjkE6
+cvRDTSXFuW6fiXZP6iJS0Qk2ubBl5hINgbA2c0fpAqcLFr31VSwVSMCH4ikPgoN1qEF8or+rjYQ4
+MfaWkKmOPPQj49YVSnmPWFYCmQIxs5jZfAnWiHTmyNUFoot7pmLx2NQXNqJsh2Ruo1V6gR4a8gm5
+NNkwgx1StIUFHs50KDDGAY8eTsxfAkVovt5+orQ8yb3F9N4i8WUyjiI+fqSSEvYUz6CFnY08Pr/z
+cIv8goaXxFy8b64r/oUJX9MDFJ4tDvkSFIb5t7YqrXTj2k0pNGLMVHHg/JwkSUMXEkJhgRcg1V93
+DEWxFit/uk5s9gfhAxwcj4uWdyCX3MO6mgR+fmQMlvQ0Fjx/ZlFymcUOp/AbXqoL7wWhWtDpn1aK
+F7trL6KMSwArnz11BTtSv1GUutMaCv3Ae6XwXLJbaprm70C8SHlCLV8EB8F/JNWwY/6uU8UelH/9
+8z44NWfxwxEiM+nNoir1B5LxTiK964zc4mj+Zoq/BbXvo/Q7o0dqxZFEaZmvM07jCW9w99usj51V
+wa5+Smqsfdfw036Mhrjwykc22H5MouPmivsGLSUGbsj2BLc3aD+GTQ9e6u6mkNjg5SrM453qWc8F
+vFub8WWvV+xEHAfiZkn5IN51JRzpDgZwUzMuI70ZMWEK9JYzr9K5/o7uL4d8w6IOWYzuB8GwezGc
+jsZvw8z5qB+fu9h28t9YCM2xUAjdz7MZ+wDOssvLZkY3Rs5IkyDvlZ6IaGXTr7EqaO/N1oqUmLkJ
+mrBkJJ6F2nkYKAK0FeQec3HPVSl65LJKdIpUXpZNvmDzUHfh4JTNQlTfmh3ZTXJYZGjNazb1ugaR
+f4hRyqhfkVdCzHVT3WIoVopV2ny0oNsaE7kREbtgVxgb38jGKFYjPOwAIjj6SeWHY7/j2cy9A0J5
+4GVgtJTgZ18M5puydH+peqCoVpxgZYfolmRAKRqw3NGHAgotAe77FyJBexpEulgU6RZ4+G4HXNo0
+gZ6BJLiovQQTGR89QGVB++Oydk/ZiHhquqtLu0lK2D/Xc4CTeyubbn6h4wX6m8gc402clialb2+q
+4pcw3loB6oaT+Ncm945OI15fvf4FW8DxJKMN6Up+6hxSpOhYC950uW+oJAs4N2QgudOqd/RJoHUT
+6BGkuMbRm4Dg/MwAykGOCt/SOS4gvxu8wO8+PunzLmkJlJRjmWn+2aX61CnmFj+ik52WI12x/qUC
+iGmbt5L2aLFL8VvJpbesioIpnJ2MFRuD/UZHNvqk7rZTJhMHhnqmN6R+8jR7P0E0J2qPCfWznwZK
+rOvf37Ycr+qpvTsKdxdqmG5dhfte19u4s9agl+YN1hrf9/6O1hqv/VtaawYH5vvgUmt0up29efv6
+6xcvT9ECOaGND70CcneJNd1dDCQC9EuuQ3iHMeb7463RXrvGSljB3+11nzZ1y5iuK8FNcJFZv8y8
+hYZGF1ubsdF5JYl4yJZavp77CWd53EbvuYBmAER3/ZJcaFxnnAKxkgs1KFeyvav5U1rnHKHcmOHD
+IWaKPTBDLjPkzGl+Zrku7RxAxLlpaMO+BmlgOoDlWsmtS+xt5Jy66HF3OGWNzKEj1SLDrIRkjdZC
+e2jJ54SleFW0PcvJ6uWMJgMFnIbedS50N6Ue7zVH33vNkPeBghC9ZLpffjGqCQUiLTD9eHlr6DlT
+xon5OUHaSY7NA1JJiHDw1y9+cbQL4i4UXMzSZSuiW+xRjB5xg5jZA/8CgY6SIni0TyofOSgUQGG2
+4CDsKeKu2Yfc3WVmBThXM1LRLzGxF9ngnKMhudcEI0CFHwryU5LAaF5G2o3HtWSvGCvn0kQ3DDtF
+3Xy5VxRVSAS40CeHQRiOa+QMWz7vLKj2I/sk9t5rJpRzpLtuDEhZnkciDyKMBdozCqQGvPiXJxkL
+MbRMJucT+9NSwbmuSYjtqH/frYK9Yd5wo1q3cIJ8Tro7c8hQ3Gjy8MbEtWDUt6zlhg4VLZ7GipCY
+30bu1noLvAI9Fyr2O+X89K3j0PqWIkonGyAT4XQUHFnuiEvnTemW2JQyVoXRgP3VhLW7ObBOgGfJ
+gduVLGuHLeZeY+TWbZsmSpsv7vJRxipxNsSbQWPsKMHZ/9Cumg8tTteHtk+CHS6abF6VCxQpA3q2
++GEe/IU563U0Sgj5wOro70Stkm4V6GcOjnFgZyYkWnJN7gHg96aPl/DvAv8n9HnQmvvm4YMHD35F
+OoZglIrnoQMjnmF8KF2QAjlVfkGPtNTZ29zIAPOQtwgUB0LZsnfxAva180YBAqa3jVtdMOwcOk2D
+SPy4L+POrqNchKuErrr7HHF/n9slbDyBN8LYjRKcz5nY+C4GjtHpaMFRrNPI7XxYjzP2VUsRX5XT
+hpPNdtwP0mPG9roXqTfdARYDTXeUyI0sAqnYePhqM3o10T9meOFfvZioDHr6O9oKJZ6KY1K8VA1K
+cv/+LYnuT99/M3v29Nk3p5pO+911wpKv+6iSRm5c6Z50vgc3wwFgvHj1/PQHHwyXI9C2bR90V7l0
+V8v7VRgRRl3yGEK+u3HrtZR+yv7AyYlgOZoKccf1MArP/ZbufFPM77ZiNSy3uQnGp6Ao5cWTmDIy
+b0aTm9Xu652xg5dcoXHrkLKzaMsxmVAwlTiGb6MNOZWbk0Mp/9ctgd93etwUORzebobUSnFzEVlp
+knOC77lBNuqtmTBWd+JY5C24hLYz+CzCac6dtqzCDnc1ISeZvGckigvDxq1+eaX2OqpAvb3vvZbU
+NThQT/0ad9YwaGYGM4ID40r+xSpQz3/geO1Ix/3jvbmfhyQ4d8cZKouQNSCjta5/hwI1wVfiNDpW
+2g6ju7kCh9H92ut3LpW1UTKZeDZKrv73l6+/evpSpu3ps388/TuFkyHR2wOnW9vCy+qQqfDQM9Fr
+47jE/sR67WDvRbKfqPvRY5HuPaEh0oIgJJZbB91KIo/3kUlgKuaJ0U8mXsV9TfXOVRSRu2e3by6S
+KYWhC5/uEeX7fQHW98/ZjWPzAdrPQXdUiyFBOlJCBIxW/fJKxW7ZSybRy/c0hBdVVYxu3Fm+ff38
+O6A52Vw6eu8deEuOkt5aDYL/cRz+E3/EHMHNpfBb+LaLfpl4UTJhOXYZ50L83eei1kkcqch+D9uw
+jpLcinOb1KV6zpHJpO8weYuUE6o5z7ouzXnPrIOH3Im1w8tz7HIL0BJBD2HkUc5B2KaGcW6ofDYp
+11/l/1TuyZRWy+ZpBl4/z9S9RnSlETdFzqnWl6BB4zmqSalhV4GJucjmKadlwGBqMrE39iaWBUY6
+zLOpRZWX12rYH5/eUhZZsQMLMUWsLyQ7dUvsSOPeG2dcZ9nEKo00LiuqSDSCi92515izQ8rEd4g7
+5Ln7hbQh3hJ4JIJhFfYGg4bD/DhGAQovN4WOunF1ehX4YAFduUEP7TLAwHZ9BNPW7RgNsB08g+dd
+/GJrkntNItElGGJO0yK33yjg8SBMQW9R98Ac7krXptOVGfNwd8FFkBFNajziGs0NNZqNTYqlOFtV
+787DZr6kljkWwFDufqvj01/Urw3feAtfP509PHaeuUg4+FptDxSTOVQndWcqpnnvjU2qOhFLPaGg
+V3T+UbYkKXGuWuVDvl0+M717n3b41dggIW5p6L2PR4TaGlZfoZrDEFJHeqBT1GZ0rxnTsFQOHIHd
+PRn3h9vxx34jLP3fopEer4W2sJkeE1anFVvOlTB6ILbliw3ddafdsxO1Kijk0qcIrmEtkB18YXUS
+0G5VnUG09blASIEy5bC4WZzlUgone/eecOgdHeyQSjmXYbz+w1vU7wcDu+qP9h2Uu1KPo/mz5Bwx
++9xiWF2AIvt4CnsW8M0RcWuxptNCx7zNHR41QXVjQ7rA3UTugxWPAdLVZiL5uE1h8H8B6C1MvQ==
 """)
 
 ##file ez_setup.py
@@ -2259,16 +2360,18 @@ xJ4EFmGbvfJiicSHFRzUSISMY6hq3GLCRLnIvSTnEefN0FIjw5tF0Hkk9Q5dRunBsVoyFi24aaLg
 
 ##file activate_this.py
 ACTIVATE_THIS = convert("""
-eJyNU01v2zAMvetXEB4K21jmDOstQA4dMGCHbeihlyEIDMWmG62yJEiKE//7kXKdpN2KzYBt8euR
-fKSyLPs8wiEo8wh4wqZTGou4V6Hm0wJa1cSiTkJdr8+GsoTRHuCotBayiWqQEYGtMCgfD1KjGYBe
-5a3p0cRKiAe2NtLADikftnDco0ko/SFEVgEZ8aRC5GLux7i3BpSJ6J1H+i7A2CjiHq9z7JRZuuQq
-siwTIvpxJYCeuWaBpwZdhB+yxy/eWz+ZvVSU8C4E9FFZkyxFsvCT/ZzL8gcz9aXVE14Yyp2M+2W0
-y7n5mp0qN+avKXvbsyyzUqjeWR8hjGE+2iCE1W1tQ82hsCZN9UzlJr+/e/iab8WfqsmPI6pWeUPd
-FrMsd4H/55poeO9n54COhUs+sZNEzNtg/wanpjpuqHJaxs76HtZryI/K3H7KJ/KDIhqcbJ7kI4ar
-XL+sMgXnX0D+Te2Iy5xdP8yueSlQB/x/ED2BTAtyE3K4SYUN6AMNfbO63f4lBW3bUJPbTL+mjSxS
-PyRfJkZRgj+VbFv+EzHFi5pKwUEepa4JslMnwkowSRCXI+m5XvEOvtuBrxHdhLalG0JofYBok6qj
-YdN2dEngUlbC4PG60M1WEN0piu7Nq7on0mgyyUw3iV1etLo6r/81biWdQ9MWHFaePWZYaq+nmp+t
-s3az+sj7eA0jfgPfeoN1
+eJyNVE1r4zAQvetXDF6KbZp1YXsL5NBdFvawW3roZQnFKPG40VaRjKQ4yb/fGTmO7bSlNdiW9EZv
+vp6UJMn3I+y8Ms+AB1zXSmMWNsqXPJpBpdYhK+OkLBdnIM/haHewV1oLuQ6qlQGBUWiVCzup0bRA
+r3LWbNGEQohHRtfSwArJH1aw36CJLNudD7wEBOJB+cDBPBzDxhpQJqBrHNJ3BsYGETY49rFS5qaJ
+pgXAD6k172WbCvu4shxUAI2yRU98hMogOC9w6IOlD/ijLxoZNrNu5LBWB4qmgoe7x1+FSJJEiOCO
+cwH09NUQeFhjE+BebvGnc9Z1sJOKUrnzHl1Q1kQkiwg/yd8+YbczXcW0esGh9inHcRPsTR9+yUZF
+c0wvm/G+ZZ4nuVDbxrrACfVD64WwuiqtL3krLGilODVpmXKq6ZN4vdTZ8Y6iUs5Qtlk/lyvP/3NM
+JIvr3thjw5PBn1hJKsz7ZB+TU1J11yEtQ23dFhYLSPfK3H5Lu+J7RWVo5PpFPlNbB1//rDIZ+59B
++lutqJYpm37tTdNcoPb4eRLdkXTSu/IpXMXAWnSemr6c3z694YKE1ZZk1pdfk9azXnsn+CS+xUiJ
+HeBQ6gF9xiBDcLybHI0wiureGhz6TzEI/hSyqvhPZc4mGeaCXU3pR85HJ2IBnL34An9si/GUESed
+ZGLbegg2LtUkHdJaHSec2Fy8GLs3zIohm9Sgc82j5Zx1li2ZCqi1kZNPa28A1Pq4RpcAr0fOJ7g+
+n6zT8wmG8+5cVKi7saBhPbk0Oi28fRxGoo6CmSQxyXDA+xKOuhxBiupVf+lW4CbOz8lxnBdditgg
+2t7PtI+XzOI/vPQGZw==
 """)
 
 if __name__ == '__main__':
@@ -2,20 +2,26 @@
 """Create a "virtual" Python installation
 """
 
-# If you change the version here, change it in setup.py
-# and docs/conf.py as well.
-virtualenv_version = "1.7.1.2.post1"
-
 from ve import *
 from ve.utils import *
 from ve.log import Logger, logger
 from ve.config import *
+from ve import fs
+from ve.batch import create_environments, distribution_class
+from ve.timing import timings, write_timings
+from ve.layers import LayerStore
+from ve.download import DEFAULT_DOWNLOAD_URL
 
 
 def main():
+    if sys.argv[1:2] == ['exec']:
+        exec_main(sys.argv[2:])
+        return
+
     parser = ConfigOptionParser(
         version=virtualenv_version,
-        usage="%prog [OPTIONS] DEST_DIR",
+        usage="%prog [OPTIONS] DEST_DIR\n"
+              "       %prog exec DEST_DIR [--] COMMAND [ARGS...]",
         formatter=UpdatingDefaultsHelpFormatter())
 
     parser.add_option(
@@ -102,6 +108,153 @@ def main():
         help="Never download anything from the network.  Instead, virtualenv will fail "
         "if local distributions of setuptools/distribute/pip are not present.")
 
+    parser.add_option(
+        '--download-url',
+        dest='download_url',
+        default=DEFAULT_DOWNLOAD_URL,
+        metavar='URL',
+        help='Base URL the setuptools/distribute/pip archives missing from '
+        'the search dirs are fetched from, laid out as on PyPI (default '
+        '%%default).  Downloads are kept in %s' %
+        os.path.join(default_storage_dir, 'downloads'))
+
+    parser.add_option(
+        '--refresh-downloads',
+        dest='refresh_downloads',
+        action='store_true',
+        default=False,
+        help='Check the downloaded archives for changes with conditional '
+        'requests instead of using them as they are')
+
+    parser.add_option(
+        '-r', '--requirements',
+        dest='requirements',
+        action='append',
+        metavar='FILE',
+        help='Install the requirements listed in FILE with a single pip run '
+        'once pip is installed.  With --never-download only the search dirs '
+        'are used to find them.  Can be given more than once.')
+
+    parser.add_option(
+        '--layer',
+        dest='layers',
+        action='append',
+        metavar='NAME',
+        help='Put the shared, read-only layer NAME registered under %s on '
+        'the path of the environment, after its own site-packages.  Can be '
+        'given more than once' % os.path.join(default_storage_dir, 'layers'))
+
+    parser.add_option(
+        '--register-layer',
+        dest='register_layer',
+        metavar='NAME=DIR',
+        help='Register the directory DIR (a site-packages like tree) as the '
+        'layer NAME and exit')
+
+    parser.add_option(
+        '--compile',
+        dest='compile',
+        action='store_true',
+        default=False,
+        help='Byte-compile the Python files of the new environment (those '
+        'not symlinked from the base Python) with one process per CPU')
+
+    parser.add_option(
+        '--no-path-cache',
+        dest='path_cache',
+        action='store_false',
+        default=True,
+        help="Don't have the environment's site.py cache the result of its "
+        'directory probing in path-cache.txt')
+
+    parser.add_option(
+        '--no-pth-index',
+        dest='pth_index',
+        action='store_false',
+        default=True,
+        help="Don't have the environment's site.py keep the content of the "
+        '.pth files of each site directory in pth-index.dat')
+
+    parser.add_option(
+        '--no-module-index',
+        dest='module_index',
+        action='store_false',
+        default=True,
+        help="Don't have the environment's site.py index the top-level "
+        'modules of sys.path in module-index.dat; imports search every '
+        'directory of sys.path')
+
+    parser.add_option(
+        '--refresh-module-index',
+        dest='refresh_module_index',
+        action='store_true',
+        help='Rebuild the module index of an EXISTING virtualenv '
+        'environment, e.g. after installing into the base Python')
+
+    parser.add_option(
+        '--flatten-eggs',
+        dest='flatten_eggs',
+        action='store_true',
+        help='Merge the unzipped eggs listed in easy-install.pth of an '
+        'EXISTING virtualenv environment into its site-packages, keeping '
+        'their metadata as .egg-info, so they no longer lengthen sys.path')
+
+    parser.add_option(
+        '--workers',
+        dest='workers',
+        type='int',
+        default=4,
+        metavar='N',
+        help='Number of threads used to symlink or copy the Python '
+        'bootstrap files into the environment (default %default)')
+
+    parser.add_option(
+        '--copy-strategy',
+        dest='copy_strategy',
+        type='choice',
+        choices=['auto'] + fs.COPY_STRATEGIES,
+        default='auto',
+        help='How to materialize files that cannot be symlinked, like the '
+        'python executable: one of %s.  The strategies after the chosen one '
+        'are used as fallbacks; "auto" (the default) tries them all, '
+        'cheapest first' % ', '.join(fs.COPY_STRATEGIES))
+
+    parser.add_option(
+        '--template',
+        dest='use_template',
+        action='store_true',
+        help='Clone new environments from a template saved under %s for '
+        'this interpreter and these options; the first creation saves '
+        'the template' % default_storage_dir)
+
+    parser.add_option(
+        '--dry-run',
+        dest='dry_run',
+        action='store_true',
+        help='Show the filesystem operations that would lay out the '
+        'environment and their estimated cost, without changing anything')
+
+    parser.add_option(
+        '--batch',
+        dest='batch',
+        action='store_true',
+        help='Create an environment in each of the given DEST_DIRs, '
+        'sharing the interpreter setup and using a pool of processes')
+
+    parser.add_option(
+        '--processes',
+        dest='processes',
+        type='int',
+        metavar='N',
+        help='Number of processes used by --batch (default: one per CPU)')
+
+    parser.add_option(
+        '--timings',
+        dest='timings',
+        metavar='FILE',
+        help='Write the wall-clock and CPU time, filesystem operations and '
+        'subprocesses of every creation phase to FILE as JSON')
+
     parser.add_option(
         '--prompt=',
         dest='prompt',
@@ -132,6 +285,7 @@ def main():
             file = __file__
             if file.endswith('.pyc'):
                 file = file[:-1]
+            import subprocess
             popen = subprocess.Popen([interpreter, file] + sys.argv[1:], env=env)
             raise SystemExit(popen.wait())
 
@@ -145,11 +299,19 @@ def main():
             "not compatible with setuptools. Either use --distribute "
             "or unset PYTHONDONTWRITEBYTECODE.")
         sys.exit(2)
+    if options.register_layer:
+        if '=' not in options.register_layer:
+            print('--register-layer expects NAME=DIR')
+            sys.exit(2)
+        name, layer_dir = options.register_layer.split('=', 1)
+        LayerStore(fs.FileSystemService()).register(name, layer_dir)
+        return
+
     if not args:
         print('You must provide a DEST_DIR')
         parser.print_help()
         sys.exit(2)
-    if len(args) > 1:
+    if len(args) > 1 and not options.batch:
         print('There must be only one argument: DEST_DIR (you gave %s)' % (
             ' '.join(args)))
         parser.print_help()
@@ -170,37 +332,81 @@ def main():
         make_environment_relocatable(home_dir)
         return
 
+    if options.refresh_module_index:
+        env = distribution_class()(fs.FileSystemService(), home_dir, options)
+        env.path_locations()
+        env.write_module_index()
+        return
+
+    if options.flatten_eggs:
+        env = distribution_class()(fs.FileSystemService(), home_dir, options)
+        env.path_locations()
+        env.flatten_eggs()
+        return
+
     if options.no_site_packages:
         logger.warn('The --no-site-packages flag is deprecated; it is now '
                     'the default behavior.')
 
-    if sys.platform == 'win32':
-        env_klass = Win32Distribution
-    elif is_pypy:
-        env_klass = PyPyDistribution
-    elif is_jython:
-        env_klass = JythonDistribution
-    elif sys.platform == 'darwin':
-        from ve import macos
-        env_klass = macos.DarwinDistribution
-    else:
-        from ve import env_klass
-        env_klass = UnixDistribution
+    if options.batch:
+        results = create_environments(args, options, options.processes)
+        if options.timings:
+            write_timings(options.timings,
+                          [dict(result.timings, home_dir=result.home_dir)
+                           for result in results])
+        failed = [result for result in results if not result.success]
+        if 'after_install' in globals():
+            for result in results:
+                if result.success:
+                    after_install(options, result.home_dir)
+        if failed:
+            logger.fatal('%s of %s environments failed', len(failed), len(results))
+            sys.exit(1)
+        return
 
-    from ve import fs
-    env = env_klass(fs.FileSystemService(), home_dir, options)
+    env_klass = distribution_class()
+    env = env_klass(fs.FileSystemService(options.copy_strategy), home_dir,
+                    options)
+    timings.reset()
     env.create()
+    if options.timings or verbosity > 0:
+        timings.log()
+    if options.timings:
+        write_timings(options.timings, timings.report())
+
+    if options.dry_run:
+        return
 
     if 'after_install' in globals():
         after_install(options, home_dir)
 
+def exec_main(args):
+    """
+    ``virtualenv exec DEST_DIR [--] COMMAND [ARGS...]``: runs COMMAND with
+    the environment activated as bin/activate would, without a shell.
+    """
+    if args[1:2] == ['--']:
+        del args[1]
+    if len(args) < 2:
+        print('Usage: %s exec DEST_DIR [--] COMMAND [ARGS...]'
+              % os.path.basename(sys.argv[0]))
+        sys.exit(2)
+    env = distribution_class()(fs.FileSystemService(), args[0], None)
+    env.path_locations()
+    values = dict(env.activate_values())
+    if not os.path.isdir(join(values['__VIRTUAL_ENV__'], values['__BIN_NAME__'])):
+        print('%s is not a virtualenv environment' % args[0])
+        sys.exit(2)
+    from ve.runner import exec_command
+    exec_command(values['__VIRTUAL_ENV__'], values['__BIN_NAME__'], args[1:])
+
 def install_activate(home_dir, bin_dir, prompt=None):
     home_dir = os.path.abspath(home_dir)
     if sys.platform == 'win32' or is_jython and os._name == 'nt':
         files = {
-            'activate.bat': ACTIVATE_BAT,
-            'deactivate.bat': DEACTIVATE_BAT,
-            'activate.ps1': ACTIVATE_PS,
+            'activate.bat': get_resource('ACTIVATE_BAT'),
+            'deactivate.bat': get_resource('DEACTIVATE_BAT'),
+            'activate.ps1': get_resource('ACTIVATE_PS'),
         }
 
         # MSYS needs paths of the form /c/path/to/file
@@ -210,19 +416,19 @@ def install_activate(home_dir, bin_dir, prompt=None):
         # Run-time conditional enables (basic) Cygwin compatibility
         home_dir_sh = ("""$(if [ "$OSTYPE" "==" "cygwin" ]; then cygpath -u '%s'; else echo '%s'; fi;)""" %
                        (home_dir, home_dir_msys))
-        files['activate'] = ACTIVATE_SH.replace('__VIRTUAL_ENV__', home_dir_sh)
+        files['activate'] = get_resource('ACTIVATE_SH').replace('__VIRTUAL_ENV__', home_dir_sh)
 
     else:
-        files = {'activate': ACTIVATE_SH}
+        files = {'activate': get_resource('ACTIVATE_SH')}
 
         # suppling activate.fish in addition to, not instead of, the
         # bash script support.
-        files['activate.fish'] = ACTIVATE_FISH
+        files['activate.fish'] = get_resource('ACTIVATE_FISH')
 
         # same for csh/tcsh support...
-        files['activate.csh'] = ACTIVATE_CSH
+        files['activate.csh'] = get_resource('ACTIVATE_CSH')
 
-    files['activate_this.py'] = ACTIVATE_THIS
+    files['activate_this.py'] = get_resource('ACTIVATE_THIS')
     if hasattr(home_dir, 'decode'):
         home_dir = home_dir.decode(sys.getfilesystemencoding())
     vname = os.path.basename(home_dir)
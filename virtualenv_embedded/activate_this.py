@@ -2,7 +2,8 @@
 activate this virtualenv environment.
 
 This can be used when you must use an existing Python interpreter, not
-the virtualenv bin/python
+the virtualenv bin/python.  Calling the deactivate() it leaves in that
+dict restores sys.path, sys.prefix and PATH.
 """
 
 try:
@@ -21,14 +22,23 @@ if sys.platform == 'win32':
 else:
     site_packages = os.path.join(base, 'lib', 'python%s' % sys.version[:3], 'site-packages')
 prev_sys_path = list(sys.path)
+prev_prefix = sys.prefix
+prev_real_prefix = getattr(sys, 'real_prefix', None)
 import site
 site.addsitedir(site_packages)
 sys.real_prefix = sys.prefix
 sys.prefix = base
 # Move the added items to the front of the path:
-new_sys_path = []
-for item in list(sys.path):
-    if item not in prev_sys_path:
-        new_sys_path.append(item)
-        sys.path.remove(item)
-sys.path[:0] = new_sys_path
+known = set(prev_sys_path)
+sys.path[:] = ([item for item in sys.path if item not in known] +
+               [item for item in sys.path if item in known])
+del known
+
+def deactivate():
+    os.environ['PATH'] = old_os_path
+    sys.path[:] = prev_sys_path
+    sys.prefix = prev_prefix
+    if prev_real_prefix is None:
+        del sys.real_prefix
+    else:
+        sys.real_prefix = prev_real_prefix
@@ -88,6 +88,469 @@ _is_jython = sys.platform[:4] == 'java'
 if _is_jython:
     ModuleType = type(os)
 
+# The directories site.py probes for are looked up in path-cache.txt,
+# written next to this file by virtualenv (it runs the interpreter with
+# VIRTUALENV_WRITE_PATH_CACHE set).  The cache records the mtimes of the
+# directories whose content decides those answers; if any of them
+# changed, the cache is ignored and every directory is probed again.
+PATH_CACHE_HEADER = '# virtualenv path cache 1 %d.%d.%d %s' % (
+    sys.version_info[:3] + (sys.platform,))
+_path_cache = None
+_path_cache_record = None
+
+def _path_cache_filename():
+    return os.path.join(os.path.dirname(__file__), 'path-cache.txt')
+
+def load_path_cache():
+    """Return the probe results of path-cache.txt, or None if the file
+    is missing or out of date"""
+    try:
+        f = open(_path_cache_filename())
+    except IOError:
+        return None
+    try:
+        lines = f.read().split('\n')
+    finally:
+        f.close()
+    if lines[0] != PATH_CACHE_HEADER:
+        return None
+    known = {}
+    for line in lines[1:]:
+        parts = line.split('\t')
+        if len(parts) != 3:
+            continue
+        kind, value, path = parts
+        if kind == 'mtime':
+            try:
+                mtime = repr(os.stat(path).st_mtime)
+            except OSError:
+                mtime = '-'
+            if mtime != value:
+                return None
+        else:
+            known[(kind, path)] = value == '1'
+    return known
+
+def _probe(kind, path):
+    """os.path.exists() or os.path.isdir() of path, answered from the
+    path cache when it has it"""
+    if _path_cache is not None:
+        try:
+            return _path_cache[(kind, path)]
+        except KeyError:
+            pass
+    if kind == 'isdir':
+        result = os.path.isdir(path)
+    else:
+        result = os.path.exists(path)
+    if _path_cache_record is not None:
+        _path_cache_record[(kind, path)] = result
+    return result
+
+def _exists(path):
+    return _probe('exists', path)
+
+def _isdir(path):
+    return _probe('isdir', path)
+
+def write_path_cache(record):
+    """Write the probe results in record to path-cache.txt, with the
+    mtime of the directory holding each probed path (or of its nearest
+    existing ancestor when it doesn't exist).
+
+    The directory of this file changes whenever byte-code is written
+    next to the stdlib symlinks in it, so the paths in it are left out
+    and always probed."""
+    here = os.path.dirname(os.path.abspath(__file__))
+    watched = set()
+    cached = []
+    for (kind, path), result in record.items():
+        dir = os.path.dirname(path)
+        while not result and dir and not os.path.isdir(dir):
+            parent = os.path.dirname(dir)
+            if parent == dir:
+                break
+            dir = parent
+        if dir == here:
+            continue
+        watched.add(dir)
+        cached.append((kind, path, result))
+    lines = [PATH_CACHE_HEADER]
+    for dir in sorted(watched):
+        try:
+            mtime = repr(os.stat(dir).st_mtime)
+        except OSError:
+            mtime = '-'
+        lines.append('mtime\t%s\t%s' % (mtime, dir))
+    cached.sort()
+    for kind, path, result in cached:
+        lines.append('%s\t%d\t%s' % (kind, result and 1 or 0, path))
+    filename = _path_cache_filename()
+    tmp = '%s.%s' % (filename, os.getpid())
+    f = open(tmp, 'w')
+    try:
+        f.write('\n'.join(lines) + '\n')
+    finally:
+        f.close()
+    if os.name == 'nt' and os.path.exists(filename):
+        os.remove(filename)
+    os.rename(tmp, filename)
+
+# The resolved content of the .pth files of every site dir is kept in
+# pth-index.dat next to this file: the directories they add, already
+# made absolute, and their import lines, compiled.  A site dir whose
+# mtime and .pth file mtimes are unchanged is replayed from the index
+# without being listed or having its .pth files read; the index is
+# rewritten (if the directory is writable) when one changed.
+#
+# The index is only used if the file exists; virtualenv creates it (it
+# runs the interpreter with VIRTUALENV_WRITE_PTH_INDEX set).
+#
+# Like addpackage(), the replay only adds the directories that exist; a
+# directory deleted since it was indexed leaves neither the .pth file
+# nor its site dir changed, so it is checked with a stat each time.
+PTH_INDEX_KEY = ('virtualenv pth index', 1, sys.version)
+_pth_index = None
+_pth_index_dirty = False
+
+def _pth_index_filename():
+    return os.path.join(os.path.dirname(__file__), 'pth-index.dat')
+
+def load_pth_index(required=False):
+    """Return the pth index as {sitedircase: entry}, or None if there is
+    none; an index written by another Python is returned empty"""
+    import marshal
+    try:
+        f = open(_pth_index_filename(), 'rb')
+    except IOError:
+        if required:
+            return {}
+        return None
+    try:
+        try:
+            key, index = marshal.loads(f.read())
+        except (EOFError, ValueError, TypeError):
+            return {}
+    finally:
+        f.close()
+    if key != PTH_INDEX_KEY:
+        return {}
+    return index
+
+def write_pth_index(index):
+    import marshal
+    filename = _pth_index_filename()
+    tmp = '%s.%s' % (filename, os.getpid())
+    f = open(tmp, 'wb')
+    try:
+        f.write(marshal.dumps((PTH_INDEX_KEY, index)))
+    finally:
+        f.close()
+    if os.name == 'nt' and os.path.exists(filename):
+        os.remove(filename)
+    os.rename(tmp, filename)
+
+def _pth_index_entry(sitedir, sitedircase):
+    """Return the .pth files of sitedir from the index as a list of
+    (name, mtime, items), or None if they changed since"""
+    entry = _pth_index.get(sitedircase)
+    if entry is None:
+        return None
+    dir_mtime, pths = entry
+    try:
+        if os.stat(sitedir).st_mtime != dir_mtime:
+            return None
+        for name, mtime, items in pths:
+            if os.stat(os.path.join(sitedir, name)).st_mtime != mtime:
+                return None
+    except OSError:
+        return None
+    return pths
+
+def _index_sitedir(sitedir, sitedircase, pths):
+    """Put the (name, items) of the .pth files of sitedir in the index"""
+    global _pth_index_dirty
+    indexed = []
+    try:
+        dir_mtime = os.stat(sitedir).st_mtime
+        for name, items in pths:
+            if None in items:
+                # unreadable; try again next time
+                return
+            mtime = os.stat(os.path.join(sitedir, name)).st_mtime
+            indexed.append((name, mtime, items))
+    except OSError:
+        return
+    _pth_index[sitedircase] = (dir_mtime, indexed)
+    _pth_index_dirty = True
+
+def _replay_pth(sitedir, name, items, known_paths):
+    """Apply the indexed content of the .pth file name, as addpackage()
+    would; sitedir and name are locals for the import lines, which may
+    look them up in their caller's frame"""
+    for item in items:
+        kind = item[0]
+        if kind == 'import':
+            exec(item[1])
+        elif not item[2] in known_paths and os.path.exists(item[1]):
+            sys.path.append(item[1])
+            known_paths.add(item[2])
+
+# virtualenv writes module-index.dat next to this file (it runs the
+# interpreter with VIRTUALENV_WRITE_MODULE_INDEX set): the top-level
+# names each directory of sys.path can provide, and for every name the
+# first directory that has it.  A sys.meta_path finder looks a top-level
+# import up there and only searches that directory, plus the sys.path
+# entries added after the index was built (like the script's directory),
+# instead of every directory in turn.  A name missing from the index is
+# imported as usual, and so is every name once the entries of the index
+# were reordered or taken off sys.path.
+#
+# The index is only used if the file exists.  Each directory of it is
+# checked against its mtime when the interpreter starts; changed ones
+# are listed again and the index rewritten (if the directory is
+# writable).  The directory of this file changes whenever one of these
+# files or byte-code is written to it, so it is never indexed.
+MODULE_INDEX_KEY = ('virtualenv module index', 1, sys.version)
+
+def _module_index_filename():
+    return os.path.join(os.path.dirname(__file__), 'module-index.dat')
+
+def load_module_index(required=False):
+    """Return the module index, or None if there is none; an index
+    written by another Python is returned empty"""
+    import marshal
+    try:
+        f = open(_module_index_filename(), 'rb')
+    except IOError:
+        if required:
+            return {}
+        return None
+    try:
+        try:
+            key, index = marshal.loads(f.read())
+        except (EOFError, ValueError, TypeError):
+            return {}
+    finally:
+        f.close()
+    if key != MODULE_INDEX_KEY:
+        return {}
+    return index
+
+def write_module_index(index):
+    import marshal
+    filename = _module_index_filename()
+    tmp = '%s.%s' % (filename, os.getpid())
+    f = open(tmp, 'wb')
+    try:
+        f.write(marshal.dumps((MODULE_INDEX_KEY, index)))
+    finally:
+        f.close()
+    if os.name == 'nt' and os.path.exists(filename):
+        os.remove(filename)
+    os.rename(tmp, filename)
+
+def _module_suffixes():
+    """Return the file name suffixes of importable modules, longest first"""
+    if sys.version_info[0] >= 3:
+        from importlib.machinery import all_suffixes
+        suffixes = all_suffixes()
+    else:
+        import imp
+        suffixes = [suffix for suffix, mode, type in imp.get_suffixes()]
+    suffixes.sort(key=len, reverse=True)
+    return suffixes
+
+def _list_modules(dir, suffixes):
+    """Return the top-level names dir may provide.  Every name without a
+    dot could be a package; a name that turns out not to be importable
+    from dir is imported as usual."""
+    names = set()
+    for filename in os.listdir(dir):
+        if '.' not in filename:
+            names.add(filename)
+            continue
+        for suffix in suffixes:
+            if filename.endswith(suffix):
+                name = filename[:-len(suffix)]
+                if name and '.' not in name:
+                    names.add(name)
+    return list(names)
+
+def update_module_index(index, path):
+    """Bring index up to date with the directories of path; return the
+    new index and whether it changed"""
+    import stat
+    here = os.path.dirname(os.path.abspath(__file__))
+    old_dirs = index.get('dirs', {})
+    dirs = {}
+    changed = index.get('path') != path
+    suffixes = None
+    for entry in path:
+        if entry in dirs or entry == here or not os.path.isabs(entry):
+            # relative entries depend on the working directory, and are
+            # searched as usual
+            continue
+        try:
+            st = os.stat(entry)
+        except OSError:
+            # provides nothing, until it appears
+            dirs[entry] = (None, [])
+            if old_dirs.get(entry, (0,))[0] is not None:
+                changed = True
+            continue
+        if not stat.S_ISDIR(st.st_mode):
+            # zip files and the like are searched as usual
+            continue
+        old = old_dirs.get(entry)
+        if old is not None and old[0] == st.st_mtime:
+            dirs[entry] = old
+            continue
+        if suffixes is None:
+            suffixes = _module_suffixes()
+        try:
+            dirs[entry] = (st.st_mtime, _list_modules(entry, suffixes))
+        except OSError:
+            continue
+        changed = True
+    if not changed and len(dirs) == len(old_dirs):
+        return index, False
+    locations = {}
+    for i, entry in enumerate(path):
+        if entry in dirs:
+            for name in dirs[entry][1]:
+                if name not in locations:
+                    locations[name] = i
+    return {'path': path, 'dirs': dirs, 'locations': locations}, True
+
+class _ImpLoader(object):
+    """Loader of a module found by imp.find_module() (Python 2)"""
+
+    def __init__(self, found):
+        self.found = found
+
+    def load_module(self, fullname):
+        import imp
+        file = self.found[0]
+        try:
+            return imp.load_module(fullname, *self.found)
+        finally:
+            if file is not None:
+                file.close()
+
+class ModuleIndexFinder(object):
+    """sys.meta_path finder of top-level modules, searching only the
+    directory the module index has for them"""
+
+    def __init__(self, index):
+        self.path = index['path']
+        self.path_list = list(self.path)
+        self.members = set(self.path)
+        self.indexed = set(index['dirs'])
+        self.locations = index['locations']
+        # the sys.path last checked, whether it matched, and the entries
+        # to search for each index position with it
+        self._checked_path = list(self.path)
+        self._matches = True
+        self._entries = {}
+
+    def _path_matches(self):
+        """Whether sys.path still has the entries of the index, in the
+        same order; entries added since may be anywhere.  Only recomputed
+        when sys.path changed since the last call."""
+        if sys.path == self._checked_path:
+            # mostly identical objects, so a quick comparison
+            return self._matches
+        members = self.members
+        self._matches = [entry for entry in sys.path
+                         if entry in members] == self.path_list
+        self._checked_path = list(sys.path)
+        self._entries = {}
+        return self._matches
+
+    def _search_path(self, name, path):
+        """Return the sys.path entries to search for name, or None to
+        leave it to the import machinery"""
+        if path is not None or name in sys.builtin_module_names:
+            return None
+        i = self.locations.get(name)
+        if i is None or not self._path_matches():
+            # reordered or shortened since the index was built
+            return None
+        try:
+            return self._entries[i]
+        except KeyError:
+            pass
+        location = self.path[i]
+        entries = []
+        for entry in sys.path:
+            if entry == location:
+                entries.append(entry)
+                self._entries[i] = entries
+                return entries
+            if entry not in self.indexed:
+                entries.append(entry)
+        return None
+
+    def find_spec(self, name, path=None, target=None):
+        entries = self._search_path(name, path)
+        if entries is None:
+            return None
+        from importlib.machinery import PathFinder
+        spec = PathFinder.find_spec(name, entries, target)
+        if spec is None or spec.loader is None:
+            # a namespace package may have portions further down sys.path
+            return None
+        return spec
+
+    def find_module(self, name, path=None):
+        entries = self._search_path(name, path)
+        if entries is None:
+            return None
+        if sys.version_info[0] >= 3:
+            from importlib.machinery import PathFinder
+            return PathFinder.find_module(name, entries)
+        import imp
+        for entry in entries:
+            importer = sys.path_importer_cache.get(entry)
+            if importer is not None:
+                # a zip file or the like
+                loader = importer.find_module(name)
+                if loader is not None:
+                    return loader
+                continue
+            if not os.path.isdir(entry or os.curdir):
+                return None
+            try:
+                return _ImpLoader(imp.find_module(name, [entry]))
+            except ImportError:
+                pass
+        return None
+
+    def invalidate_caches(self):
+        self.locations = {}
+
+def install_module_index(write=False):
+    """Put a ModuleIndexFinder for the current sys.path on sys.meta_path,
+    updating (or with write, creating) module-index.dat first"""
+    index = load_module_index(required=write)
+    if index is None:
+        return
+    index, changed = update_module_index(index, tuple(sys.path))
+    if changed or write:
+        try:
+            write_module_index(index)
+        except (IOError, OSError):
+            if write:
+                sys.stderr.write('Cannot write %s: %s\n'
+                                 % (_module_index_filename(), sys.exc_info()[1]))
+    finder = ModuleIndexFinder(index)
+    for i, importer in enumerate(sys.meta_path):
+        if getattr(importer, '__name__', None) == 'PathFinder':
+            sys.meta_path.insert(i, finder)
+            return
+    sys.meta_path.append(finder)
+
 def makepath(*paths):
     dir = os.path.join(*paths)
     if _is_jython and (dir == '__classpath__' or
@@ -151,9 +614,10 @@ def _init_pathinfo():
             continue
     return d
 
-def addpackage(sitedir, name, known_paths):
+def addpackage(sitedir, name, known_paths, items=None):
     """Add a new path to known_paths by combining sitedir and 'name' or execute
-    sitedir if it starts with 'import'"""
+    sitedir if it starts with 'import'.  What the file does is appended to
+    items, if given, for the pth index."""
     if known_paths is None:
         _init_pathinfo()
         reset = 1
@@ -161,19 +625,33 @@ def addpackage(sitedir, name, known_paths):
         reset = 0
     fullname = os.path.join(sitedir, name)
     try:
-        f = open(fullname, "rU")
+        if sys.version_info[0] >= 3:
+            # newlines are universal, and "U" is gone from Python 3.11
+            f = open(fullname, "r")
+        else:
+            f = open(fullname, "rU")
     except IOError:
+        if items is not None:
+            items.append(None)
         return
     try:
         for line in f:
             if line.startswith("#"):
                 continue
             if line.startswith("import"):
-                exec(line)
+                if items is None:
+                    exec(line)
+                else:
+                    code = compile(line, fullname, 'exec')
+                    items.append(('import', code))
+                    exec(code)
                 continue
             line = line.rstrip()
             dir, dircase = makepath(sitedir, line)
-            if not dircase in known_paths and os.path.exists(dir):
+            exists = os.path.exists(dir)
+            if items is not None:
+                items.append((exists and 'path' or 'missing', dir, dircase))
+            if not dircase in known_paths and exists:
                 sys.path.append(dir)
                 known_paths.add(dircase)
     finally:
@@ -193,14 +671,28 @@ def addsitedir(sitedir, known_paths=None):
     sitedir, sitedircase = makepath(sitedir)
     if not sitedircase in known_paths:
         sys.path.append(sitedir)        # Add path component
-    try:
-        names = os.listdir(sitedir)
-    except os.error:
-        return
-    names.sort()
-    for name in names:
-        if name.endswith(os.extsep + "pth"):
-            addpackage(sitedir, name, known_paths)
+    pths = None
+    if _pth_index is not None:
+        pths = _pth_index_entry(sitedir, sitedircase)
+    if pths is not None:
+        for name, mtime, items in pths:
+            _replay_pth(sitedir, name, items, known_paths)
+    else:
+        try:
+            names = os.listdir(sitedir)
+        except os.error:
+            return
+        names.sort()
+        indexed = []
+        for name in names:
+            if name.endswith(os.extsep + "pth"):
+                items = None
+                if _pth_index is not None:
+                    items = []
+                    indexed.append((name, items))
+                addpackage(sitedir, name, known_paths, items)
+        if _pth_index is not None:
+            _index_sitedir(sitedir, sitedircase, indexed)
     if reset:
         known_paths = None
     return known_paths
@@ -236,7 +728,7 @@ def addsitepackages(known_paths, sys_prefix=sys.prefix, exec_prefix=sys.exec_pre
                             os.path.join(prefix, "lib", "site-python"),
                             os.path.join(prefix, "python" + sys.version[:3], "lib-dynload")]
                 lib64_dir = os.path.join(prefix, "lib64", "python" + sys.version[:3], "site-packages")
-                if (os.path.exists(lib64_dir) and 
+                if (_exists(lib64_dir) and 
                     os.path.realpath(lib64_dir) not in [os.path.realpath(p) for p in sitedirs]):
                     sitedirs.append(lib64_dir)
                 try:
@@ -274,7 +766,7 @@ def addsitepackages(known_paths, sys_prefix=sys.prefix, exec_prefix=sys.exec_pre
                                          sys.version[:3],
                                          'site-packages'))
             for sitedir in sitedirs:
-                if os.path.isdir(sitedir):
+                if _isdir(sitedir):
                     addsitedir(sitedir, known_paths)
     return None
 
@@ -342,14 +834,14 @@ def addusersitepackages(known_paths):
                                  "python" + sys.version[:3],
                                  "site-packages")
 
-    if ENABLE_USER_SITE and os.path.isdir(USER_SITE):
+    if ENABLE_USER_SITE and _isdir(USER_SITE):
         addsitedir(USER_SITE, known_paths)
     if ENABLE_USER_SITE:
         for dist_libdir in ("lib", "local/lib"):
             user_site = os.path.join(USER_BASE, dist_libdir,
                                      "python" + sys.version[:3],
                                      "dist-packages")
-            if os.path.isdir(user_site):
+            if _isdir(user_site):
                 addsitedir(user_site, known_paths)
     return known_paths
 
@@ -568,7 +1060,7 @@ def virtual_install_main_packages():
         # This is hardcoded in the Python executable, but relative to sys.prefix:
         for path in paths[:]:
             plat_path = os.path.join(path, 'plat-%s' % sys.platform)
-            if os.path.exists(plat_path):
+            if _exists(plat_path):
                 paths.append(plat_path)
     elif sys.platform == 'win32':
         paths = [os.path.join(sys.real_prefix, 'Lib'), os.path.join(sys.real_prefix, 'DLLs')]
@@ -576,18 +1068,18 @@ def virtual_install_main_packages():
         paths = [os.path.join(sys.real_prefix, 'lib', 'python'+sys.version[:3])]
         hardcoded_relative_dirs = paths[:] # for the special 'darwin' case below
         lib64_path = os.path.join(sys.real_prefix, 'lib64', 'python'+sys.version[:3])
-        if os.path.exists(lib64_path):
+        if _exists(lib64_path):
             paths.append(lib64_path)
         # This is hardcoded in the Python executable, but relative to sys.prefix:
         plat_path = os.path.join(sys.real_prefix, 'lib', 'python'+sys.version[:3],
                                  'plat-%s' % sys.platform)
-        if os.path.exists(plat_path):
+        if _exists(plat_path):
             paths.append(plat_path)
     # This is hardcoded in the Python executable, but
     # relative to sys.prefix, so we have to fix up:
     for path in list(paths):
         tk_dir = os.path.join(path, 'lib-tk')
-        if os.path.exists(tk_dir):
+        if _exists(tk_dir):
             paths.append(tk_dir)
 
     # These are hardcoded in the Apple's Python executable,
@@ -598,7 +1090,7 @@ def virtual_install_main_packages():
                            for module in ('plat-darwin', 'plat-mac', 'plat-mac/lib-scriptpackages')]
 
         for path in hardcoded_paths:
-            if os.path.exists(path):
+            if _exists(path):
                 paths.append(path)
 
     sys.path.extend(paths)
@@ -618,6 +1110,25 @@ def force_global_eggs_after_local_site_packages():
             egginsert = i
     sys.__egginsert = egginsert + 1
     
+def virtual_addlayers(known_paths):
+    """Add the shared layers listed in layers.txt to sys.path.  They come
+    after the virtualenv's own site-packages, so its packages shadow the
+    ones in the layers.
+    """
+    try:
+        f = open(os.path.join(os.path.dirname(__file__), 'layers.txt'))
+    except IOError:
+        return known_paths
+    try:
+        layers = [line.strip() for line in f.readlines() if line.strip()]
+    finally:
+        f.close()
+    force_global_eggs_after_local_site_packages()
+    for layer in layers:
+        if _isdir(layer):
+            known_paths = addsitedir(layer, known_paths)
+    return known_paths
+
 def virtual_addsitepackages(known_paths):
     force_global_eggs_after_local_site_packages()
     return addsitepackages(known_paths, sys_prefix=sys.real_prefix)
@@ -644,40 +1155,160 @@ def execusercustomize():
         pass
 
 
+# With VIRTUALENV_SITE_PROFILE set, main() times each of its steps and
+# counts the os.stat(), os.lstat() and os.listdir() calls made during it
+# (by site.py and the Python code it runs; not by the import machinery
+# of Python 2).  The report goes to stderr if the variable is "1" or
+# "stderr", and is appended to the file it names otherwise.
+_profile = None
+
+class _Profile(object):
+
+    def __init__(self, destination):
+        try:
+            from time import perf_counter as timer
+        except ImportError:
+            from time import time as timer
+        self.destination = destination
+        self.timer = timer
+        self.steps = []
+        self.calls = {'stat': 0, 'listdir': 0}
+        self.originals = {}
+        for name, kind in (('stat', 'stat'), ('lstat', 'stat'),
+                           ('listdir', 'listdir')):
+            if hasattr(os, name):
+                self.originals[name] = getattr(os, name)
+                setattr(os, name, self._counting(getattr(os, name), kind))
+        self.start = timer()
+
+    def _counting(self, func, kind):
+        calls = self.calls
+        def counted(*args, **kwargs):
+            calls[kind] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    def step(self, name, func, *args):
+        calls = self.calls
+        stats, listdirs = calls['stat'], calls['listdir']
+        start = self.timer()
+        try:
+            return func(*args)
+        finally:
+            self.steps.append((name, self.timer() - start,
+                               calls['stat'] - stats,
+                               calls['listdir'] - listdirs))
+
+    def report(self):
+        """Restore os and write the report"""
+        total = self.timer() - self.start
+        for name, func in self.originals.items():
+            setattr(os, name, func)
+        lines = ['# site.py profile of %s %s' % (sys.executable,
+                                                sys.version.split()[0]),
+                 'step\tms\tstat\tlistdir']
+        for name, seconds, stats, listdirs in self.steps + [
+                ('total', total, self.calls['stat'], self.calls['listdir'])]:
+            lines.append('%s\t%.3f\t%d\t%d' % (name, seconds * 1000,
+                                                 stats, listdirs))
+        text = '\n'.join(lines) + '\n'
+        if self.destination in ('1', 'stderr'):
+            sys.stderr.write(text)
+            return
+        try:
+            f = open(self.destination, 'a')
+            try:
+                f.write(text)
+            finally:
+                f.close()
+        except IOError:
+            sys.stderr.write('Cannot write %s: %s\n'
+                             % (self.destination, sys.exc_info()[1]))
+
+def _step(name, func, *args):
+    """Call func(*args) as the step name of main()"""
+    if _profile is None:
+        return func(*args)
+    return _profile.step(name, func, *args)
+
+def load_caches():
+    global _path_cache, _path_cache_record, _pth_index, _pth_index_dirty
+    if os.environ.get('VIRTUALENV_WRITE_PATH_CACHE'):
+        _path_cache_record = {}
+    else:
+        _path_cache = load_path_cache()
+    if os.environ.get('VIRTUALENV_WRITE_PTH_INDEX'):
+        _pth_index = load_pth_index(required=True)
+        _pth_index_dirty = True
+    else:
+        _pth_index = load_pth_index()
+
+def save_caches():
+    global _path_cache, _path_cache_record, _pth_index, _pth_index_dirty
+    if _path_cache_record is not None:
+        try:
+            write_path_cache(_path_cache_record)
+        except (IOError, OSError):
+            sys.stderr.write('Cannot write %s: %s\n'
+                             % (_path_cache_filename(), sys.exc_info()[1]))
+    _path_cache = _path_cache_record = None
+    if _pth_index_dirty:
+        try:
+            write_pth_index(_pth_index)
+        except (IOError, OSError):
+            # a read-only environment just doesn't get an index
+            if os.environ.get('VIRTUALENV_WRITE_PTH_INDEX'):
+                sys.stderr.write('Cannot write %s: %s\n'
+                                 % (_pth_index_filename(), sys.exc_info()[1]))
+    _pth_index = None
+    _pth_index_dirty = False
+
 def main():
-    global ENABLE_USER_SITE
-    virtual_install_main_packages()
-    abs__file__()
-    paths_in_sys = removeduppaths()
+    global ENABLE_USER_SITE, _profile
+    if os.environ.get('VIRTUALENV_SITE_PROFILE'):
+        _profile = _Profile(os.environ['VIRTUALENV_SITE_PROFILE'])
+    _step('load_caches', load_caches)
+    _step('virtual_install_main_packages', virtual_install_main_packages)
+    _step('abs__file__', abs__file__)
+    paths_in_sys = _step('removeduppaths', removeduppaths)
     if (os.name == "posix" and sys.path and
         os.path.basename(sys.path[-1]) == "Modules"):
-        addbuilddir()
+        _step('addbuilddir', addbuilddir)
     if _is_jython:
-        fixclasspath()
-    GLOBAL_SITE_PACKAGES = not os.path.exists(os.path.join(os.path.dirname(__file__), 'no-global-site-packages.txt'))
+        _step('fixclasspath', fixclasspath)
+    GLOBAL_SITE_PACKAGES = not _exists(os.path.join(os.path.dirname(__file__), 'no-global-site-packages.txt'))
     if not GLOBAL_SITE_PACKAGES:
         ENABLE_USER_SITE = False
     if ENABLE_USER_SITE is None:
-        ENABLE_USER_SITE = check_enableusersite()
-    paths_in_sys = addsitepackages(paths_in_sys)
-    paths_in_sys = addusersitepackages(paths_in_sys)
+        ENABLE_USER_SITE = _step('check_enableusersite', check_enableusersite)
+    paths_in_sys = _step('addsitepackages', addsitepackages, paths_in_sys)
+    paths_in_sys = _step('virtual_addlayers', virtual_addlayers, paths_in_sys)
+    paths_in_sys = _step('addusersitepackages', addusersitepackages,
+                         paths_in_sys)
     if GLOBAL_SITE_PACKAGES:
-        paths_in_sys = virtual_addsitepackages(paths_in_sys)
+        paths_in_sys = _step('virtual_addsitepackages',
+                             virtual_addsitepackages, paths_in_sys)
+    _step('save_caches', save_caches)
+    _step('install_module_index', install_module_index,
+          bool(os.environ.get('VIRTUALENV_WRITE_MODULE_INDEX')))
     if sys.platform == 'os2emx':
-        setBEGINLIBPATH()
-    setquit()
-    setcopyright()
-    sethelper()
-    aliasmbcs()
-    setencoding()
-    execsitecustomize()
+        _step('setBEGINLIBPATH', setBEGINLIBPATH)
+    _step('setquit', setquit)
+    _step('setcopyright', setcopyright)
+    _step('sethelper', sethelper)
+    _step('aliasmbcs', aliasmbcs)
+    _step('setencoding', setencoding)
+    _step('execsitecustomize', execsitecustomize)
     if ENABLE_USER_SITE:
-        execusercustomize()
+        _step('execusercustomize', execusercustomize)
     # Remove sys.setdefaultencoding() so that users cannot change the
     # encoding after initialization.  The test for presence is needed when
     # this module is run as a script, because this code is executed twice.
     if hasattr(sys, "setdefaultencoding"):
         del sys.setdefaultencoding
+    if _profile is not None:
+        _profile.report()
+        _profile = None
 
 main()
 